@@ -0,0 +1,126 @@
+# ---------------------------------------------------------------------
+# analisis.py
+# ---------------------------------------------------------------------
+# Estadísticas de todas las simulaciones guardadas:
+# - Supervivencia por posición de planta (planta 1, planta 2, ...)
+# - Altura media de todas las plantas y de las vivas
+# - Plantas y muertes según la banda de agua, luz y temperatura en la
+#   que estaban, respecto del rango ideal de su especie
+#
+# Las simulaciones se recorren de a una con recorrer_simulaciones, en
+# una sola pasada: la memoria usada depende de la cantidad de plantas
+# por simulación, no del tamaño del historial.
+# ---------------------------------------------------------------------
+
+import math
+from bisect import bisect_right
+
+from especies import ESPECIE_POR_DEFECTO, FACTORES, TABLAS
+from guardado_json import recorrer_simulaciones
+
+
+def nombre_banda(indice, bandas):
+    """
+    Nombre de la banda `indice` (la posición que da bisect_right en la
+    tabla de un factor) para un factor con `bandas` bandas por lado:
+    "ideal", "bajo 1", "bajo 2", ..., "fuera (bajo)" y lo mismo por arriba.
+    """
+    distancia = indice - (bandas + 1)
+    if distancia == 0:
+        return "ideal"
+    lado = "bajo" if distancia < 0 else "alto"
+    if abs(distancia) > bandas:
+        return f"fuera ({lado})"
+    return f"{lado} {abs(distancia)}"
+
+
+def _posicion_banda(nombre):
+    """Clave para ordenar las bandas de la más baja a la más alta."""
+    if nombre == "ideal":
+        return 0
+    lado, _, resto = nombre.partition(" ")
+    signo = -1 if lado == "bajo" or resto == "(bajo)" else 1
+    return signo * (int(resto) if resto.isdigit() else float("inf"))
+
+
+class Resumen:
+    """
+    Acumulador de estadísticas. Se le agregan simulaciones con agregar()
+    y resultado() devuelve los totales, sin guardar las simulaciones.
+    """
+
+    def __init__(self):
+        self.simulaciones = 0
+        self.plantas_por_posicion = []
+        self.vivas_por_posicion = []
+        self.suma_alturas = 0.0
+        self.suma_alturas_vivas = 0.0
+        self.plantas = 0
+        self.vivas = 0
+        # {factor: {banda: [plantas, muertas]}}
+        self.bandas = {factor: {} for factor in FACTORES}
+
+    def agregar(self, simulacion):
+        self.simulaciones += 1
+        alturas = simulacion.get("alturas", [])
+        muertas = simulacion.get("muertas", [False] * len(alturas))
+        condiciones = simulacion.get("condiciones", [])
+        tablas = TABLAS.get(simulacion.get("especie"), TABLAS[ESPECIE_POR_DEFECTO])
+
+        faltan = len(alturas) - len(self.plantas_por_posicion)
+        if faltan > 0:
+            self.plantas_por_posicion.extend([0] * faltan)
+            self.vivas_por_posicion.extend([0] * faltan)
+
+        for i, (altura, muerta) in enumerate(zip(alturas, muertas)):
+            self.plantas += 1
+            self.plantas_por_posicion[i] += 1
+            self.suma_alturas += altura
+            if not muerta:
+                self.vivas += 1
+                self.vivas_por_posicion[i] += 1
+                self.suma_alturas_vivas += altura
+
+            if i >= len(condiciones):
+                continue
+            for factor, (umbrales, valores) in zip(FACTORES, tablas):
+                valor = condiciones[i].get(factor)
+                if valor is None or (isinstance(valor, float) and math.isnan(valor)):
+                    continue
+                banda = nombre_banda(bisect_right(umbrales, float(valor)), (len(valores) - 3) // 2)
+                cuenta = self.bandas[factor].setdefault(banda, [0, 0])
+                cuenta[0] += 1
+                cuenta[1] += bool(muerta)
+
+    def resultado(self):
+        """Devuelve un diccionario con las estadísticas acumuladas."""
+        return {
+            "simulaciones": self.simulaciones,
+            "plantas": self.plantas,
+            "vivas": self.vivas,
+            "supervivencia": self.vivas / self.plantas if self.plantas else 0.0,
+            "supervivencia_por_posicion": [
+                v / p if p else 0.0
+                for v, p in zip(self.vivas_por_posicion, self.plantas_por_posicion)
+            ],
+            "altura_media": self.suma_alturas / self.plantas if self.plantas else 0.0,
+            "altura_media_vivas": self.suma_alturas_vivas / self.vivas if self.vivas else 0.0,
+            "bandas": {
+                factor: {banda: {"plantas": cuentas[banda][0], "muertas": cuentas[banda][1]}
+                         for banda in sorted(cuentas, key=_posicion_banda)}
+                for factor, cuentas in self.bandas.items()
+            },
+        }
+
+
+def resumir(simulaciones=None):
+    """
+    Calcula las estadísticas en una sola pasada. Por defecto recorre las
+    simulaciones guardadas de a una; también acepta cualquier iterable.
+    """
+    if simulaciones is None:
+        simulaciones = recorrer_simulaciones()
+    resumen = Resumen()
+    for simulacion in simulaciones:
+        resumen.agregar(simulacion)
+    return resumen.resultado()
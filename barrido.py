@@ -0,0 +1,143 @@
+# ---------------------------------------------------------------------
+# barrido.py
+# ---------------------------------------------------------------------
+# Barrido de parámetros y Monte Carlo del simulador:
+# - Recorre la grilla agua × luz × temp (o muestras con ruido alrededor
+#   de cada punto) usando calcular_crecimiento_lote
+# - Reparte la grilla en bloques entre todos los núcleos del procesador
+# - Reduce los resultados a mapas de supervivencia y crecimiento medio
+# - Permite retomar un barrido interrumpido desde un archivo de progreso
+# ---------------------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from especies import ESPECIE_POR_DEFECTO
+from logica import calcular_crecimiento_lote, MUERTE
+
+# Cantidad de puntos de la grilla que procesa cada tarea
+TAMANO_BLOQUE = 65536
+
+# Cada cuántos bloques terminados se actualiza el archivo de progreso
+GUARDAR_CADA = 16
+
+
+def _evaluar_bloque(ejes, inicio, fin, muestras, ruido, semilla, especie):
+    """
+    Evalúa los puntos [inicio, fin) de la grilla aplanada.
+
+    Se ejecuta en un proceso trabajador: recibe solo los ejes (pocos
+    valores) y reconstruye sus puntos, y devuelve dos arreglos compactos
+    con la cantidad de muestras vivas y la suma de su crecimiento.
+    """
+    forma = tuple(len(eje) for eje in ejes)
+    indices = np.unravel_index(np.arange(inicio, fin), forma)
+    agua, luz, temp = (np.asarray(eje, dtype=np.float64)[idx] for eje, idx in zip(ejes, indices))
+
+    vivas = np.zeros(fin - inicio, dtype=np.uint32)
+    suma = np.zeros(fin - inicio, dtype=np.float64)
+
+    # Generador propio de cada bloque: el resultado no depende de qué
+    # proceso lo calcule ni de si el barrido se retomó
+    generador = np.random.default_rng([semilla, inicio])
+    for _ in range(muestras):
+        if any(ruido):
+            condiciones = [c + generador.normal(0.0, s, c.shape) if s else c
+                           for c, s in zip((agua, luz, temp), ruido)]
+        else:
+            condiciones = (agua, luz, temp)
+        crecimiento = calcular_crecimiento_lote(*condiciones, especie=especie)
+        viva = crecimiento != MUERTE
+        vivas += viva
+        suma += np.where(viva, crecimiento, 0)
+    return inicio, vivas, suma
+
+
+def _cargar_progreso(archivo, total, firma):
+    """Lee un archivo de progreso si corresponde al mismo barrido."""
+    if archivo and os.path.exists(archivo):
+        with np.load(archivo) as datos:
+            if datos["firma"].tolist() == firma:
+                return datos["vivas"].copy(), datos["suma"].copy(), datos["hecho"].copy()
+    return np.zeros(total, dtype=np.uint32), np.zeros(total, dtype=np.float64), None
+
+
+def _guardar_progreso(archivo, vivas, suma, hecho, firma):
+    """Escribe el progreso en un temporal y lo reemplaza de forma atómica."""
+    temporal = archivo + ".tmp.npz"
+    np.savez(temporal, vivas=vivas, suma=suma, hecho=hecho, firma=np.array(firma))
+    os.replace(temporal, archivo)
+
+
+def barrer(agua, luz, temp, muestras=1, ruido=(0, 0, 0), semilla=0,
+           especie=ESPECIE_POR_DEFECTO, trabajadores=None,
+           tamano_bloque=TAMANO_BLOQUE, archivo_progreso=None):
+    """
+    Barre la grilla agua × luz × temp y devuelve los mapas reducidos.
+
+    Args:
+        agua, luz, temp: valores de cada eje de la grilla.
+        muestras: cantidad de muestras Monte Carlo por punto.
+        ruido: desvío estándar del ruido normal de (agua, luz, temp)
+            alrededor de cada punto; (0, 0, 0) es un barrido exacto.
+        semilla: semilla del generador aleatorio.
+        trabajadores: procesos a usar (por defecto todos los núcleos);
+            1 evalúa todo en el proceso actual.
+        tamano_bloque: puntos de la grilla por tarea.
+        archivo_progreso: archivo .npz para retomar un barrido parcial.
+    Returns:
+        Diccionario con "supervivencia" (fracción de muestras vivas) y
+        "crecimiento_medio" (crecimiento medio de las vivas, NaN si no
+        sobrevive ninguna), ambos con forma (len(agua), len(luz), len(temp)).
+    """
+    ejes = tuple(np.asarray(eje, dtype=np.float64) for eje in (agua, luz, temp))
+    forma = tuple(len(eje) for eje in ejes)
+    total = int(np.prod(forma))
+    ruido = tuple(float(s) for s in ruido)
+
+    # La firma identifica el barrido para no mezclar progresos distintos
+    firma = [str(especie), str(muestras), str(semilla), str(tamano_bloque),
+             repr(ruido), repr([eje.tolist() for eje in ejes])]
+    vivas, suma, hecho = _cargar_progreso(archivo_progreso, total, firma)
+    bloques = list(range(0, total, tamano_bloque))
+    if hecho is None:
+        hecho = np.zeros(len(bloques), dtype=bool)
+
+    pendientes = [(n, inicio) for n, inicio in enumerate(bloques) if not hecho[n]]
+    terminados = 0
+
+    def registrar(n, inicio, vivas_bloque, suma_bloque):
+        nonlocal terminados
+        fin = inicio + len(vivas_bloque)
+        vivas[inicio:fin] = vivas_bloque
+        suma[inicio:fin] = suma_bloque
+        hecho[n] = True
+        terminados += 1
+        if archivo_progreso and terminados % GUARDAR_CADA == 0:
+            _guardar_progreso(archivo_progreso, vivas, suma, hecho, firma)
+
+    if trabajadores == 1:
+        for n, inicio in pendientes:
+            fin = min(inicio + tamano_bloque, total)
+            _, v, s = _evaluar_bloque(ejes, inicio, fin, muestras, ruido, semilla, especie)
+            registrar(n, inicio, v, s)
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            futuros = {
+                pool.submit(_evaluar_bloque, ejes, inicio, min(inicio + tamano_bloque, total),
+                            muestras, ruido, semilla, especie): n
+                for n, inicio in pendientes
+            }
+            for futuro in as_completed(futuros):
+                inicio, v, s = futuro.result()
+                registrar(futuros[futuro], inicio, v, s)
+
+    if archivo_progreso:
+        _guardar_progreso(archivo_progreso, vivas, suma, hecho, firma)
+
+    supervivencia = (vivas / muestras).reshape(forma)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        crecimiento_medio = np.where(vivas > 0, suma / vivas, np.nan).reshape(forma)
+    return {"supervivencia": supervivencia, "crecimiento_medio": crecimiento_medio}
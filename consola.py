@@ -0,0 +1,124 @@
+# ---------------------------------------------------------------------
+# consola.py
+# ---------------------------------------------------------------------
+# Modo de línea de comandos del simulador, sin interfaz gráfica.
+# Lee archivos de escenarios (CSV, JSON o JSON Lines) con las condiciones
+# de cada planta, aplica un paso de crecimiento a cada una y escribe los
+# resultados de a una fila, en CSV, por salida estándar o a un archivo.
+# Al terminar muestra un resumen por la salida de errores.
+#
+# No importa tkinter ni matplotlib, así que arranca en milisegundos y
+# se puede usar en servidores sin pantalla (por ejemplo desde cron).
+#
+# Uso:
+#    python ejecutar.py escenarios.csv [otros...] [--salida resultados.csv]
+#
+# Columnas de cada escenario: agua, luz, temp y, opcionalmente, altura
+# (por defecto 3 cm) y especie (por defecto tomate).
+# ---------------------------------------------------------------------
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from especies import ESPECIE_POR_DEFECTO, ALTURA_INICIAL
+from logica import paso_planta
+
+COLUMNAS_SALIDA = ["archivo", "fila", "especie", "agua", "luz", "temp",
+                   "altura", "crecimiento", "altura_final", "muerta"]
+
+
+def leer_escenarios(ruta):
+    """
+    Genera los escenarios de un archivo, de a uno, como diccionarios.
+    CSV y JSON Lines se leen en streaming; un JSON puede ser una lista de
+    escenarios o una simulación guardada (con "condiciones" y "alturas").
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, "r", encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            yield from csv.DictReader(f)
+        elif extension == ".jsonl":
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+        else:
+            datos = json.load(f)
+            if isinstance(datos, dict):
+                alturas = datos.get("alturas", [])
+                for i, condiciones in enumerate(datos.get("condiciones", [])):
+                    escenario = dict(condiciones)
+                    if i < len(alturas):
+                        escenario.setdefault("altura", alturas[i])
+                    yield escenario
+            else:
+                yield from datos
+
+
+def simular_escenario(escenario):
+    """Aplica un paso de crecimiento a un escenario y devuelve la fila de resultado."""
+    especie = escenario.get("especie") or ESPECIE_POR_DEFECTO
+    agua = float(escenario["agua"])
+    luz = float(escenario["luz"])
+    temp = float(escenario["temp"])
+    altura = escenario.get("altura")
+    # Una celda vacía del CSV cuenta como no indicada; 0 es una altura válida
+    altura = float(ALTURA_INICIAL if altura is None or altura == "" else altura)
+
+    altura_final, muerta, crecimiento = paso_planta(altura, False, agua, luz, temp, especie)
+    return {"especie": especie, "agua": agua, "luz": luz, "temp": temp, "altura": altura,
+            "crecimiento": crecimiento, "altura_final": altura_final, "muerta": muerta}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="ejecutar.py",
+        description="Simula escenarios de plantas sin abrir la interfaz gráfica."
+    )
+    parser.add_argument("escenarios", nargs="+", help="archivos CSV, JSON o JSONL con las condiciones")
+    parser.add_argument("-o", "--salida", help="archivo CSV de resultados (por defecto, salida estándar)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    total = muertas = errores = 0
+    suma_crecimiento = 0
+
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    try:
+        escritor = csv.DictWriter(salida, fieldnames=COLUMNAS_SALIDA)
+        escritor.writeheader()
+        for ruta in args.escenarios:
+            try:
+                for fila, escenario in enumerate(leer_escenarios(ruta), start=1):
+                    try:
+                        resultado = simular_escenario(escenario)
+                    except (KeyError, TypeError, ValueError) as error:
+                        errores += 1
+                        print(f"{ruta}:{fila}: escenario no válido ({error!r})", file=sys.stderr)
+                        continue
+                    escritor.writerow({"archivo": ruta, "fila": fila, **resultado})
+                    total += 1
+                    if resultado["muerta"]:
+                        muertas += 1
+                    else:
+                        suma_crecimiento += resultado["crecimiento"]
+            except (OSError, json.JSONDecodeError, csv.Error) as error:
+                errores += 1
+                print(f"{ruta}: no se pudo leer ({error})", file=sys.stderr)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    vivas = total - muertas
+    media = suma_crecimiento / vivas if vivas else 0
+    print(f"Escenarios: {total} | vivas: {vivas} | muertas: {muertas} | "
+          f"crecimiento medio: {media:+.2f} cm | errores: {errores} | "
+          f"tiempo: {time.perf_counter() - inicio:.3f} s", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
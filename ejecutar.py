@@ -2,16 +2,58 @@
 # ejecutar.py
 # ---------------------------------------------------------------------
 # Archivo principal del simulador de crecimiento de plantas 🌱
-# Se encarga únicamente de iniciar la interfaz gráfica.
+# Sin argumentos inicia la interfaz gráfica. Con archivos de escenarios
+# como argumentos, los simula en modo consola (ver consola.py) sin
+# cargar tkinter ni matplotlib.
+#
+# Opciones de diagnóstico (en los dos modos, ver metricas.py):
+#    --metricas[=archivo.json]   mide las funciones más usadas y, con
+#                                archivo, vuelca las métricas al salir
+#    --perfil=archivo.pstats     corre todo el programa con cProfile
 # ---------------------------------------------------------------------
 
-from interfaz import SimuladorPlantas
-import tkinter as tk
+import sys
+
+import metricas
+
+
+def _separar_opciones(argumentos):
+    """Quita las opciones de diagnóstico y devuelve (resto, archivo de perfil)."""
+    resto, perfil = [], None
+    for argumento in argumentos:
+        if argumento == "--metricas":
+            metricas.activar()
+        elif argumento.startswith("--metricas="):
+            metricas.activar(argumento.split("=", 1)[1])
+        elif argumento.startswith("--perfil="):
+            perfil = argumento.split("=", 1)[1]
+        else:
+            resto.append(argumento)
+    return resto, perfil
+
+
+def _iniciar(argumentos):
+    if argumentos:
+        from consola import main as main_consola
+        return main_consola(argumentos)
+
+    from interfaz import SimuladorPlantas
+    import tkinter as tk
 
-def main():
     root = tk.Tk()
     app = SimuladorPlantas(root)
     root.mainloop()
+    return 0
+
+def main():
+    # Las opciones se leen antes de importar los módulos medidos
+    argumentos, perfil = _separar_opciones(sys.argv[1:])
+    if perfil:
+        codigo = metricas.perfilar(lambda: _iniciar(argumentos), perfil)
+    else:
+        codigo = _iniciar(argumentos)
+    if argumentos:
+        sys.exit(codigo)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
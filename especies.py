@@ -0,0 +1,140 @@
+# ---------------------------------------------------------------------
+# especies.py
+# ---------------------------------------------------------------------
+# Perfiles de especies del simulador:
+# - Carga de los perfiles desde data/especies.json
+# - Compilación de cada perfil en una tabla de umbrales ordenados
+# - Búsqueda del crecimiento de un factor por bisección
+# - Valores iniciales de las plantas de una simulación nueva
+# ---------------------------------------------------------------------
+
+import json
+import math
+import os
+from bisect import bisect_right
+
+# Ruta al archivo de perfiles dentro de la carpeta /data
+BASE_DIR = os.path.dirname(__file__)
+ARCHIVO_ESPECIES = os.path.join(BASE_DIR, "data", "especies.json")
+
+# Constante que indica que la planta muere
+MUERTE = -999
+
+# Especie usada cuando no se indica ninguna
+ESPECIE_POR_DEFECTO = "tomate"
+
+# Largo máximo del nombre de una especie, en bytes UTF-8: el nombre va
+# en un campo fijo del encabezado binario de logica.Poblacion
+MAX_BYTES_NOMBRE = 32
+
+# Factores que evalúa el simulador, en el orden de calcular_crecimiento
+FACTORES = ("agua", "luz", "temp")
+
+# Valores iniciales de cada planta de una simulación nueva
+PLANTAS_POR_DEFECTO = 4
+ALTURA_INICIAL = 3
+CONDICIONES_INICIALES = {"agua": 80, "luz": 8, "temp": 22}
+
+# Perfil de respaldo si no existe el archivo de especies.
+# Cada factor tiene un rango ideal, el crecimiento dentro de ese rango y
+# una lista de bandas [ancho, crecimiento] que se alejan del ideal.
+PERFIL_TOMATE = {
+    "agua": {"ideal": [70, 90], "crecimiento": 6, "bandas": [[50, 3], [10, 1]]},
+    "luz": {"ideal": [6, 10], "crecimiento": 6, "bandas": [[2, 3], [2, 1]]},
+    "temp": {"ideal": [18, 28], "crecimiento": 6, "bandas": [[2, 3], [2, 1]]}
+}
+
+
+def compilar_factor(factor):
+    """
+    Convierte la definición de un factor en una tabla (umbrales, valores).
+
+    Por debajo del ideal cada banda es [inicio, fin) y por encima es
+    (inicio, fin]. Para usar una sola bisección, los umbrales superiores
+    se corren al siguiente float representable: v > x equivale a
+    v >= nextafter(x, inf). Así bisect_right(umbrales, v) da el índice
+    de la banda y valores[índice] el crecimiento, con los mismos bordes
+    que las comparaciones encadenadas originales.
+    """
+    minimo, maximo = factor["ideal"]
+    bandas = factor.get("bandas", [])
+
+    # Umbrales inferiores, del más lejano al ideal
+    inferiores = []
+    limite = minimo
+    for ancho, _ in bandas:
+        limite -= ancho
+        inferiores.append(limite)
+    inferiores.reverse()
+    inferiores.append(minimo)
+
+    # Umbrales superiores, desde el ideal hacia afuera
+    superiores = [math.nextafter(maximo, math.inf)]
+    limite = maximo
+    for ancho, _ in bandas:
+        limite += ancho
+        superiores.append(math.nextafter(limite, math.inf))
+
+    crecimientos = [c for _, c in bandas]
+    valores = ([MUERTE] + crecimientos[::-1] + [factor.get("crecimiento", 6)] +
+               crecimientos + [MUERTE])
+    return tuple(inferiores + superiores), tuple(valores)
+
+
+def compilar_perfil(perfil):
+    """
+    Compila un perfil completo: devuelve una tupla con la tabla
+    (umbrales, valores) de cada factor en el orden de FACTORES.
+    """
+    return tuple(compilar_factor(perfil[nombre]) for nombre in FACTORES)
+
+
+def evaluar_tabla(tabla, valor):
+    """Devuelve el crecimiento de un factor buscando su banda por bisección."""
+    umbrales, valores = tabla
+    return valores[bisect_right(umbrales, valor)]
+
+
+def validar_nombre(nombre):
+    """Lanza ValueError si el nombre de una especie no entra en MAX_BYTES_NOMBRE."""
+    if len(nombre.encode("utf-8")) > MAX_BYTES_NOMBRE:
+        raise ValueError(f"El nombre de especie {nombre!r} supera {MAX_BYTES_NOMBRE} bytes.")
+
+
+def cargar_perfiles(ruta=None):
+    """
+    Carga los perfiles de especies desde el archivo JSON.
+    Si no existe el archivo, devuelve solo el perfil del tomate.
+    """
+    ruta = ruta or ARCHIVO_ESPECIES
+    perfiles = {ESPECIE_POR_DEFECTO: PERFIL_TOMATE}
+    if os.path.exists(ruta):
+        with open(ruta, "r", encoding="utf-8") as f:
+            perfiles.update(json.load(f))
+    for nombre in perfiles:
+        validar_nombre(nombre)
+    return perfiles
+
+
+# Perfiles y tablas compiladas una sola vez al importar el módulo
+PERFILES = cargar_perfiles()
+TABLAS = {nombre: compilar_perfil(perfil) for nombre, perfil in PERFILES.items()}
+
+
+def registrar_especie(nombre, perfil):
+    """Agrega (o reemplaza) una especie y compila su tabla."""
+    validar_nombre(nombre)
+    PERFILES[nombre] = perfil
+    TABLAS[nombre] = compilar_perfil(perfil)
+
+
+def rangos_ideales(nombre=ESPECIE_POR_DEFECTO):
+    """Devuelve {factor: (mínimo, máximo)} de la especie indicada."""
+    perfil = PERFILES[nombre]
+    return {f: tuple(perfil[f]["ideal"]) for f in FACTORES}
+
+
+def tolerancias(nombre=ESPECIE_POR_DEFECTO):
+    """Devuelve {factor: (ancho de cada banda, ...)} de la especie indicada."""
+    perfil = PERFILES[nombre]
+    return {f: tuple(ancho for ancho, _ in perfil[f].get("bandas", [])) for f in FACTORES}
@@ -0,0 +1,198 @@
+# ---------------------------------------------------------------------
+# exportar.py
+# ---------------------------------------------------------------------
+# Exporta las simulaciones guardadas a imágenes PNG (una por simulación)
+# o a un PDF de varias páginas, sin abrir ninguna ventana:
+# - Dibuja con el backend Agg de Matplotlib (sin pyplot ni Tk)
+# - Reparte el dibujo entre varios procesos; cada proceso reutiliza una
+#   sola figura, que se limpia después de cada simulación
+# - Lee las simulaciones de a una (recorrer_simulaciones) y mantiene
+#   pocas tareas en vuelo, así que la memoria no crece con el historial
+#
+# El PDF lo escribe el proceso principal: los trabajadores le devuelven
+# cada página ya dibujada (píxeles RGBA) y él solo la agrega.
+#
+# Uso:
+#    python exportar.py carpeta_png/ [--trabajadores N]
+#    python exportar.py simulaciones.pdf [--dpi 100]
+# ---------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from guardado_json import recorrer_simulaciones
+
+# Tamaño de cada página o imagen, en pulgadas
+TAMANO_FIGURA = (8, 6)
+DPI = 100
+
+# Más plantas que esto: histograma de alturas en vez de una barra por planta
+UMBRAL_HISTOGRAMA = 40
+# Más plantas que esto: tabla con promedios en vez de una columna por planta
+MAX_COLUMNAS_TABLA = 10
+
+COLORES = ["#4CAF50", "#CDDC39", "#00BCD4", "#FFEB3B"]
+
+# Figura de cada proceso trabajador (se crea en _inicializar)
+_figura = None
+
+
+def _inicializar(dpi=DPI):
+    """Crea la figura que el proceso reutiliza para todas sus simulaciones."""
+    global _figura
+    _figura = Figure(figsize=TAMANO_FIGURA, dpi=dpi)
+    FigureCanvasAgg(_figura)
+
+
+def dibujar(figura, simulacion):
+    """Dibuja el gráfico y la tabla de condiciones de una simulación."""
+    alturas = simulacion.get("alturas", [])
+    n = len(alturas)
+    muertas = simulacion.get("muertas", [False] * n)
+    condiciones = simulacion.get("condiciones", [{}] * n)
+
+    figura.clear()
+    ax = figura.add_axes([0.1, 0.38, 0.85, 0.52])
+    if n > UMBRAL_HISTOGRAMA:
+        vivas = [a for a, m in zip(alturas, muertas) if not m]
+        ax.hist(vivas, bins=30, color=COLORES[0])
+        ax.set_xlabel("Altura (cm)")
+        ax.set_ylabel("Cantidad de plantas vivas")
+    else:
+        ax.bar([f"P{i+1}" for i in range(n)], alturas, color=COLORES)
+        ax.set_ylim(0, max(20, max(alturas, default=0) + 2))
+        ax.set_ylabel("Altura (cm)")
+    ax.set_title(f"Simulación #{simulacion.get('numero', '?')} "
+                 f"({simulacion.get('especie', 'tomate')})")
+
+    # --- Tabla de condiciones ---
+    ax_tabla = figura.add_axes([0.1, 0.02, 0.85, 0.26])
+    ax_tabla.axis("off")
+    if n <= MAX_COLUMNAS_TABLA:
+        columnas = [f"Planta {i+1}" for i in range(n)]
+        filas = ["Altura", "Agua (ml)", "Luz (h)", "Temp (°C)"]
+        celdas = [["muerta" if m else f"{a:.1f}" for a, m in zip(alturas, muertas)]]
+        for factor in ("agua", "luz", "temp"):
+            celdas.append([f"{c.get(factor, float('nan')):g}" for c in condiciones[:n]])
+    else:
+        vivas = n - sum(bool(m) for m in muertas)
+        columnas = ["Plantas", "Vivas", "Altura media", "Agua media", "Luz media", "Temp media"]
+        filas = None
+        medias = [sum(c.get(f, 0) for c in condiciones) / n for f in ("agua", "luz", "temp")]
+        celdas = [[str(n), str(vivas), f"{sum(alturas) / n:.1f}"] + [f"{m:.1f}" for m in medias]]
+    if n:
+        tabla = ax_tabla.table(cellText=celdas, colLabels=columnas, rowLabels=filas,
+                               loc="center", cellLoc="center")
+        tabla.auto_set_font_size(False)
+        tabla.set_fontsize(9)
+
+
+def _renderizar(simulacion, carpeta):
+    """
+    Tarea de un trabajador: dibuja la simulación en la figura del proceso.
+    Con carpeta, la guarda como PNG y devuelve la ruta; sin carpeta,
+    devuelve los píxeles de la página para el PDF.
+    """
+    if _figura is None:
+        _inicializar()
+    dibujar(_figura, simulacion)
+    try:
+        if carpeta is not None:
+            ruta = os.path.join(carpeta, f"simulacion_{simulacion.get('numero', 0):05d}.png")
+            _figura.savefig(ruta, format="png")
+            return ruta
+        _figura.canvas.draw()
+        return np.asarray(_figura.canvas.buffer_rgba()).copy()
+    finally:
+        _figura.clear()
+
+
+def _en_orden(tareas, trabajadores, dpi, max_en_vuelo):
+    """
+    Ejecuta _renderizar sobre cada (simulacion, carpeta) y genera los
+    resultados en el mismo orden, con a lo sumo max_en_vuelo pendientes.
+    """
+    if trabajadores == 1:
+        _inicializar(dpi)
+        for simulacion, carpeta in tareas:
+            yield _renderizar(simulacion, carpeta)
+        return
+
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar,
+                             initargs=(dpi,)) as pool:
+        pendientes = []
+        for simulacion, carpeta in tareas:
+            pendientes.append(pool.submit(_renderizar, simulacion, carpeta))
+            if len(pendientes) >= max_en_vuelo:
+                wait(pendientes[:1], return_when=FIRST_COMPLETED)
+                while pendientes and pendientes[0].done():
+                    yield pendientes.pop(0).result()
+        for futuro in pendientes:
+            yield futuro.result()
+
+
+def exportar(destino, simulaciones=None, trabajadores=None, dpi=DPI):
+    """
+    Exporta las simulaciones a `destino`: un .pdf de varias páginas o una
+    carpeta con un PNG por simulación. Devuelve cuántas se exportaron.
+
+    Args:
+        simulaciones: iterable de simulaciones (por defecto, las guardadas).
+        trabajadores: procesos a usar (por defecto todos los núcleos);
+            1 dibuja todo en el proceso actual.
+    """
+    if simulaciones is None:
+        simulaciones = recorrer_simulaciones()
+    trabajadores = trabajadores or os.cpu_count() or 1
+    max_en_vuelo = trabajadores * 4
+
+    if not destino.lower().endswith(".pdf"):
+        os.makedirs(destino, exist_ok=True)
+        tareas = ((s, destino) for s in simulaciones)
+        return sum(1 for _ in _en_orden(tareas, trabajadores, dpi, max_en_vuelo))
+
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    # Una sola figura para todas las páginas: la imagen ocupa la hoja entera
+    pagina = Figure(figsize=TAMANO_FIGURA, dpi=dpi)
+    FigureCanvasAgg(pagina)
+    cantidad = 0
+    try:
+        with PdfPages(destino) as pdf:
+            tareas = ((s, None) for s in simulaciones)
+            for pixeles in _en_orden(tareas, trabajadores, dpi, max_en_vuelo):
+                pagina.clear()
+                pagina.figimage(pixeles, resize=False)
+                pdf.savefig(pagina, dpi=dpi)
+                cantidad += 1
+    finally:
+        pagina.clear()
+    return cantidad
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="exportar.py",
+        description="Exporta las simulaciones guardadas a PNG o PDF sin abrir la interfaz."
+    )
+    parser.add_argument("destino", help="archivo .pdf, o carpeta donde escribir los PNG")
+    parser.add_argument("-t", "--trabajadores", type=int, help="procesos a usar (por defecto, todos los núcleos)")
+    parser.add_argument("--dpi", type=int, default=DPI, help=f"resolución (por defecto {DPI})")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    cantidad = exportar(args.destino, trabajadores=args.trabajadores, dpi=args.dpi)
+    print(f"Simulaciones exportadas: {cantidad} → {args.destino} "
+          f"({time.perf_counter() - inicio:.2f} s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
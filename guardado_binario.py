@@ -0,0 +1,329 @@
+# ---------------------------------------------------------------------
+# guardado_binario.py
+# ---------------------------------------------------------------------
+# Formato binario compacto para el historial de simulaciones.
+# Se usa desde guardado_json cuando SIMULADOR_FORMATO=binario.
+#
+# El archivo guardado.bin es una secuencia de registros, uno por
+# simulación. Cada registro tiene un encabezado chico y después las
+# columnas de la simulación como arreglos contiguos (little-endian):
+#
+#    encabezado  "<4sIII": marca b"SIM1", número, plantas (n), largo extra
+#    extra       JSON con las claves que no son columnas (por ejemplo especie)
+#    relleno     hasta múltiplo de 8 bytes
+#    agua        float64[n]
+#    luz         float64[n]
+#    temp        float64[n]
+#    alturas     float32[n]
+#    muertas     uint8[n]
+#    relleno     hasta múltiplo de 8 bytes
+#
+# Para leer, el archivo se abre con mmap y las columnas se devuelven
+# como vistas de NumPy: se puede tomar una simulación o una columna sin
+# deserializar el resto. Guardar solo agrega un registro al final.
+#
+# Junto al archivo, guardado.bin.idx guarda la posición de cada
+# registro (uint64, 8 bytes por simulación), como guardado.idx en el
+# formato jsonl: guardar, contar y cargar una simulación no recorren el
+# historial. Si el índice falta, está dañado o es más corto que el
+# archivo, se completa recorriendo los encabezados que falten.
+# ---------------------------------------------------------------------
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import numpy as np
+
+MARCA = b"SIM1"
+ENCABEZADO = struct.Struct("<4sIII")
+
+# Columnas en el orden en que se escriben, con su tipo de NumPy
+COLUMNAS = (
+    ("agua", np.dtype("<f8")),
+    ("luz", np.dtype("<f8")),
+    ("temp", np.dtype("<f8")),
+    ("alturas", np.dtype("<f4")),
+    ("muertas", np.dtype("u1")),
+)
+BYTES_POR_PLANTA = sum(tipo.itemsize for _, tipo in COLUMNAS)
+
+# Claves de la simulación que se guardan como columnas
+CLAVES_COLUMNAS = ("numero", "alturas", "muertas", "condiciones")
+
+
+def _relleno(largo):
+    return -largo % 8
+
+
+def _registro(numero, simulacion):
+    """Arma los bytes de un registro a partir del diccionario de una simulación."""
+    alturas = simulacion.get("alturas", [])
+    n = len(alturas)
+    muertas = simulacion.get("muertas", [False] * n)
+    condiciones = simulacion.get("condiciones", [{}] * n)
+    extra = json.dumps({k: v for k, v in simulacion.items() if k not in CLAVES_COLUMNAS},
+                       ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    columnas = []
+    for factor in ("agua", "luz", "temp"):
+        valores = [c.get(factor) for c in condiciones]
+        columnas.append(array("d", (float("nan") if v is None else float(v) for v in valores)))
+    columnas.append(array("f", alturas))
+    if sys.byteorder == "big":
+        for columna in columnas:
+            columna.byteswap()
+
+    partes = [ENCABEZADO.pack(MARCA, numero, n, len(extra)), extra,
+              b"\0" * _relleno(ENCABEZADO.size + len(extra))]
+    partes += [columna.tobytes() for columna in columnas]
+    partes.append(bytes(bool(m) for m in muertas))
+    largo = sum(len(p) for p in partes)
+    partes.append(b"\0" * _relleno(largo))
+    return b"".join(partes)
+
+
+def _ruta_indice(ruta):
+    return ruta + ".idx"
+
+
+def _fin_registro(f, posicion, tamano):
+    """Dónde termina el registro que empieza en `posicion`, o None si no hay uno completo."""
+    if posicion + ENCABEZADO.size > tamano:
+        return None
+    f.seek(posicion)
+    marca, _, n, largo_extra = ENCABEZADO.unpack(f.read(ENCABEZADO.size))
+    if marca != MARCA:
+        return None
+    largo = ENCABEZADO.size + largo_extra
+    largo += _relleno(largo) + n * BYTES_POR_PLANTA
+    largo += _relleno(largo)
+    return posicion + largo if posicion + largo <= tamano else None
+
+
+def _recorrer(f, posicion, tamano):
+    """
+    Recorre los encabezados desde `posicion` y devuelve la posición de
+    cada registro y dónde termina el último completo. Un registro
+    incompleto al final (guardado interrumpido) se ignora.
+    """
+    posiciones = array("Q")
+    while True:
+        fin = _fin_registro(f, posicion, tamano)
+        if fin is None:
+            return posiciones, posicion
+        posiciones.append(posicion)
+        posicion = fin
+
+
+def _bytes_indice(posiciones):
+    """Posiciones como uint64 little-endian, listas para el índice."""
+    if sys.byteorder == "big":
+        posiciones = array("Q", posiciones)
+        posiciones.byteswap()
+    return posiciones.tobytes()
+
+
+def _leer_posiciones(ruta_indice, desde, hasta):
+    """Posiciones de los registros desde..hasta-1, leídas del índice."""
+    posiciones = array("Q")
+    if hasta > desde:
+        with open(ruta_indice, "rb") as f:
+            f.seek(desde * 8)
+            posiciones.frombytes(f.read((hasta - desde) * 8))
+        if sys.byteorder == "big":
+            posiciones.byteswap()
+    return posiciones
+
+
+def _verificar_indice(ruta):
+    """
+    Devuelve (cantidad, fin): los registros completos y dónde termina el
+    último. Comprueba en O(1) que el índice esté al día: su última
+    posición debe apuntar a un registro completo. Si el archivo sigue
+    después (índice más corto), solo se recorren los registros que
+    faltan; si el índice falta o está dañado, se reconstruye entero.
+    """
+    ruta_indice = _ruta_indice(ruta)
+    with open(ruta, "rb") as f:
+        tamano = os.fstat(f.fileno()).st_size
+        valido = os.path.exists(ruta_indice) and os.path.getsize(ruta_indice) % 8 == 0
+        cantidad = fin = 0
+        if valido and os.path.getsize(ruta_indice):
+            cantidad = os.path.getsize(ruta_indice) // 8
+            fin = _fin_registro(f, _leer_posiciones(ruta_indice, cantidad - 1, cantidad)[0], tamano)
+            if fin is None:
+                valido = False
+                cantidad = fin = 0
+        if valido and fin == tamano:
+            return cantidad, fin
+        nuevas, fin = _recorrer(f, fin, tamano)
+
+    if valido:
+        with open(ruta_indice, "ab") as f:
+            f.write(_bytes_indice(nuevas))
+    else:
+        temporal = ruta_indice + ".tmp"
+        with open(temporal, "wb") as f:
+            f.write(_bytes_indice(nuevas))
+        os.replace(temporal, ruta_indice)
+    return cantidad + len(nuevas), fin
+
+
+class ArchivoBinario:
+    """
+    Lector de guardado.bin mediante mmap. Uso:
+
+        with ArchivoBinario(ruta) as archivo:
+            columnas = archivo.columnas(0)      # vistas de NumPy, sin copiar
+            alturas = list(archivo.columna("alturas"))
+
+    Las vistas devueltas dejan de ser válidas al cerrar el archivo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.cantidad, self.fin = _verificar_indice(ruta)
+        self.archivo = open(ruta, "rb")
+        self.datos = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ) if self.fin else b""
+        self.primera, self.posiciones = 0, array("Q")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def __len__(self):
+        return self.cantidad
+
+    def cerrar(self):
+        if isinstance(self.datos, mmap.mmap):
+            try:
+                self.datos.close()
+            except BufferError:
+                # Todavía hay vistas de NumPy en uso: el mapa se libera
+                # cuando se descarten
+                pass
+        self.archivo.close()
+
+    def posicion(self, i):
+        """Posición del registro i en el archivo, tomada del índice."""
+        if not 0 <= i < self.cantidad:
+            raise IndexError(i)
+        if self.primera <= i < self.primera + len(self.posiciones):
+            return self.posiciones[i - self.primera]
+        return _leer_posiciones(_ruta_indice(self.ruta), i, i + 1)[0]
+
+    def cargar_posiciones(self, desde=0, hasta=None):
+        """Lee de una vez las posiciones de un rango, para recorrerlo sin releer el índice."""
+        hasta = self.cantidad if hasta is None else min(hasta, self.cantidad)
+        self.primera = desde
+        self.posiciones = _leer_posiciones(_ruta_indice(self.ruta), desde, hasta)
+
+    def encabezado(self, i):
+        """Devuelve (numero, plantas, extra) del registro i (desde 0)."""
+        posicion = self.posicion(i)
+        _, numero, n, largo_extra = ENCABEZADO.unpack_from(self.datos, posicion)
+        inicio = posicion + ENCABEZADO.size
+        extra = json.loads(bytes(self.datos[inicio:inicio + largo_extra]))
+        return numero, n, extra
+
+    def columnas(self, i):
+        """Vistas de NumPy de las columnas del registro i, sin copiar datos."""
+        posicion = self.posicion(i)
+        _, _, n, largo_extra = ENCABEZADO.unpack_from(self.datos, posicion)
+        desplazamiento = posicion + ENCABEZADO.size + largo_extra
+        desplazamiento += _relleno(desplazamiento - posicion)
+        vistas = {}
+        for nombre, tipo in COLUMNAS:
+            vistas[nombre] = np.frombuffer(self.datos, dtype=tipo, count=n, offset=desplazamiento)
+            desplazamiento += n * tipo.itemsize
+        return vistas
+
+    def columna(self, nombre):
+        """Genera la misma columna de cada simulación, de a una."""
+        self.cargar_posiciones()
+        for i in range(len(self)):
+            yield self.columnas(i)[nombre]
+
+    def simulacion(self, i):
+        """Convierte el registro i al diccionario que usa guardado_json."""
+        numero, _, extra = self.encabezado(i)
+        c = self.columnas(i)
+        agua, luz, temp = (c[f].tolist() for f in ("agua", "luz", "temp"))
+        simulacion = dict(extra)
+        simulacion.update({
+            "numero": numero,
+            "alturas": c["alturas"].tolist(),
+            "muertas": c["muertas"].astype(bool).tolist(),
+            "condiciones": [{"agua": a, "luz": l, "temp": t} for a, l, t in zip(agua, luz, temp)],
+        })
+        return simulacion
+
+
+def guardar(ruta, simulacion):
+    """Agrega una simulación al final del archivo y devuelve su número."""
+    cantidad = fin = 0
+    if os.path.exists(ruta):
+        cantidad, fin = _verificar_indice(ruta)
+    elif os.path.exists(_ruta_indice(ruta)):
+        os.remove(_ruta_indice(ruta))
+    simulacion["numero"] = cantidad + 1
+    with open(ruta, "ab") as f:
+        # Si quedó un registro a medias de un guardado interrumpido, se descarta
+        if f.tell() != fin:
+            f.truncate(fin)
+        f.write(_registro(simulacion["numero"], simulacion))
+    # Si se corta antes de esto, el índice queda corto y se completa al leer
+    with open(_ruta_indice(ruta), "ab") as f:
+        f.write(_bytes_indice(array("Q", [fin])))
+    return simulacion["numero"]
+
+
+def importar(ruta, simulaciones):
+    """Escribe un archivo nuevo con una lista de simulaciones (al migrar)."""
+    posiciones = array("Q")
+    with open(ruta, "wb") as f:
+        for numero, simulacion in enumerate(simulaciones, start=1):
+            posiciones.append(f.tell())
+            f.write(_registro(numero, simulacion))
+    with open(_ruta_indice(ruta), "wb") as f:
+        f.write(_bytes_indice(posiciones))
+
+
+def contar(ruta):
+    if not os.path.exists(ruta):
+        return 0
+    return _verificar_indice(ruta)[0]
+
+
+def listar(ruta, desplazamiento=0, limite=None):
+    """Devuelve una página de simulaciones como diccionarios."""
+    if not os.path.exists(ruta):
+        return []
+    with ArchivoBinario(ruta) as archivo:
+        fin = len(archivo) if limite is None else min(len(archivo), desplazamiento + limite)
+        archivo.cargar_posiciones(desplazamiento, fin)
+        return [archivo.simulacion(i) for i in range(desplazamiento, fin)]
+
+
+def recorrer(ruta):
+    """Genera las simulaciones del archivo de a una, sin armar la lista completa."""
+    if not os.path.exists(ruta):
+        return
+    with ArchivoBinario(ruta) as archivo:
+        archivo.cargar_posiciones()
+        for i in range(len(archivo)):
+            yield archivo.simulacion(i)
+
+
+def cargar(ruta, numero):
+    """Devuelve la simulación con ese número (desde 1), o None."""
+    if not os.path.exists(ruta):
+        return None
+    with ArchivoBinario(ruta) as archivo:
+        return archivo.simulacion(numero - 1) if 1 <= numero <= len(archivo) else None
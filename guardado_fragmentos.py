@@ -0,0 +1,452 @@
+# ---------------------------------------------------------------------
+# guardado_fragmentos.py
+# ---------------------------------------------------------------------
+# Almacenamiento para muchas instancias del simulador que guardan en la
+# misma carpeta de datos (por ejemplo, un disco compartido del aula).
+# Se usa desde guardado_json cuando SIMULADOR_FORMATO=fragmentos.
+#
+# Carpeta guardado.fragmentos/:
+#    <escritor>.jsonl     fragmento de cada proceso: solo él le agrega
+#                         líneas, así que los guardados no compiten
+#    consolidado.jsonl    simulaciones ya compactadas, ordenadas por id
+#    *.sellado            fragmentos que una compactación está mezclando
+#    compactar.lock       cerrojo para que compacte una instancia a la vez
+#
+# Cada simulación lleva un "id" único en todo el grupo de instancias:
+# nanosegundos de la hora de guardado, nombre del escritor (equipo,
+# proceso y azar) y un contador. Los id de un mismo fragmento son
+# crecientes, así que cada archivo está ordenado y para leer todo se
+# mezclan los archivos con heapq.merge (mezcla de k vías). El "numero"
+# de cada simulación es su posición en ese orden y se calcula al leer.
+#
+# La compactación (en un hilo aparte cada COMPACTAR_CADA guardados de un
+# proceso, cuando hay más de MAX_FRAGMENTOS archivos sueltos al empezar
+# a usar la carpeta o un fragmento nuevo, o llamando a compactar) renombra los fragmentos a .sellado, espera con
+# flock a que termine cualquier escritura en curso, los mezcla con el
+# consolidado en un archivo nuevo y lo reemplaza con os.replace. Quien
+# escribe, con el cerrojo tomado, comprueba que su fragmento no haya
+# sido renombrado; si lo fue, abre uno nuevo. Sin fcntl (Windows) no se
+# compacta: la lectura mezcla igual todos los fragmentos.
+#
+# Una mezcla abre a lo sumo MAX_ABIERTOS archivos a la vez: si hay más,
+# se mezclan por rondas, de a MAX_ABIERTOS, en archivos temporales.
+# ---------------------------------------------------------------------
+
+import heapq
+import itertools
+import json
+import os
+import secrets
+import shutil
+import socket
+import tempfile
+import threading
+import time
+
+import metricas
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CONSOLIDADO = "consolidado.jsonl"
+CERROJO = "compactar.lock"
+
+# Guardados de este proceso entre compactaciones en segundo plano
+COMPACTAR_CADA = 256
+
+# Fragmentos sueltos a partir de los cuales se compacta en segundo plano
+MAX_FRAGMENTOS = 32
+
+# Archivos que abre a la vez una mezcla; con más, se mezcla por rondas
+MAX_ABIERTOS = 64
+
+# Reintentos de una lectura si una compactación movió los archivos
+REINTENTOS_LECTURA = 5
+
+_lock = threading.Lock()
+_escritor = None
+_ultimo_tiempo = 0
+_secuencia = 0
+_sin_compactar = 0
+_hilo_compactacion = None
+_carpetas_revisadas = set()
+
+# Líneas contadas de cada archivo: ruta -> (inodo, bytes contados, líneas)
+_cuentas = {}
+_lock_cuentas = threading.Lock()
+
+
+def nombre_escritor():
+    """Nombre del fragmento de este proceso, único entre todas las instancias."""
+    global _escritor
+    if _escritor is None:
+        equipo = "".join(c if c.isalnum() else "_" for c in socket.gethostname())
+        _escritor = f"{equipo}-{os.getpid()}-{secrets.token_hex(4)}"
+    return _escritor
+
+
+def _despues_de_fork():
+    """Un proceso hijo es otro escritor: necesita su propio nombre y fragmento."""
+    global _lock, _escritor, _sin_compactar, _hilo_compactacion
+    _lock = threading.Lock()
+    _escritor = _hilo_compactacion = None
+    _sin_compactar = 0
+    _carpetas_revisadas.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_despues_de_fork)
+
+
+def _nuevo_id():
+    """Id creciente dentro del proceso (llamar con _lock tomado)."""
+    global _ultimo_tiempo, _secuencia
+    _ultimo_tiempo = max(time.time_ns(), _ultimo_tiempo + 1)
+    _secuencia += 1
+    return f"{_ultimo_tiempo:019d}-{nombre_escritor()}-{_secuencia:08d}"
+
+
+def _linea(simulacion):
+    """Línea JSON con el id primero, para leerlo sin parsear la línea entera."""
+    datos = {"id": simulacion["id"]}
+    datos.update((k, v) for k, v in simulacion.items() if k not in ("id", "numero"))
+    return (json.dumps(datos, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _id(linea):
+    if linea.startswith(b'{"id":"'):
+        return linea[7:linea.index(b'"', 7)].decode("ascii")
+    return json.loads(linea)["id"]
+
+
+def _bloquear(f, esperar=True):
+    """Cerrojo exclusivo sobre un archivo abierto. Devuelve False si está tomado."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if esperar else fcntl.LOCK_NB))
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _fragmentos(carpeta):
+    """Archivos con simulaciones, salvo el consolidado."""
+    return [os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+            if nombre != CONSOLIDADO and nombre.endswith((".jsonl", ".sellado"))]
+
+
+# ---------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------
+def _agregar(carpeta, lineas):
+    """
+    Agrega líneas al fragmento de este proceso (llamar con _lock tomado).
+    Devuelve True si el fragmento estaba vacío, es decir, si es nuevo.
+    """
+    ruta = os.path.join(carpeta, nombre_escritor() + ".jsonl")
+    while True:
+        f = open(ruta, "ab")
+        _bloquear(f)
+        try:
+            mismo = os.fstat(f.fileno()).st_ino == os.stat(ruta).st_ino
+        except FileNotFoundError:
+            mismo = False
+        if mismo:
+            break
+        # Una compactación se llevó el fragmento: se empieza uno nuevo
+        f.close()
+    with f:
+        nuevo = os.fstat(f.fileno()).st_size == 0
+        f.writelines(lineas)
+    if metricas.ACTIVAS:
+        metricas.contar_bytes(escritos=sum(map(len, lineas)))
+    return nuevo
+
+
+def guardar(carpeta, simulacion):
+    """
+    Agrega una simulación al fragmento de este proceso, le asigna su id y
+    lo devuelve. Solo se toca el fragmento propio: el "numero" depende de
+    lo que guarden las demás instancias y se calcula al leer.
+    """
+    global _sin_compactar
+    with _lock:
+        simulacion["id"] = _nuevo_id()
+        simulacion.pop("numero", None)
+        nuevo = _agregar(carpeta, [_linea(simulacion)])
+        _sin_compactar += 1
+        if _sin_compactar >= COMPACTAR_CADA:
+            _sin_compactar = 0
+            compactar_en_segundo_plano(carpeta)
+        elif nuevo:
+            revisar(carpeta)
+    return simulacion["id"]
+
+
+def importar(carpeta, simulaciones):
+    """Agrega un historial existente (al migrar), conservando su orden."""
+    with _lock:
+        lineas = []
+        for simulacion in simulaciones:
+            simulacion = dict(simulacion, id=_nuevo_id())
+            lineas.append(_linea(simulacion))
+        if lineas:
+            _agregar(carpeta, lineas)
+
+
+def borrar_fragmento_propio(carpeta):
+    """Borra lo que esta instancia guardó y todavía no se compactó."""
+    with _lock:
+        ruta = os.path.join(carpeta, nombre_escritor() + ".jsonl")
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+# ---------------------------------------------------------------------
+# Lectura: mezcla de k vías de los archivos ordenados
+# ---------------------------------------------------------------------
+def _lineas_completas(f):
+    """Líneas terminadas de un archivo (la última puede estar a medio escribir)."""
+    for linea in f:
+        if linea.endswith(b"\n"):
+            if metricas.ACTIVAS:
+                metricas.contar_bytes(leidos=len(linea))
+            yield linea
+
+
+def _abrir(rutas):
+    """Abre las rutas (el consolidado puede no existir todavía)."""
+    archivos = []
+    try:
+        for ruta in rutas:
+            try:
+                archivos.append(open(ruta, "rb"))
+            except FileNotFoundError:
+                if os.path.basename(ruta) != CONSOLIDADO:
+                    raise
+    except BaseException:
+        for f in archivos:
+            f.close()
+        raise
+    return archivos
+
+
+def _cerrar(archivos, temporal):
+    for f in archivos:
+        f.close()
+    if temporal is not None:
+        shutil.rmtree(temporal, ignore_errors=True)
+
+
+def _preparar_mezcla(rutas):
+    """
+    Abre las rutas para mezclarlas sin pasar de MAX_ABIERTOS archivos a
+    la vez: mientras sobren, mezcla las primeras MAX_ABIERTOS en un
+    archivo temporal que toma su lugar al final de la lista. Devuelve
+    (archivos abiertos, carpeta temporal o None); cerrar con _cerrar.
+    """
+    rutas = list(rutas)
+    temporal = None
+    try:
+        while len(rutas) > MAX_ABIERTOS:
+            if temporal is None:
+                temporal = tempfile.mkdtemp(prefix="mezcla-")
+            grupo, rutas = rutas[:MAX_ABIERTOS], rutas[MAX_ABIERTOS:]
+            archivos = _abrir(grupo)
+            try:
+                descriptor, parcial = tempfile.mkstemp(dir=temporal, suffix=".jsonl")
+                with os.fdopen(descriptor, "wb") as salida:
+                    for _, linea in _mezclar(archivos):
+                        salida.write(linea)
+            finally:
+                for f in archivos:
+                    f.close()
+            rutas.append(parcial)
+        return _abrir(rutas), temporal
+    except BaseException:
+        _cerrar([], temporal)
+        raise
+
+
+def _abrir_todos(carpeta):
+    """
+    Prepara la mezcla del consolidado y todos los fragmentos. Si una
+    compactación movió alguno entre listar la carpeta y abrirlo, se
+    vuelve a empezar.
+    """
+    for _ in range(REINTENTOS_LECTURA):
+        try:
+            return _preparar_mezcla(_fragmentos(carpeta) + [os.path.join(carpeta, CONSOLIDADO)])
+        except FileNotFoundError:
+            continue
+    raise RuntimeError("Los fragmentos cambiaron durante la lectura; intentá de nuevo.")
+
+
+def _mezclar(archivos):
+    """Genera (id, línea) en orden de id, sin repetir (tras una compactación cortada)."""
+    ordenadas = heapq.merge(*(((_id(l), l) for l in _lineas_completas(f)) for f in archivos))
+    anterior = None
+    for clave, linea in ordenadas:
+        if clave != anterior:
+            anterior = clave
+            yield clave, linea
+
+
+def recorrer(carpeta, desde=0, hasta=None):
+    """
+    Genera las simulaciones de todos los fragmentos en orden, numeradas
+    desde 1. Con desde/hasta solo se decodifican las de ese tramo: las
+    anteriores se saltean en la mezcla por su id, sin parsear el JSON.
+    """
+    if not os.path.isdir(carpeta):
+        return
+    archivos, temporal = _abrir_todos(carpeta)
+    try:
+        tramo = itertools.islice(_mezclar(archivos), desde, hasta)
+        for numero, (_, linea) in enumerate(tramo, start=desde + 1):
+            simulacion = json.loads(linea)
+            simulacion["numero"] = numero
+            yield simulacion
+    finally:
+        _cerrar(archivos, temporal)
+
+
+def listar(carpeta, desplazamiento=0, limite=None):
+    fin = None if limite is None else desplazamiento + limite
+    return list(recorrer(carpeta, desplazamiento, fin))
+
+
+def cargar(carpeta, numero):
+    """Devuelve la simulación con ese número (desde 1), o None."""
+    if numero < 1:
+        return None
+    encontradas = list(recorrer(carpeta, numero - 1, numero))
+    return encontradas[0] if encontradas else None
+
+
+def _contar_lineas(ruta):
+    """
+    Líneas completas de un archivo. Como los fragmentos solo crecen, se
+    recuerda hasta dónde se contó y se sigue desde ahí; el consolidado
+    se vuelve a contar entero solo cuando una compactación lo reemplaza.
+    """
+    try:
+        f = open(ruta, "rb")
+    except FileNotFoundError:
+        return 0
+    with f:
+        estado = os.fstat(f.fileno())
+        with _lock_cuentas:
+            inodo, tamano, lineas = _cuentas.get(ruta, (None, 0, 0))
+        if inodo != estado.st_ino or estado.st_size < tamano:
+            tamano = lineas = 0
+        f.seek(tamano)
+        while bloque := f.read(1 << 20):
+            lineas += bloque.count(b"\n")
+            tamano += len(bloque)
+    with _lock_cuentas:
+        _cuentas[ruta] = (estado.st_ino, tamano, lineas)
+    return lineas
+
+
+def _rutas(carpeta):
+    rutas = _fragmentos(carpeta) + [os.path.join(carpeta, CONSOLIDADO)]
+    with _lock_cuentas:
+        for ruta in set(_cuentas) - set(rutas):
+            del _cuentas[ruta]
+    return rutas
+
+
+def contar(carpeta):
+    """
+    Cantidad de simulaciones, sin parsear: líneas completas de todos los
+    archivos. Durante el instante en que una compactación ya reemplazó
+    el consolidado pero no borró los sellados, puede contar de más.
+    """
+    if not os.path.isdir(carpeta):
+        return 0
+    return sum(_contar_lineas(ruta) for ruta in _rutas(carpeta))
+
+
+# ---------------------------------------------------------------------
+# Compactación
+# ---------------------------------------------------------------------
+def compactar(carpeta):
+    """
+    Mezcla los fragmentos con el consolidado en un consolidado nuevo,
+    ordenado por id. Si otra instancia ya está compactando, no hace nada.
+    Devuelve cuántas simulaciones tiene el consolidado (0 si no compactó).
+    """
+    if fcntl is None or not os.path.isdir(carpeta):
+        return 0
+    with open(os.path.join(carpeta, CERROJO), "ab") as cerrojo:
+        if not _bloquear(cerrojo, esperar=False):
+            return 0
+
+        # Sellar: quien escriba después abre un fragmento nuevo
+        sellados = [ruta for ruta in _fragmentos(carpeta) if ruta.endswith(".sellado")]
+        for ruta in _fragmentos(carpeta):
+            if ruta.endswith(".jsonl"):
+                sellado = f"{ruta}.{time.time_ns()}.sellado"
+                os.rename(ruta, sellado)
+                sellados.append(sellado)
+
+        for ruta in sellados:
+            with open(ruta, "rb") as f:
+                # Espera a que termine una escritura que empezó antes de sellar
+                _bloquear(f)
+
+        ruta_consolidado = os.path.join(carpeta, CONSOLIDADO)
+        archivos, temporal = _preparar_mezcla(sellados + [ruta_consolidado])
+        try:
+            descriptor, salida_temporal = tempfile.mkstemp(dir=carpeta, prefix=CONSOLIDADO, suffix=".tmp")
+            cantidad = 0
+            try:
+                with os.fdopen(descriptor, "wb") as salida:
+                    for _, linea in _mezclar(archivos):
+                        salida.write(linea)
+                        cantidad += 1
+                    salida.flush()
+                    os.fsync(salida.fileno())
+                os.replace(salida_temporal, ruta_consolidado)
+            except BaseException:
+                if os.path.exists(salida_temporal):
+                    os.remove(salida_temporal)
+                raise
+        finally:
+            _cerrar(archivos, temporal)
+
+        for ruta in sellados:
+            os.remove(ruta)
+    return cantidad
+
+
+def revisar(carpeta):
+    """Compacta en segundo plano si hay más de MAX_FRAGMENTOS archivos sueltos."""
+    if fcntl is not None and len(_fragmentos(carpeta)) > MAX_FRAGMENTOS:
+        compactar_en_segundo_plano(carpeta)
+
+
+def revisar_al_empezar(carpeta):
+    """
+    Llama a revisar la primera vez que este proceso usa la carpeta: cada
+    sesión corta deja su fragmento, y sin esto se acumularían sin
+    compactar si ningún proceso llega a COMPACTAR_CADA guardados.
+    """
+    if carpeta not in _carpetas_revisadas:
+        _carpetas_revisadas.add(carpeta)
+        revisar(carpeta)
+
+
+def compactar_en_segundo_plano(carpeta):
+    """Lanza compactar en un hilo, salvo que ya haya uno en curso en este proceso."""
+    global _hilo_compactacion
+    if _hilo_compactacion is not None and _hilo_compactacion.is_alive():
+        return _hilo_compactacion
+    _hilo_compactacion = threading.Thread(target=compactar, args=(carpeta,),
+                                          name="compactacion", daemon=True)
+    _hilo_compactacion.start()
+    return _hilo_compactacion
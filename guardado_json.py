@@ -4,74 +4,780 @@
 # Módulo para guardar y cargar múltiples simulaciones del simulador
 # de plantas en formato JSON.
 # Cada simulación se guarda como un diccionario con un número y sus datos.
+#
+# Formatos de almacenamiento (variable de entorno SIMULADOR_FORMATO):
+# - "jsonl" (por defecto): una simulación por línea en guardado.jsonl,
+#   más un índice guardado.idx con la posición de cada línea. Guardar
+#   agrega una línea sin releer el historial y cada simulación se puede
+#   leer sola con seek. Un guardado.json anterior se migra solo.
+# - "json": la lista completa en guardado.json (formato original).
+# - "sqlite": base guardado.sqlite3 con plantas y condiciones en tablas
+#   indexadas (ver guardado_sqlite.py); permite listar por páginas y
+#   filtrar en la base. Un historial JSON existente se importa solo.
+# - "binario": guardado.bin con las columnas de cada simulación como
+#   arreglos contiguos, leídos con mmap, y un índice guardado.bin.idx
+#   con la posición de cada registro (ver guardado_binario.py).
+#   exportar_json sigue generando JSON para compartir los datos.
+# - "fragmentos": carpeta guardado.fragmentos con un archivo por proceso
+#   escritor y un consolidado ordenado, para que muchas instancias
+#   guarden a la vez en la misma carpeta (ver guardado_fragmentos.py).
 # ---------------------------------------------------------------------
 
 import json
+import marshal
+import operator
 import os
+import queue
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+import guardado_sqlite
+import metricas
+from especies import (rangos_ideales, PLANTAS_POR_DEFECTO, ALTURA_INICIAL,
+                      CONDICIONES_INICIALES)
 
 # Ruta al archivo JSON dentro de la carpeta /data
 BASE_DIR = os.path.dirname(__file__)
 ARCHIVO_DATOS = os.path.join(BASE_DIR, "data", "guardado.json")
 
-# Valores por defecto de cada planta
-VALORES_IDEALES_POR_DEFECTO = {
-    "agua": [70, 90],
-    "luz": [6, 10],
-    "temp": [18, 28]
-}
+# Formato de almacenamiento: "jsonl" (solo agregar), "json" (lista completa)
+# "sqlite" (base de datos con consultas indexadas), "binario" (columnas
+# contiguas leídas con mmap) o "fragmentos" (varias instancias a la vez)
+FORMATO = os.environ.get("SIMULADOR_FORMATO", "jsonl")
+
+# Un solo cerrojo para guardado.jsonl y su índice: verificar o
+# reconstruir el índice, leer por posición, agregar y reiniciar no se
+# mezclan entre el hilo de guardado y los lectores de la interfaz
+_lock_jsonl = threading.RLock()
+
+# Tope de memoria de la caché de historiales leídos (en bytes de los archivos)
+MAX_BYTES_CACHE = 64 * 1024 * 1024
+
+# Valores por defecto de cada planta (rangos ideales del tomate)
+VALORES_IDEALES_POR_DEFECTO = {factor: list(rango) for factor, rango in rangos_ideales().items()}
 
 # Estado por defecto de una simulación
 SIMULACION_POR_DEFECTO = {
     "numero": 1,
-    "alturas": [3, 3, 3, 3],
-    "muertas": [False, False, False, False],
-    "agua": [80, 80, 80, 80],
-    "luz": [8, 8, 8, 8],
-    "temp": [22, 22, 22, 22]
+    "alturas": [ALTURA_INICIAL] * PLANTAS_POR_DEFECTO,
+    "muertas": [False] * PLANTAS_POR_DEFECTO,
+    "condiciones": [dict(CONDICIONES_INICIALES) for _ in range(PLANTAS_POR_DEFECTO)]
 }
 
 
-def cargar_simulaciones():
+def _rutas_jsonl():
+    """Rutas del archivo JSON Lines y de su índice, junto a ARCHIVO_DATOS."""
+    base = os.path.splitext(ARCHIVO_DATOS)[0]
+    return base + ".jsonl", base + ".idx"
+
+
+def _asegurar_carpeta():
+    """Asegurarse de que la carpeta de datos exista."""
+    os.makedirs(os.path.dirname(ARCHIVO_DATOS), exist_ok=True)
+
+
+def _escribir_atomico(ruta, datos):
     """
-    Carga todas las simulaciones guardadas.
-    Devuelve una lista de simulaciones.
-    Si no existe archivo, devuelve lista vacía.
+    Escribe datos (bytes) en un archivo temporal de la misma carpeta y
+    lo reemplaza con os.replace: si el programa se corta a mitad de la
+    escritura, el archivo anterior queda intacto.
+    """
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta) or ".",
+                                            prefix=os.path.basename(ruta), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            f.write(datos)
+            if metricas.ACTIVAS:
+                metricas.contar_bytes(escritos=len(datos))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+# ---------------------------------------------------------------------
+# Caché de historiales leídos
+# ---------------------------------------------------------------------
+# Clave: ruta del archivo. Valor: (mtime_ns, tamaño, simulaciones).
+# Si el archivo no cambió (misma fecha de modificación y mismo tamaño)
+# se devuelve lo ya leído sin volver a pasar por el parser de JSON.
+# La lista de la caché es compartida y nadie la modifica (cada guardado
+# propio arma una lista nueva): las lecturas internas que solo miran
+# (contar, páginas, buscar, exportar) la usan directo, y lo que se
+# entrega a quien puede modificarlo pasa por _copia.
+_cache = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _firma(ruta):
+    estado = os.stat(ruta)
+    return estado.st_mtime_ns, estado.st_size
+
+
+def _copia(datos):
+    """Copia independiente de simulaciones de la caché (marshal copia más rápido que deepcopy)."""
+    return marshal.loads(marshal.dumps(datos))
+
+
+def _leer_con_cache(ruta, leer):
     """
+    Devuelve la lista de simulaciones de `ruta`, usando la caché si el
+    archivo no cambió. La lista es la de la caché: no hay que modificarla.
+    """
+    global _cache_bytes
+    firma = _firma(ruta)
+    with _cache_lock:
+        guardado = _cache.get(ruta)
+        if guardado is not None and guardado[:2] == firma:
+            _cache.move_to_end(ruta)
+            return guardado[2]
+
+    simulaciones = leer()
+    if firma[1] <= MAX_BYTES_CACHE and firma == _firma(ruta):
+        with _cache_lock:
+            _quitar_de_cache(ruta)
+            _cache[ruta] = (firma[0], firma[1], simulaciones)
+            _cache_bytes += firma[1]
+            while _cache_bytes > MAX_BYTES_CACHE:
+                _quitar_de_cache(next(iter(_cache)))
+    return simulaciones
+
+
+def _quitar_de_cache(ruta):
+    """Saca una ruta de la caché (llamar con _cache_lock tomado)."""
+    global _cache_bytes
+    guardado = _cache.pop(ruta, None)
+    if guardado is not None:
+        _cache_bytes -= guardado[1]
+
+
+def _agregar_a_cache(ruta, firma_anterior, simulacion):
+    """
+    Tras agregar una simulación al final del archivo, actualiza la
+    caché si estaba al día (con una lista nueva, para no cambiar la que
+    otro hilo pueda estar recorriendo); si no, la descarta.
+    """
+    global _cache_bytes
+    with _cache_lock:
+        guardado = _cache.get(ruta)
+        if guardado is None:
+            return
+        if guardado[:2] != firma_anterior:
+            _quitar_de_cache(ruta)
+            return
+        firma = _firma(ruta)
+        _cache[ruta] = (firma[0], firma[1], guardado[2] + [simulacion])
+        _cache.move_to_end(ruta)
+        _cache_bytes += firma[1] - guardado[1]
+        while _cache_bytes > MAX_BYTES_CACHE:
+            _quitar_de_cache(next(iter(_cache)))
+
+
+def limpiar_cache(ruta=None):
+    """Vacía la caché (o solo la de una ruta). Se llama en cada escritura propia."""
+    global _cache_bytes
+    with _cache_lock:
+        if ruta is None:
+            _cache.clear()
+            _cache_bytes = 0
+        else:
+            _quitar_de_cache(ruta)
+
+
+# ---------------------------------------------------------------------
+# Formato original: lista completa en guardado.json
+# ---------------------------------------------------------------------
+def _cargar_json():
+    """Lista de la caché (no modificar; ver _leer_con_cache)."""
     if not os.path.exists(ARCHIVO_DATOS):
         print("No se encontró archivo guardado. Se usarán valores por defecto.")
         return []
 
-    try:
+    def leer():
         with open(ARCHIVO_DATOS, "r", encoding="utf-8") as f:
             datos = json.load(f)
-            if not isinstance(datos, list):
-                return []
-            return datos
+            if metricas.ACTIVAS:
+                metricas.contar_bytes(leidos=os.fstat(f.fileno()).st_size)
+        return datos if isinstance(datos, list) else []
+
+    try:
+        return _leer_con_cache(ARCHIVO_DATOS, leer)
     except (json.JSONDecodeError, FileNotFoundError):
         print("Error al leer el archivo. Se usarán valores por defecto.")
         return []
 
 
+def _guardar_json(simulacion):
+    simulaciones = _cargar_json()
+    simulacion["numero"] = len(simulaciones) + 1
+    simulaciones = simulaciones + [simulacion]
+
+    _asegurar_carpeta()
+    _escribir_atomico(ARCHIVO_DATOS, json.dumps(simulaciones, indent=4, ensure_ascii=False).encode("utf-8"))
+    limpiar_cache(ARCHIVO_DATOS)
+    return simulacion["numero"]
+
+
+# ---------------------------------------------------------------------
+# Formato de solo agregar: guardado.jsonl + índice de posiciones
+# ---------------------------------------------------------------------
+def _linea(simulacion):
+    """Serializa una simulación en una sola línea compacta."""
+    return (json.dumps(simulacion, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _reconstruir_indice():
+    """
+    Recorre guardado.jsonl y vuelve a escribir el índice desde cero.
+    Si la última línea quedó incompleta (guardado interrumpido), se descarta.
+    """
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    indice = array("Q")
+    with open(ruta_jsonl, "r+b") as f:
+        posicion = 0
+        for linea in f:
+            if not linea.endswith(b"\n"):
+                f.truncate(posicion)
+                break
+            if linea.strip():
+                indice.append(posicion)
+            posicion += len(linea)
+    _escribir_atomico(ruta_indice, indice.tobytes())
+
+
+def _verificar_indice():
+    """
+    Comprueba en O(1) que el índice esté al día: su última posición debe
+    apuntar a la última línea completa del archivo. Si un guardado se
+    cortó a mitad de camino, el índice se reconstruye.
+    """
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    if not os.path.exists(ruta_jsonl):
+        if os.path.exists(ruta_indice):
+            os.remove(ruta_indice)
+        return
+
+    tamano = os.path.getsize(ruta_jsonl)
+    if os.path.exists(ruta_indice) and os.path.getsize(ruta_indice) % 8 == 0:
+        if os.path.getsize(ruta_indice) == 0:
+            if tamano == 0:
+                return
+        else:
+            with open(ruta_indice, "rb") as f:
+                f.seek(-8, os.SEEK_END)
+                ultima = array("Q", f.read(8))[0]
+            if ultima < tamano:
+                with open(ruta_jsonl, "rb") as f:
+                    f.seek(ultima)
+                    if f.readline().endswith(b"\n") and f.tell() == tamano:
+                        return
+    _reconstruir_indice()
+
+
+def _cantidad_indice():
+    """Cantidad de simulaciones según el índice: 8 bytes por simulación."""
+    _, ruta_indice = _rutas_jsonl()
+    return os.path.getsize(ruta_indice) // 8 if os.path.exists(ruta_indice) else 0
+
+
+def _migrar_json():
+    """
+    Convierte un guardado.json anterior al formato de solo agregar.
+    El archivo original se conserva renombrado como guardado.json.migrado.
+    """
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    with _lock_jsonl:
+        if os.path.exists(ruta_jsonl) or not os.path.exists(ARCHIVO_DATOS):
+            return
+        simulaciones = _cargar_json()
+        indice = array("Q")
+        lineas = []
+        posicion = 0
+        for numero, simulacion in enumerate(simulaciones, start=1):
+            if "numero" not in simulacion:
+                simulacion = dict(simulacion, numero=numero)
+            indice.append(posicion)
+            lineas.append(_linea(simulacion))
+            posicion += len(lineas[-1])
+        _escribir_atomico(ruta_indice, indice.tobytes())
+        _escribir_atomico(ruta_jsonl, b"".join(lineas))
+        os.replace(ARCHIVO_DATOS, ARCHIVO_DATOS + ".migrado")
+
+
+def _guardar_jsonl(simulacion):
+    _asegurar_carpeta()
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    with _lock_jsonl:
+        _migrar_json()
+        _verificar_indice()
+
+        # El número sale del índice, sin leer las simulaciones anteriores
+        numero = _cantidad_indice() + 1
+        simulacion["numero"] = numero
+
+        linea = _linea(simulacion)
+        firma_anterior = _firma(ruta_jsonl) if os.path.exists(ruta_jsonl) else None
+        with open(ruta_jsonl, "ab") as f:
+            posicion = f.seek(0, os.SEEK_END)
+            f.write(linea)
+        with open(ruta_indice, "ab") as f:
+            f.write(array("Q", [posicion]).tobytes())
+        # La caché guarda la simulación tal como se leería del archivo
+        _agregar_a_cache(ruta_jsonl, firma_anterior, json.loads(linea))
+    if metricas.ACTIVAS:
+        metricas.contar_bytes(escritos=len(linea) + 8)
+    return numero
+
+
+def _cargar_jsonl():
+    """Lista de la caché (no modificar; ver _leer_con_cache)."""
+    _migrar_json()
+    ruta_jsonl, _ = _rutas_jsonl()
+    if not os.path.exists(ruta_jsonl):
+        print("No se encontró archivo guardado. Se usarán valores por defecto.")
+        return []
+
+    def leer():
+        simulaciones = []
+        with open(ruta_jsonl, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    simulaciones.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    # Línea incompleta de un guardado interrumpido
+                    continue
+            if metricas.ACTIVAS:
+                metricas.contar_bytes(leidos=os.fstat(f.fileno()).st_size)
+        return simulaciones
+
+    return _leer_con_cache(ruta_jsonl, leer)
+
+
+# ---------------------------------------------------------------------
+# Formato SQLite (guardado_sqlite.py)
+# ---------------------------------------------------------------------
+def _ruta_sqlite():
+    """Ruta de la base SQLite, junto a ARCHIVO_DATOS."""
+    return os.path.splitext(ARCHIVO_DATOS)[0] + ".sqlite3"
+
+
+def _preparar_sqlite():
+    """
+    Devuelve la ruta de la base. La primera vez que se crea, importa el
+    historial que hubiera en guardado.json o guardado.jsonl.
+    """
+    ruta = _ruta_sqlite()
+    if not os.path.exists(ruta):
+        _asegurar_carpeta()
+        ruta_jsonl, _ = _rutas_jsonl()
+        if os.path.exists(ruta_jsonl):
+            guardado_sqlite.importar(ruta, _cargar_jsonl())
+        elif os.path.exists(ARCHIVO_DATOS):
+            guardado_sqlite.importar(ruta, _cargar_json())
+        else:
+            guardado_sqlite.conectar(ruta).close()
+    return ruta
+
+
+# ---------------------------------------------------------------------
+# Formato binario por columnas (guardado_binario.py)
+# ---------------------------------------------------------------------
+def _ruta_binaria():
+    """Ruta del archivo binario, junto a ARCHIVO_DATOS."""
+    return os.path.splitext(ARCHIVO_DATOS)[0] + ".bin"
+
+
+def _preparar_binario():
+    """
+    Importa guardado_binario (que carga NumPy solo cuando se usa este
+    formato) y devuelve el módulo y la ruta del archivo. La primera vez
+    convierte el historial que hubiera en guardado.json o guardado.jsonl.
+    """
+    import guardado_binario
+
+    ruta = _ruta_binaria()
+    if not os.path.exists(ruta):
+        _asegurar_carpeta()
+        ruta_jsonl, _ = _rutas_jsonl()
+        if os.path.exists(ruta_jsonl):
+            guardado_binario.importar(ruta, _cargar_jsonl())
+        elif os.path.exists(ARCHIVO_DATOS):
+            guardado_binario.importar(ruta, _cargar_json())
+    return guardado_binario, ruta
+
+
+# ---------------------------------------------------------------------
+# Formato de varios escritores (guardado_fragmentos.py)
+# ---------------------------------------------------------------------
+def _carpeta_fragmentos():
+    """Carpeta de los fragmentos, junto a ARCHIVO_DATOS."""
+    return os.path.splitext(ARCHIVO_DATOS)[0] + ".fragmentos"
+
+
+def _preparar_fragmentos():
+    """
+    Importa guardado_fragmentos y devuelve el módulo y la carpeta. La
+    primera vez (con el cerrojo de compactación tomado, para que lo haga
+    una sola instancia) incorpora el historial de guardado.json o
+    guardado.jsonl. Al empezar a usarla, revisa si hay que compactar.
+    """
+    import guardado_fragmentos
+
+    carpeta = _carpeta_fragmentos()
+    if not os.path.isdir(carpeta):
+        _asegurar_carpeta()
+        os.makedirs(carpeta, exist_ok=True)
+        with open(os.path.join(carpeta, guardado_fragmentos.CERROJO), "ab") as cerrojo:
+            guardado_fragmentos._bloquear(cerrojo)
+            if guardado_fragmentos.contar(carpeta) == 0:
+                ruta_jsonl, _ = _rutas_jsonl()
+                if os.path.exists(ruta_jsonl):
+                    guardado_fragmentos.importar(carpeta, _cargar_jsonl())
+                elif os.path.exists(ARCHIVO_DATOS):
+                    guardado_fragmentos.importar(carpeta, _cargar_json())
+    guardado_fragmentos.revisar_al_empezar(carpeta)
+    return guardado_fragmentos, carpeta
+
+
+def _listar_jsonl(desplazamiento, limite):
+    """Lee solo la página pedida: busca la primera con el índice y sigue de corrido."""
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    with _lock_jsonl:
+        _migrar_json()
+        _verificar_indice()
+        if desplazamiento >= _cantidad_indice():
+            return []
+        with open(ruta_indice, "rb") as f:
+            f.seek(desplazamiento * 8)
+            posicion = array("Q", f.read(8))[0]
+
+        simulaciones = []
+        with open(ruta_jsonl, "rb") as f:
+            f.seek(posicion)
+            for linea in f:
+                if limite is not None and len(simulaciones) >= limite:
+                    break
+                simulaciones.append(json.loads(linea))
+    return simulaciones
+
+
+# Operadores permitidos en los filtros de buscar_simulaciones
+OPERADORES = {"=": operator.eq, "!=": operator.ne, "<": operator.lt,
+              "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def _cumple(simulacion, filtros):
+    """True si alguna planta de la simulación cumple todos los filtros."""
+    alturas = simulacion.get("alturas", [])
+    muertas = simulacion.get("muertas", [False] * len(alturas))
+    condiciones = simulacion.get("condiciones", [{}] * len(alturas))
+    for altura, muerta, cond in zip(alturas, muertas, condiciones):
+        planta = {"altura": altura, "muerta": muerta, **cond}
+        if all(planta.get(columna) is not None and OPERADORES[op](planta[columna], valor)
+               for columna, op, valor in filtros):
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------
+# Funciones públicas
+# ---------------------------------------------------------------------
+def _tamano(ruta):
+    return os.path.getsize(ruta) if os.path.exists(ruta) else 0
+
+
+@metricas.medir("cargar_simulaciones")
+def cargar_simulaciones(copiar=True):
+    """
+    Carga todas las simulaciones guardadas.
+    Devuelve una lista de simulaciones.
+    Si no existe archivo, devuelve lista vacía.
+    Con copiar=False, en "json" y "jsonl" devuelve la lista de la caché
+    sin copiarla (microsegundos si el archivo no cambió): es solo para
+    leer, no hay que modificarla.
+    """
+    if FORMATO == "sqlite":
+        ruta = _preparar_sqlite()
+        if metricas.ACTIVAS:
+            # Con WAL, lo último guardado puede estar todavía en el -wal
+            metricas.contar_bytes(leidos=_tamano(ruta) + _tamano(ruta + "-wal"))
+        return guardado_sqlite.listar(ruta)
+    if FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        if metricas.ACTIVAS:
+            metricas.contar_bytes(leidos=_tamano(ruta))
+        return binario.listar(ruta)
+    if FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        return fragmentos.listar(carpeta)
+    simulaciones = _cargar_json() if FORMATO == "json" else _cargar_jsonl()
+    return _copia(simulaciones) if copiar else simulaciones
+
+
+@metricas.medir("guardar_simulacion")
 def guardar_simulacion(simulacion):
     """
     Guarda una nueva simulación en la lista de simulaciones del archivo JSON.
     Asigna automáticamente un número consecutivo a la simulación.
+    En formato "jsonl" solo agrega una línea al final del archivo.
+    Devuelve el número asignado; en "fragmentos", el id de la simulación
+    (el número depende de las demás instancias y se calcula al leer).
     """
-    simulaciones = cargar_simulaciones()
-    simulacion["numero"] = len(simulaciones) + 1
-    simulaciones.append(simulacion)
+    if FORMATO == "sqlite":
+        numero = guardado_sqlite.guardar(_preparar_sqlite(), simulacion)
+        if metricas.ACTIVAS:
+            # La base escribe en el -wal, que se reutiliza tras cada
+            # checkpoint: su tamaño no sirve, se cuenta el registro serializado
+            metricas.contar_bytes(escritos=len(_linea(simulacion)))
+        return numero
+    if FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        antes = _tamano(ruta) if metricas.ACTIVAS else 0
+        numero = binario.guardar(ruta, simulacion)
+        if metricas.ACTIVAS:
+            metricas.contar_bytes(escritos=_tamano(ruta) - antes)
+        return numero
+    if FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        return fragmentos.guardar(carpeta, simulacion)
+    if FORMATO == "json":
+        return _guardar_json(simulacion)
+    return _guardar_jsonl(simulacion)
+
+
+def contar_simulaciones():
+    """Devuelve cuántas simulaciones hay guardadas."""
+    if FORMATO == "sqlite":
+        return guardado_sqlite.contar(_preparar_sqlite())
+    if FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        return binario.contar(ruta)
+    if FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        return fragmentos.contar(carpeta)
+    if FORMATO == "json":
+        return len(_cargar_json())
+    with _lock_jsonl:
+        _migrar_json()
+        _verificar_indice()
+        return _cantidad_indice()
+
+
+def cargar_simulacion(numero):
+    """
+    Carga una sola simulación por su número (desde 1).
+    En formato "jsonl" la busca en el índice y la lee con seek.
+    Devuelve None si no existe.
+    """
+    if FORMATO == "sqlite":
+        return guardado_sqlite.cargar(_preparar_sqlite(), numero)
+    if FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        return binario.cargar(ruta, numero)
+    if FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        return fragmentos.cargar(carpeta, numero)
+    if FORMATO == "json":
+        simulaciones = _cargar_json()
+        return _copia(simulaciones[numero - 1]) if 1 <= numero <= len(simulaciones) else None
+
+    ruta_jsonl, ruta_indice = _rutas_jsonl()
+    with _lock_jsonl:
+        _migrar_json()
+        _verificar_indice()
+        if not 1 <= numero <= _cantidad_indice():
+            return None
+        with open(ruta_indice, "rb") as f:
+            f.seek((numero - 1) * 8)
+            posicion = array("Q", f.read(8))[0]
+        with open(ruta_jsonl, "rb") as f:
+            f.seek(posicion)
+            return json.loads(f.readline())
+
+
+def listar_simulaciones(desplazamiento=0, limite=None):
+    """
+    Devuelve una página de simulaciones: hasta `limite` simulaciones a
+    partir de la posición `desplazamiento` (0 es la primera guardada).
+    """
+    if FORMATO == "sqlite":
+        return guardado_sqlite.listar(_preparar_sqlite(), desplazamiento, limite)
+    if FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        return binario.listar(ruta, desplazamiento, limite)
+    if FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        return fragmentos.listar(carpeta, desplazamiento, limite)
+    if FORMATO == "json":
+        fin = None if limite is None else desplazamiento + limite
+        return _copia(_cargar_json()[desplazamiento:fin])
+    return _listar_jsonl(desplazamiento, limite)
+
+
+def recorrer_simulaciones(tamano_pagina=256):
+    """
+    Genera las simulaciones guardadas de a una, sin armar la lista
+    completa ni pasar por la caché. En "jsonl" se lee línea por línea,
+    en "binario" registro por registro, en "fragmentos" mezclando los
+    archivos de a una línea y en "sqlite" por páginas; el
+    formato "json" es un único documento y se carga entero.
+    """
+    if FORMATO == "sqlite":
+        ruta = _preparar_sqlite()
+        desplazamiento = 0
+        while True:
+            pagina = guardado_sqlite.listar(ruta, desplazamiento, tamano_pagina)
+            yield from pagina
+            if len(pagina) < tamano_pagina:
+                return
+            desplazamiento += tamano_pagina
+    elif FORMATO == "binario":
+        binario, ruta = _preparar_binario()
+        yield from binario.recorrer(ruta)
+    elif FORMATO == "fragmentos":
+        fragmentos, carpeta = _preparar_fragmentos()
+        yield from fragmentos.recorrer(carpeta)
+    elif FORMATO == "json":
+        for simulacion in _cargar_json():
+            yield _copia(simulacion)
+    else:
+        _migrar_json()
+        ruta_jsonl, _ = _rutas_jsonl()
+        if not os.path.exists(ruta_jsonl):
+            return
+        with open(ruta_jsonl, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError:
+                    # Línea incompleta de un guardado interrumpido
+                    continue
+
+
+def buscar_simulaciones(filtros, desplazamiento=0, limite=None):
+    """
+    Devuelve las simulaciones en las que alguna planta cumple todos los
+    filtros. Cada filtro es (columna, operador, valor), con columna entre
+    altura, muerta, agua, luz y temp. Por ejemplo, las simulaciones con
+    alguna planta muerta con agua > 140:
+        buscar_simulaciones([("muerta", "=", True), ("agua", ">", 140)])
+    En formato "sqlite" la consulta se resuelve en la base.
+    """
+    if FORMATO == "sqlite":
+        return guardado_sqlite.buscar(_preparar_sqlite(), filtros, desplazamiento, limite)
 
-    # Asegurarse de que la carpeta data exista
-    carpeta_data = os.path.join(BASE_DIR, "data")
-    os.makedirs(carpeta_data, exist_ok=True)
+    for columna, op, _ in filtros:
+        if columna not in ("altura", "muerta", "agua", "luz", "temp") or op not in OPERADORES:
+            raise ValueError(f"Filtro no válido: {columna} {op}")
+    fin = None if limite is None else desplazamiento + limite
+    return _copia([s for s in cargar_simulaciones(copiar=False) if _cumple(s, filtros)][desplazamiento:fin])
 
-    with open(ARCHIVO_DATOS, "w", encoding="utf-8") as f:
-        json.dump(simulaciones, f, indent=4, ensure_ascii=False)
+
+def exportar_json(ruta):
+    """Exporta todas las simulaciones a un archivo JSON con el formato original."""
+    _escribir_atomico(ruta, json.dumps(cargar_simulaciones(copiar=False), indent=4, ensure_ascii=False).encode("utf-8"))
 
 
 def reiniciar_guardado():
     """
-    Elimina todas las simulaciones guardadas.
+    Elimina todas las simulaciones guardadas. En formato "fragmentos" la
+    carpeta es compartida: solo se borra el fragmento de esta instancia.
+    Quien guarde con un EscritorEnSegundoPlano debe esperar a que termine
+    (escritor.esperar()) antes de reiniciar.
     """
-    if os.path.exists(ARCHIVO_DATOS):
-        os.remove(ARCHIVO_DATOS)
\ No newline at end of file
+    if FORMATO == "fragmentos":
+        limpiar_cache()
+        fragmentos, carpeta = _preparar_fragmentos()
+        fragmentos.borrar_fragmento_propio(carpeta)
+        return
+    ruta_sqlite = _ruta_sqlite()
+    with _lock_jsonl:
+        limpiar_cache()
+        for ruta in (ARCHIVO_DATOS, *_rutas_jsonl(), _ruta_binaria(), _ruta_binaria() + ".idx",
+                     ruta_sqlite, ruta_sqlite + "-wal", ruta_sqlite + "-shm"):
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+
+# ---------------------------------------------------------------------
+# Guardado en segundo plano
+# ---------------------------------------------------------------------
+class EscritorEnSegundoPlano:
+    """
+    Hilo que guarda simulaciones sin bloquear a quien las pide (por
+    ejemplo, el bucle principal de Tk).
+
+    - La cola de pendientes es acotada: si está llena, encolar() devuelve False.
+    - Si llega un guardado con la misma clave que uno que todavía no
+      empezó, se reemplaza su contenido en vez de encolar otro
+      (varios "Guardar" seguidos se resuelven en una sola escritura).
+    - Cada resultado se deja en la cola `resultados` como una tupla
+      (clave, numero, error); la interfaz la revisa con root.after.
+    """
+
+    def __init__(self, guardar=None, max_pendientes=8):
+        self.guardar = guardar or guardar_simulacion
+        self.max_pendientes = max_pendientes
+        self.pendientes = []
+        self.resultados = queue.Queue()
+        self.condicion = threading.Condition()
+        self.ocupado = False
+        self.detenido = False
+        self.hilo = threading.Thread(target=self._trabajar, name="guardado", daemon=True)
+        self.hilo.start()
+
+    def encolar(self, simulacion, clave=None):
+        """Pide guardar una simulación. Devuelve False si la cola está llena."""
+        with self.condicion:
+            for pendiente in self.pendientes:
+                if clave is not None and pendiente[0] == clave:
+                    pendiente[1] = simulacion
+                    return True
+            if len(self.pendientes) >= self.max_pendientes:
+                return False
+            self.pendientes.append([clave, simulacion])
+            self.condicion.notify()
+            return True
+
+    def en_curso(self):
+        """Cantidad de guardados pendientes o en escritura."""
+        with self.condicion:
+            return len(self.pendientes) + (1 if self.ocupado else 0)
+
+    def _trabajar(self):
+        while True:
+            with self.condicion:
+                while not self.pendientes and not self.detenido:
+                    self.condicion.wait()
+                if not self.pendientes:
+                    return
+                clave, simulacion = self.pendientes.pop(0)
+                self.ocupado = True
+            try:
+                self.resultados.put((clave, self.guardar(simulacion), None))
+            except Exception as error:
+                self.resultados.put((clave, None, error))
+            finally:
+                with self.condicion:
+                    self.ocupado = False
+                    self.condicion.notify_all()
+
+    def esperar(self):
+        """Bloquea hasta que no quede ningún guardado pendiente ni en escritura."""
+        with self.condicion:
+            while self.pendientes or self.ocupado:
+                self.condicion.wait()
+
+    def detener(self, esperar=True):
+        """Termina el hilo después de escribir lo que quede pendiente."""
+        with self.condicion:
+            self.detenido = True
+            self.condicion.notify_all()
+        if esperar:
+            self.hilo.join()
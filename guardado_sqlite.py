@@ -0,0 +1,173 @@
+# ---------------------------------------------------------------------
+# guardado_sqlite.py
+# ---------------------------------------------------------------------
+# Almacenamiento opcional de simulaciones en una base SQLite.
+# Se usa desde guardado_json cuando SIMULADOR_FORMATO=sqlite.
+#
+# Las plantas y sus condiciones se normalizan en tablas indexadas, así
+# que listar por páginas, buscar por número o filtrar (por ejemplo,
+# simulaciones con alguna planta muerta con agua > 140) se resuelve en
+# la base sin cargar todo el historial.
+# ---------------------------------------------------------------------
+
+import json
+import sqlite3
+from contextlib import closing
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS simulaciones (
+    numero INTEGER PRIMARY KEY,
+    extra TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS plantas (
+    numero INTEGER NOT NULL REFERENCES simulaciones(numero) ON DELETE CASCADE,
+    indice INTEGER NOT NULL,
+    altura REAL NOT NULL,
+    muerta INTEGER NOT NULL,
+    PRIMARY KEY (numero, indice)
+);
+CREATE TABLE IF NOT EXISTS condiciones (
+    numero INTEGER NOT NULL,
+    indice INTEGER NOT NULL,
+    agua REAL,
+    luz REAL,
+    temp REAL,
+    PRIMARY KEY (numero, indice),
+    FOREIGN KEY (numero, indice) REFERENCES plantas(numero, indice) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS plantas_muerta ON plantas(muerta, numero);
+CREATE INDEX IF NOT EXISTS condiciones_agua ON condiciones(agua);
+CREATE INDEX IF NOT EXISTS condiciones_luz ON condiciones(luz);
+CREATE INDEX IF NOT EXISTS condiciones_temp ON condiciones(temp);
+"""
+
+# Columnas y operadores permitidos en los filtros de buscar()
+COLUMNAS_FILTRO = {
+    "altura": "p.altura",
+    "muerta": "p.muerta",
+    "agua": "c.agua",
+    "luz": "c.luz",
+    "temp": "c.temp",
+}
+OPERADORES_FILTRO = ("=", "!=", "<", "<=", ">", ">=")
+
+# Claves de la simulación que van a las tablas normalizadas
+CLAVES_NORMALIZADAS = ("numero", "alturas", "muertas", "condiciones")
+
+
+def conectar(ruta):
+    """Abre la base (creando las tablas si hace falta)."""
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("PRAGMA foreign_keys = ON")
+    conexion.execute("PRAGMA journal_mode = WAL")
+    conexion.executescript(ESQUEMA)
+    return conexion
+
+
+def _insertar(conexion, simulacion):
+    """Inserta una simulación y sus plantas; devuelve el número asignado."""
+    extra = {k: v for k, v in simulacion.items() if k not in CLAVES_NORMALIZADAS}
+    cursor = conexion.execute("INSERT INTO simulaciones (extra) VALUES (?)",
+                              (json.dumps(extra, ensure_ascii=False),))
+    numero = cursor.lastrowid
+
+    alturas = simulacion.get("alturas", [])
+    muertas = simulacion.get("muertas", [False] * len(alturas))
+    condiciones = simulacion.get("condiciones", [{}] * len(alturas))
+    conexion.executemany(
+        "INSERT INTO plantas (numero, indice, altura, muerta) VALUES (?, ?, ?, ?)",
+        [(numero, i, a, int(bool(m))) for i, (a, m) in enumerate(zip(alturas, muertas))]
+    )
+    conexion.executemany(
+        "INSERT INTO condiciones (numero, indice, agua, luz, temp) VALUES (?, ?, ?, ?, ?)",
+        [(numero, i, c.get("agua"), c.get("luz"), c.get("temp"))
+         for i, c in enumerate(condiciones[:len(alturas)])]
+    )
+    return numero
+
+
+def guardar(ruta, simulacion):
+    """Guarda una simulación y le asigna el número siguiente."""
+    with closing(conectar(ruta)) as conexion, conexion:
+        simulacion["numero"] = _insertar(conexion, simulacion)
+    return simulacion["numero"]
+
+
+def importar(ruta, simulaciones):
+    """Carga en la base una lista de simulaciones (por ejemplo al migrar)."""
+    with closing(conectar(ruta)) as conexion, conexion:
+        for simulacion in simulaciones:
+            _insertar(conexion, dict(simulacion))
+
+
+def _armar(conexion, numeros):
+    """Reconstruye los diccionarios de simulación de los números dados."""
+    if not numeros:
+        return []
+    marcas = ",".join("?" * len(numeros))
+    simulaciones = {}
+    for numero, extra in conexion.execute(
+            f"SELECT numero, extra FROM simulaciones WHERE numero IN ({marcas})", numeros):
+        simulacion = json.loads(extra)
+        simulacion.update({"numero": numero, "alturas": [], "muertas": [], "condiciones": []})
+        simulaciones[numero] = simulacion
+
+    filas = conexion.execute(
+        f"""SELECT p.numero, p.altura, p.muerta, c.agua, c.luz, c.temp
+            FROM plantas p LEFT JOIN condiciones c
+                 ON c.numero = p.numero AND c.indice = p.indice
+            WHERE p.numero IN ({marcas})
+            ORDER BY p.numero, p.indice""", numeros)
+    for numero, altura, muerta, agua, luz, temp in filas:
+        simulacion = simulaciones[numero]
+        simulacion["alturas"].append(altura)
+        simulacion["muertas"].append(bool(muerta))
+        simulacion["condiciones"].append({"agua": agua, "luz": luz, "temp": temp})
+    return [simulaciones[n] for n in numeros if n in simulaciones]
+
+
+def listar(ruta, desplazamiento=0, limite=None):
+    """Devuelve una página de simulaciones ordenadas por número."""
+    with closing(conectar(ruta)) as conexion:
+        numeros = [n for (n,) in conexion.execute(
+            "SELECT numero FROM simulaciones ORDER BY numero LIMIT ? OFFSET ?",
+            (-1 if limite is None else limite, desplazamiento))]
+        return _armar(conexion, numeros)
+
+
+def cargar(ruta, numero):
+    """Devuelve la simulación con ese número, o None."""
+    with closing(conectar(ruta)) as conexion:
+        encontradas = _armar(conexion, [numero])
+    return encontradas[0] if encontradas else None
+
+
+def contar(ruta):
+    """Cantidad de simulaciones guardadas."""
+    with closing(conectar(ruta)) as conexion:
+        return conexion.execute("SELECT COUNT(*) FROM simulaciones").fetchone()[0]
+
+
+def buscar(ruta, filtros, desplazamiento=0, limite=None):
+    """
+    Devuelve las simulaciones en las que alguna planta cumple todos los
+    filtros a la vez. Cada filtro es una tupla (columna, operador, valor),
+    por ejemplo [("muerta", "=", True), ("agua", ">", 140)].
+    """
+    condiciones_sql, valores = [], []
+    for columna, operador, valor in filtros:
+        if columna not in COLUMNAS_FILTRO or operador not in OPERADORES_FILTRO:
+            raise ValueError(f"Filtro no válido: {columna} {operador}")
+        condiciones_sql.append(f"{COLUMNAS_FILTRO[columna]} {operador} ?")
+        valores.append(int(valor) if isinstance(valor, bool) else valor)
+
+    donde = " AND ".join(condiciones_sql) or "1"
+    with closing(conectar(ruta)) as conexion:
+        numeros = [n for (n,) in conexion.execute(
+            f"""SELECT DISTINCT p.numero
+                FROM plantas p JOIN condiciones c
+                     ON c.numero = p.numero AND c.indice = p.indice
+                WHERE {donde}
+                ORDER BY p.numero LIMIT ? OFFSET ?""",
+            valores + [-1 if limite is None else limite, desplazamiento])]
+        return _armar(conexion, numeros)
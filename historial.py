@@ -0,0 +1,216 @@
+# ---------------------------------------------------------------------
+# historial.py
+# ---------------------------------------------------------------------
+# Historial de una simulación como secuencia de eventos:
+# - Cada paso se registra como un evento chico con sus datos de entrada
+#   (qué planta, con qué condiciones), no como una copia del estado
+# - Cada CADA_PASOS pasos se guarda un punto de control con el estado
+#   completo de la población (Poblacion.a_bytes)
+# - Cualquier paso se reconstruye desde el punto de control anterior
+#   más, como mucho, CADA_PASOS - 1 eventos: el costo de saltar a un
+#   paso no depende de lo largo que sea el historial
+# - La memoria está acotada: si los puntos de control y los eventos
+#   superan MAX_BYTES, se descartan los pasos más viejos de a CADA_PASOS
+#   (ventana deslizante). Los pasos conservan su número; el primero que
+#   se puede ver es `primero`
+# ---------------------------------------------------------------------
+
+import base64
+import struct
+import zlib
+from array import array
+
+from logica import Poblacion
+
+# Cada cuántos pasos se guarda un punto de control
+CADA_PASOS = 32
+
+# Memoria máxima de puntos de control y eventos (unos 220 puntos de
+# control con 10.000 plantas)
+MAX_BYTES = 64 * 1024 * 1024
+
+# Evento: tipo, planta, agua, luz, temp (29 bytes)
+EVENTO = struct.Struct("<BIddd")
+CONDICION = 0    # cambio de condiciones de una planta, sin avanzar
+PASO_UNA = 1     # avance de una planta con las condiciones dadas
+PASO_TODAS = 2   # avance de todas las plantas con sus condiciones
+
+# Encabezado de a_bytes(): marca, cada cuántos pasos hay un punto de
+# control, largo del estado inicial y número del primer paso
+MARCA = b"HIS2"
+ENCABEZADO = struct.Struct("<4sIIQ")
+# Versión anterior, sin primer paso (empezaba siempre en 0)
+MARCA_V1 = b"HIS1"
+ENCABEZADO_V1 = struct.Struct("<4sII")
+
+
+def _aplicar(poblacion, datos, inicio, fin):
+    """Aplica a la población los eventos de datos[inicio:fin]."""
+    for tipo, i, agua, luz, temp in EVENTO.iter_unpack(datos[inicio:fin]):
+        if tipo == CONDICION:
+            poblacion.agua[i], poblacion.luz[i], poblacion.temp[i] = agua, luz, temp
+        elif tipo == PASO_UNA:
+            poblacion.paso_una(i, agua, luz, temp)
+        else:
+            poblacion.paso()
+
+
+def _copiar_estado(origen, destino):
+    """Copia el estado de una población en otra, sin reemplazar sus arreglos."""
+    destino.alturas[:] = origen.alturas
+    destino.muertas[:] = origen.muertas
+    destino.agua[:] = origen.agua
+    destino.luz[:] = origen.luz
+    destino.temp[:] = origen.temp
+
+
+class Historial:
+    """
+    Registra los pasos de una población y permite volver a cualquiera.
+
+    Los pasos se hacen a través del historial (paso_una, paso) para que
+    queden registrados. ir_a(paso) deja la población como estaba en ese
+    paso, en sus mismos arreglos; si después se avanza, los pasos
+    posteriores se descartan y el historial sigue desde ahí. Se pueden
+    ver los pasos desde `primero` hasta len(historial).
+    """
+
+    def __init__(self, poblacion, cada=CADA_PASOS, max_bytes=MAX_BYTES):
+        self.poblacion = poblacion
+        self.cada = cada
+        self.max_bytes = max_bytes
+        self.eventos = bytearray()
+        # Primer paso que se conserva (múltiplo de cada) y bytes de
+        # eventos ya descartados del principio
+        self.primero = 0
+        self.descartados = 0
+        # Fin de cada paso desde `primero`, contando los bytes descartados
+        self.fin_de_paso = array("Q", [0])
+        # Estado serializado en los pasos primero, primero + cada, ...
+        self.puntos_de_control = [poblacion.a_bytes()]
+        self.bytes_puntos = len(self.puntos_de_control[0])
+        self.actual = 0
+
+    def __len__(self):
+        """Número del último paso registrado."""
+        return self.primero + len(self.fin_de_paso) - 1
+
+    def _fin(self, paso):
+        """Posición en eventos donde termina ese paso."""
+        return self.fin_de_paso[paso - self.primero] - self.descartados
+
+    def memoria(self):
+        """Bytes que ocupan los puntos de control y los eventos."""
+        return self.bytes_puntos + len(self.eventos) + self.fin_de_paso.itemsize * len(self.fin_de_paso)
+
+    # --- Registro ---
+    def _antes_de_avanzar(self):
+        """Si se está viendo un paso anterior, descarta los pasos siguientes."""
+        if self.actual == len(self):
+            return
+        del self.eventos[self._fin(self.actual):]
+        del self.fin_de_paso[self.actual - self.primero + 1:]
+        sobrantes = self.puntos_de_control[(self.actual - self.primero) // self.cada + 1:]
+        del self.puntos_de_control[(self.actual - self.primero) // self.cada + 1:]
+        self.bytes_puntos -= sum(map(len, sobrantes))
+
+    def _cerrar_paso(self):
+        self.fin_de_paso.append(self.descartados + len(self.eventos))
+        self.actual = len(self)
+        if self.actual % self.cada == 0:
+            self.puntos_de_control.append(self.poblacion.a_bytes())
+            self.bytes_puntos += len(self.puntos_de_control[-1])
+            self._recortar()
+
+    def _recortar(self):
+        """Descarta los pasos más viejos, de a `cada`, mientras se pase de max_bytes."""
+        while self.memoria() > self.max_bytes and len(self.puntos_de_control) > 2:
+            fin = self._fin(self.primero + self.cada)
+            # Borrar del principio de un bytearray no mueve el resto
+            del self.eventos[:fin]
+            self.descartados += fin
+            del self.fin_de_paso[:self.cada]
+            self.bytes_puntos -= len(self.puntos_de_control.pop(0))
+            self.primero += self.cada
+
+    def paso_una(self, i, agua, luz, temp):
+        """Avanza la planta i (ver Poblacion.paso_una) y registra el evento."""
+        self._antes_de_avanzar()
+        resultado = self.poblacion.paso_una(i, agua, luz, temp)
+        self.eventos += EVENTO.pack(PASO_UNA, i, agua, luz, temp)
+        self._cerrar_paso()
+        return resultado
+
+    def paso(self, condiciones=None):
+        """
+        Avanza todas las plantas (ver Poblacion.paso). `condiciones` es un
+        diccionario {planta: (agua, luz, temp)} con los cambios a aplicar
+        antes; solo se registran los que difieren de los actuales.
+        """
+        self._antes_de_avanzar()
+        poblacion = self.poblacion
+        for i, (agua, luz, temp) in (condiciones or {}).items():
+            if (poblacion.agua[i], poblacion.luz[i], poblacion.temp[i]) != (agua, luz, temp):
+                poblacion.agua[i], poblacion.luz[i], poblacion.temp[i] = agua, luz, temp
+                self.eventos += EVENTO.pack(CONDICION, i, agua, luz, temp)
+        resultado = poblacion.paso()
+        self.eventos += EVENTO.pack(PASO_TODAS, 0, 0, 0, 0)
+        self._cerrar_paso()
+        return resultado
+
+    # --- Reconstrucción ---
+    def estado(self, paso):
+        """Devuelve una población nueva con el estado del paso indicado."""
+        if not self.primero <= paso <= len(self):
+            raise IndexError(f"El historial tiene los pasos {self.primero} a {len(self)}")
+        punto = (paso - self.primero) // self.cada
+        poblacion = Poblacion.desde_bytes(self.puntos_de_control[punto])
+        _aplicar(poblacion, self.eventos, self._fin(self.primero + punto * self.cada), self._fin(paso))
+        return poblacion
+
+    def ir_a(self, paso):
+        """Deja la población (en sus mismos arreglos) como estaba en ese paso."""
+        _copiar_estado(self.estado(paso), self.poblacion)
+        self.actual = paso
+
+    # --- Serialización ---
+    def a_bytes(self):
+        """Estado del primer paso y eventos; los puntos de control se recalculan al leer."""
+        inicial = self.puntos_de_control[0]
+        return ENCABEZADO.pack(MARCA, self.cada, len(inicial), self.primero) + inicial + bytes(self.eventos)
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        """
+        Reconstruye un historial serializado con a_bytes(), reproduciendo
+        todos sus eventos una vez para volver a armar los puntos de
+        control. La población queda en el último paso.
+        """
+        if datos[:4] == MARCA_V1:
+            (_, cada, largo), primero = ENCABEZADO_V1.unpack_from(datos), 0
+            inicio = ENCABEZADO_V1.size
+        elif datos[:4] == MARCA:
+            _, cada, largo, primero = ENCABEZADO.unpack_from(datos)
+            inicio = ENCABEZADO.size
+        else:
+            raise ValueError("Los datos no son un historial serializado.")
+        historial = cls(Poblacion.desde_bytes(datos[inicio:inicio + largo]), cada)
+        historial.primero = historial.actual = primero
+        poblacion = historial.poblacion
+        for tipo, i, agua, luz, temp in EVENTO.iter_unpack(datos[inicio + largo:]):
+            if tipo == CONDICION:
+                poblacion.agua[i], poblacion.luz[i], poblacion.temp[i] = agua, luz, temp
+                historial.eventos += EVENTO.pack(tipo, i, agua, luz, temp)
+            elif tipo == PASO_UNA:
+                historial.paso_una(i, agua, luz, temp)
+            else:
+                historial.paso()
+        return historial
+
+    def a_texto(self):
+        """a_bytes() comprimido y en base64, para guardarlo dentro de una simulación."""
+        return base64.b64encode(zlib.compress(self.a_bytes())).decode("ascii")
+
+    @classmethod
+    def desde_texto(cls, texto):
+        return cls.desde_bytes(zlib.decompress(base64.b64decode(texto)))
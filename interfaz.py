@@ -4,17 +4,35 @@
 # Interfaz gráfica del simulador de crecimiento de plantas.
 # Usa Tkinter y Matplotlib, y llama a la lógica desde logica_plantas.py
 # Soporta múltiples simulaciones guardadas.
+#
+# Matplotlib se importa recién al mostrar el primer gráfico, así la
+# pantalla de inicio abre sin cargarlo. No se usa pyplot: cada vista
+# tiene su propia Figure, que se reutiliza y se limpia al salir.
 # ---------------------------------------------------------------------
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk, messagebox, simpledialog, filedialog
+from collections import OrderedDict
+import base64
+import io
 import random
 
 # --- Importaciones de la lógica y guardado ---
-from logica import calcular_crecimiento, VALORES_IDEALES, MUERTE
-from guardado_json import guardar_simulacion, cargar_simulaciones, reiniciar_guardado
+import metricas
+from logica import Poblacion, VALORES_IDEALES, MUERTE, PLANTAS_POR_DEFECTO
+from especies import ESPECIE_POR_DEFECTO
+from analisis import resumir
+from historial import Historial
+from tiempo_real import Planificador
+from prevision import prever
+from optimizador import recomendar, describir_plan
+from guardado_json import (reiniciar_guardado, contar_simulaciones,
+                           listar_simulaciones, EscritorEnSegundoPlano)
+
+
+# A partir de esta cantidad de plantas el gráfico pasa a ser un histograma
+UMBRAL_HISTOGRAMA = 40
+BARRAS_HISTOGRAMA = 30
 
 
 class SimuladorPlantas:
@@ -24,6 +42,20 @@ class SimuladorPlantas:
         self.root.geometry("1300x850")
         self.root.resizable(False, False)
         self.root.configure(bg="#fff9e6")
+
+        # Los guardados se escriben en un hilo aparte para no congelar la ventana
+        self.escritor = EscritorEnSegundoPlano()
+        self.revision_guardados = None
+        self.sesion = 0
+        # Modo continuo: próximo cuadro agendado con root.after
+        self.cuadro_programado = None
+        self.notificacion_programada = None
+        # Figura del simulador: se crea la primera vez que hace falta
+        self.fig = None
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
+        if metricas.ACTIVAS:
+            # F12 abre el panel de métricas desde cualquier pantalla
+            self.root.bind("<F12>", lambda event: self.mostrar_metricas())
         self.pantalla_inicio()
 
     # -------------------------------------------------------
@@ -61,6 +93,16 @@ class SimuladorPlantas:
             background="#fff9e6"
         ).pack(pady=15)
 
+        frame_cantidad = tk.Frame(self.frame_inicio, bg="#fff9e6")
+        frame_cantidad.pack(pady=5)
+        tk.Label(frame_cantidad, text="Cantidad de plantas:", bg="#fff9e6",
+                 font=("Times New Roman", 12)).pack(side="left", padx=5)
+        self.cantidad_plantas = tk.Spinbox(frame_cantidad, from_=1, to=100000, width=8,
+                                           font=("Times New Roman", 12))
+        self.cantidad_plantas.delete(0, tk.END)
+        self.cantidad_plantas.insert(0, str(PLANTAS_POR_DEFECTO))
+        self.cantidad_plantas.pack(side="left")
+
         ttk.Button(
             self.frame_inicio,
             text="➡️ Iniciar nueva simulación",
@@ -75,37 +117,108 @@ class SimuladorPlantas:
             style="TButton"
         ).pack(pady=10)
 
+        ttk.Button(
+            self.frame_inicio,
+            text="📊 Ver estadísticas",
+            command=self.mostrar_estadisticas,
+            style="TButton"
+        ).pack(pady=10)
+
+        if metricas.ACTIVAS:
+            ttk.Button(
+                self.frame_inicio,
+                text="🐞 Métricas (F12)",
+                command=self.mostrar_metricas,
+                style="TButton"
+            ).pack(pady=10)
+
     # -------------------------------------------------------
     # Nueva simulación
     # -------------------------------------------------------
     def iniciar_nueva_simulacion(self):
+        try:
+            plantas = max(1, int(self.cantidad_plantas.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Ingresá una cantidad de plantas válida.")
+            return
         self.frame_inicio.destroy()
-        self.crear_simulador(reiniciar=True)
+        self.crear_simulador(reiniciar=True, plantas=plantas)
 
     # -------------------------------------------------------
     # Crear simulador (interfaz principal)
     # -------------------------------------------------------
-    def crear_simulador(self, reiniciar=False, datos=None):
+    @metricas.medir("crear_simulador")
+    def crear_simulador(self, reiniciar=False, datos=None, plantas=PLANTAS_POR_DEFECTO):
         if reiniciar or datos is None:
-            datos = reiniciar_guardado() or {"alturas":[3,3,3,3],"muertas":[False]*4,"condiciones":[{"agua":80,"luz":8,"temp":22}]*4}
+            # Que ningún guardado en curso escriba sobre el historial reiniciado
+            self.escritor.esperar()
+            reiniciar_guardado()
+            self.historial = Historial(Poblacion(plantas))
+        elif "historial" in datos:
+            self.historial = Historial.desde_texto(datos["historial"])
+        else:
+            self.historial = Historial(Poblacion.desde_simulacion(datos))
+        # Los pasos se hacen a través del historial para poder volver a
+        # cualquiera con la línea de tiempo
+        self.poblacion = self.historial.poblacion
 
-        self.alturas = datos.get("alturas", [3, 3, 3, 3])
-        self.muertas = datos.get("muertas", [False, False, False, False])
-        self.condiciones = datos.get("condiciones", [{"agua":80,"luz":8,"temp":22} for _ in range(4)])
+        # Vistas del estado de la población (arreglos compactos)
+        self.alturas = self.poblacion.alturas
+        self.muertas = self.poblacion.muertas
 
         # --- Gráfico ---
-        self.fig, self.ax = plt.subplots(figsize=(7, 5))
+        # Con muchas plantas, una barra por planta no se puede leer ni
+        # dibujar rápido: se muestra un histograma de alturas de las vivas
+        self._preparar_figura()
         colores = ["#4CAF50", "#CDDC39", "#00BCD4", "#FFEB3B"]
-        self.barras = self.ax.bar(
-            ["Planta 1", "Planta 2", "Planta 3", "Planta 4"],
-            self.alturas,
-            color=colores
-        )
-        self.ax.set_ylim(0, max(20, max(self.alturas)+2))
-        self.ax.set_ylabel("Altura (cm)")
+        self.modo_histograma = len(self.poblacion) > UMBRAL_HISTOGRAMA
+        if self.modo_histograma:
+            self.bordes = self._bordes_histograma()
+            self.barras = self.ax.bar(
+                self.bordes[:-1],
+                self._valores_barras(),
+                width=self.bordes[1] - self.bordes[0],
+                align="edge",
+                color=colores[0]
+            )
+            self.ax.set_xlabel("Altura (cm)")
+            self.ax.set_ylabel("Cantidad de plantas vivas")
+        else:
+            self.barras = self.ax.bar(
+                [f"Planta {i+1}" for i in range(len(self.poblacion))],
+                self.alturas,
+                color=colores
+            )
+            self.ax.set_ylabel("Altura (cm)")
+            if len(self.poblacion) > PLANTAS_POR_DEFECTO * 2:
+                self.ax.tick_params(axis="x", labelrotation=90, labelsize=8)
+        self.ax.set_ylim(*self._limite_y())
         self.ax.set_title("Crecimiento de plantas de tomate")
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
         self.canvas.get_tk_widget().place(x=40, y=30)
+        self.canvas.draw_idle()
+
+        # --- Línea de tiempo: salta a cualquier paso del historial ---
+        self.linea_tiempo = tk.Scale(
+            self.root,
+            from_=0,
+            to=1,
+            orient="horizontal",
+            length=700,
+            bg="#fff9e6",
+            highlightthickness=0,
+            font=("Times New Roman", 11),
+            command=self.ir_a_paso
+        )
+        self.linea_tiempo.place(x=40, y=540)
+        self._actualizar_linea_tiempo()
+
+        # Las barras se dibujan aparte del fondo para poder actualizarlas
+        # con blit, sin volver a dibujar ejes, textos y marcas
+        for rect in self.barras:
+            rect.set_animated(True)
+        self.fondo = None
+        self.barras_pendientes = set()
+        self.redibujo_programado = None
 
         # --- Panel de controles ---
         self.control_frame = tk.Frame(self.root, bg="#fff9e6")
@@ -153,36 +266,18 @@ class SimuladorPlantas:
         ).grid(row=1, column=1, padx=10, pady=5)
 
         # --- Entradas para cada planta ---
-        self.entradas = []
-        for i in range(4):
-            frame = tk.LabelFrame(self.control_frame, text=f"Planta {i+1}", bg="#fff9e6",
-                                  font=("Times New Roman", 12, "bold"))
-            frame.grid(row=i+2, column=0, columnspan=2, pady=5, sticky="ew")
-
-            agua = tk.Entry(frame, width=6, font=("Times New Roman", 12))
-            luz = tk.Entry(frame, width=6, font=("Times New Roman", 12))
-            temp = tk.Entry(frame, width=6, font=("Times New Roman", 12))
-            agua.insert(0, str(self.condiciones[i]["agua"]))
-            luz.insert(0, str(self.condiciones[i]["luz"]))
-            temp.insert(0, str(self.condiciones[i]["temp"]))
-
-            tk.Label(frame, text="Agua (ml):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=0, padx=2)
-            agua.grid(row=0, column=1, padx=2)
-            tk.Label(frame, text="Luz (h):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=2, padx=2)
-            luz.grid(row=0, column=3, padx=2)
-            tk.Label(frame, text="Temp (°C):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=4, padx=2)
-            temp.grid(row=0, column=5, padx=2)
-
-            self.entradas.append((agua, luz, temp))
-
-            tk.Button(
-                frame,
-                text="Simular esta planta",
-                font=("Times New Roman", 12),
-                command=lambda i=i: self.simular_una(i)
-            ).grid(row=1, column=0, columnspan=6, pady=4)
+        # Lista virtual: solo existen los widgets de las filas visibles
+        self.lista = ListaPlantasVirtual(self.control_frame, self.poblacion, self.simular_una)
+        self.lista.grid(row=2, column=0, columnspan=2, pady=5, sticky="ew")
 
         # --- Botones principales ---
+        tk.Button(
+            self.control_frame,
+            text="💡 Recomendar condiciones",
+            font=("Times New Roman", 13),
+            command=self.recomendar_condiciones
+        ).grid(row=9, column=0, pady=5, columnspan=2)
+
         tk.Button(
             self.control_frame,
             text="🔄 Simular todas",
@@ -204,87 +299,401 @@ class SimuladorPlantas:
             command=self.reiniciar_simulacion
         ).grid(row=12, column=0, pady=5, columnspan=2)
 
-        tk.Button(
+        self.estado_guardado = tk.Label(self.control_frame, text="", bg="#fff9e6",
+                                        font=("Times New Roman", 12))
+        self.estado_guardado.grid(row=13, column=0, columnspan=2)
+
+        # --- Modo continuo (reproducir / pausar) ---
+        frame_continuo = tk.Frame(self.control_frame, bg="#fff9e6")
+        frame_continuo.grid(row=14, column=0, columnspan=2, pady=5)
+        self.boton_reproducir = tk.Button(
+            frame_continuo,
+            text="▶️ Reproducir",
+            font=("Times New Roman", 13),
+            command=self.alternar_reproduccion
+        )
+        self.boton_reproducir.pack(side="left", padx=5)
+        tk.Label(frame_continuo, text="Pasos por segundo:", bg="#fff9e6",
+                 font=("Times New Roman", 12)).pack(side="left")
+        self.pasos_por_segundo = tk.Spinbox(frame_continuo, from_=1, to=240, width=5,
+                                            font=("Times New Roman", 12),
+                                            command=self._cambiar_ritmo)
+        self.pasos_por_segundo.delete(0, tk.END)
+        self.pasos_por_segundo.insert(0, "10")
+        self.pasos_por_segundo.bind("<Return>", lambda e: self._cambiar_ritmo())
+        self.pasos_por_segundo.pack(side="left", padx=5)
+        self.planificador = Planificador(10)
+
+        # Avisos que no bloquean (muertes durante el modo continuo)
+        self.notificacion = tk.Label(self.control_frame, text="", bg="#fff9e6", fg="#b23c17",
+                                     font=("Times New Roman", 12), wraplength=400)
+        self.notificacion.grid(row=15, column=0, columnspan=2)
+        self.sesion += 1
+
+        self.boton_volver = tk.Button(
             self.root,
             text="🏠 Volver al inicio",
             font=("Times New Roman", 12),
             command=self.volver_inicio,
             bg="#f0f0f0"
-        ).place(x=1180, y=10)
+        )
+        self.boton_volver.place(x=1180, y=10)
+
+    def _preparar_figura(self):
+        """
+        Deja lista la figura del simulador con unos ejes vacíos. La figura
+        y su lienzo de Tk se crean una sola vez (importando Matplotlib en
+        ese momento) y se reutilizan en cada simulación nueva.
+        """
+        if self.fig is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.fig = Figure(figsize=(7, 5))
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
+            self.canvas.mpl_connect("draw_event", self._al_dibujar)
+        self.fig.clear()
+        self.ax = self.fig.add_subplot()
+
+    # -------------------------------------------------------
+    # Recomendación de condiciones
+    # -------------------------------------------------------
+    def recomendar_condiciones(self):
+        """Pide una altura objetivo y los días, y muestra el plan más económico."""
+        objetivo = simpledialog.askfloat("Recomendar condiciones", "Altura objetivo (cm):",
+                                         parent=self.root, minvalue=0)
+        if objetivo is None:
+            return
+        dias = simpledialog.askinteger("Recomendar condiciones", "¿En cuántos días?",
+                                       parent=self.root, minvalue=1, maxvalue=3650)
+        if dias is None:
+            return
+        plan = recomendar(objetivo, dias, especie=self.poblacion.especie)
+        messagebox.showinfo("Condiciones recomendadas", describir_plan(plan))
 
     # -------------------------------------------------------
     # Simulación de una planta
     # -------------------------------------------------------
-    def simular_una(self, i):
+    def simular_una(self, i, avisar=True):
+        """
+        Avanza la planta i un paso. Devuelve el aviso (tipo, título, mensaje)
+        del resultado; si avisar es False no abre el cuadro de diálogo, para
+        que simular_todas pueda mostrar un único resumen.
+        """
         if self.muertas[i]:
-            messagebox.showinfo("Aviso", f"La Planta {i+1} ya está muerta 💀.")
-            return
+            aviso = ("info", "Aviso", f"La Planta {i+1} ya está muerta 💀.")
+            return self.mostrar_aviso(aviso) if avisar else aviso
 
         try:
-            agua = float(self.entradas[i][0].get())
-            luz = float(self.entradas[i][1].get())
-            temp = float(self.entradas[i][2].get())
+            agua, luz, temp = self.lista.valores(i)
         except ValueError:
-            messagebox.showerror("Error", "Ingresá solo números válidos.")
-            return
+            aviso = ("error", "Error", f"Planta {i+1}: ingresá solo números válidos.")
+            return self.mostrar_aviso(aviso) if avisar else aviso
 
-        resultado = calcular_crecimiento(agua, luz, temp)
+        # Las reglas de avance viven en logica.py (Poblacion.paso_una);
+        # el historial registra el paso
+        resultado = self.historial.paso_una(i, agua, luz, temp)
+        self._actualizar_linea_tiempo()
 
         if resultado == MUERTE:
-            self.alturas[i] = 0
-            self.muertas[i] = True
-            self.condiciones[i] = {"agua":agua, "luz":luz, "temp":temp}
-            messagebox.showwarning("Planta muerta 💀", f"La Planta {i+1} murió por condiciones extremas.")
+            aviso = ("warning", "Planta muerta 💀", f"La Planta {i+1} murió por condiciones extremas.")
+        elif self.muertas[i]:
+            aviso = ("warning", "Planta muerta 💀", f"La Planta {i+1} no resistió las condiciones y murió.")
         else:
-            self.alturas[i] = max(0, self.alturas[i] + resultado)
-            self.condiciones[i] = {"agua":agua, "luz":luz, "temp":temp}
-            if self.alturas[i] <= 0:
-                self.muertas[i] = True
-                messagebox.showwarning("Planta muerta 💀", f"La Planta {i+1} no resistió las condiciones y murió.")
-            else:
-                signo = "+" if resultado >= 0 else ""
-                messagebox.showinfo("Simulación", f"Planta {i+1}: cambio {signo}{resultado} cm → altura {self.alturas[i]:.1f} cm.")
+            signo = "+" if resultado >= 0 else ""
+            aviso = ("info", "Simulación", f"Planta {i+1}: cambio {signo}{resultado} cm → altura {self.alturas[i]:.1f} cm.")
 
-        self.actualizar_grafico()
+        self.actualizar_grafico([i])
+        self.lista.actualizar_previsiones()
+        return self.mostrar_aviso(aviso) if avisar else aviso
+
+    def _leer_ediciones(self):
+        """
+        Devuelve {planta: (agua, luz, temp)} con lo escrito en la lista, o
+        lanza ValueError con el mensaje de la primera planta no válida.
+        """
+        condiciones = {}
+        for i in self.lista.plantas_editadas():
+            try:
+                condiciones[i] = self.lista.valores(i)
+            except ValueError:
+                raise ValueError(f"Planta {i+1}: ingresá solo números válidos.")
+        return condiciones
 
     def simular_todas(self):
-        for i in range(4):
-            self.simular_una(i)
+        # Las condiciones editadas pasan a la población y se avanza todo
+        # junto, en forma vectorizada
+        try:
+            condiciones = self._leer_ediciones()
+        except ValueError as error:
+            self.mostrar_aviso(("error", "Error", str(error)))
+            return
+        self.lista.olvidar_ediciones()
 
-    def actualizar_grafico(self):
-        for rect, h in zip(self.barras, self.alturas):
-            rect.set_height(h)
-        self.ax.set_ylim(0, max(20, max(self.alturas) + 2))
-        self.canvas.draw()
+        muertas_antes = bytes(self.muertas)
+        resultado = self.historial.paso(condiciones)
+        self._actualizar_linea_tiempo()
+        self.actualizar_grafico()
+        self.lista.actualizar_previsiones()
+
+        # Un solo cuadro con el resumen de todas las plantas
+        nuevas = sum(1 for antes, ahora in zip(muertas_antes, self.muertas) if ahora and not antes)
+        tipo = "warning" if nuevas else "info"
+        if len(self.poblacion) > PLANTAS_POR_DEFECTO * 2:
+            vivas = len(self.poblacion) - sum(self.muertas)
+            media = sum(a for a, m in zip(self.alturas, self.muertas) if not m) / vivas if vivas else 0
+            mensaje = (f"{len(self.poblacion)} plantas simuladas: {nuevas} murieron en este paso, "
+                       f"{vivas} siguen vivas (altura media {media:.1f} cm).")
+        else:
+            lineas = []
+            for i, (antes, r) in enumerate(zip(muertas_antes, resultado)):
+                if antes:
+                    lineas.append(f"La Planta {i+1} ya está muerta 💀.")
+                elif r == MUERTE:
+                    lineas.append(f"La Planta {i+1} murió por condiciones extremas.")
+                elif self.muertas[i]:
+                    lineas.append(f"La Planta {i+1} no resistió las condiciones y murió.")
+                else:
+                    signo = "+" if r >= 0 else ""
+                    lineas.append(f"Planta {i+1}: cambio {signo}{r} cm → altura {self.alturas[i]:.1f} cm.")
+            mensaje = "\n".join(lineas)
+        self.mostrar_aviso((tipo, "Simulación", mensaje))
+
+    # -------------------------------------------------------
+    # Modo continuo
+    # -------------------------------------------------------
+    def alternar_reproduccion(self):
+        if self.cuadro_programado is not None:
+            self.pausar()
+            return
+        self._cambiar_ritmo()
+        self.planificador.iniciar()
+        self.boton_reproducir.config(text="⏸️ Pausar")
+        self.cuadro_programado = self.root.after(1, self._cuadro)
+
+    def pausar(self):
+        if self.cuadro_programado is not None:
+            self.root.after_cancel(self.cuadro_programado)
+            self.cuadro_programado = None
+        if self.boton_reproducir.winfo_exists():
+            self.boton_reproducir.config(text="▶️ Reproducir")
+
+    def _cambiar_ritmo(self):
+        try:
+            self.planificador.fijar_ritmo(float(self.pasos_por_segundo.get()))
+        except ValueError:
+            self.notificar("Los pasos por segundo deben ser un número positivo.")
+
+    def _cuadro(self):
+        """
+        Un cuadro del modo continuo: simula los pasos que tocan (agrupados
+        si el dibujo se atrasó, dentro del presupuesto del cuadro), dibuja
+        una sola vez y agenda el cuadro siguiente.
+        """
+        self.cuadro_programado = None
+        try:
+            condiciones = self._leer_ediciones()
+        except ValueError as error:
+            self.pausar()
+            self.notificar(str(error))
+            return
+        self.lista.olvidar_ediciones()
+
+        muertas_antes = sum(self.muertas)
+        for _ in range(self.planificador.pasos_pendientes()):
+            if not self.planificador.queda_presupuesto():
+                self.planificador.descartar_restantes()
+                break
+            self.historial.paso(condiciones)
+            condiciones = None
+
+        nuevas = sum(self.muertas) - muertas_antes
+        if nuevas:
+            self.lista.actualizar_previsiones()
+            self.notificar(f"💀 Murieron {nuevas} plantas." if nuevas > 1 else "💀 Murió una planta.")
+        self._actualizar_linea_tiempo()
+        self.actualizar_grafico()
+
+        if len(self.poblacion) == sum(self.muertas):
+            self.pausar()
+            self.notificar("💀 Todas las plantas murieron: se detuvo la reproducción.")
+            return
+        self.cuadro_programado = self.root.after(self.planificador.espera_ms(), self._cuadro)
+
+    def notificar(self, texto, duracion_ms=3000):
+        """Muestra un aviso en el panel, sin bloquear, que se borra solo."""
+        self.notificacion.config(text=texto)
+        if self.notificacion_programada is not None:
+            self.root.after_cancel(self.notificacion_programada)
+        self.notificacion_programada = self.root.after(duracion_ms, self._borrar_notificacion)
+
+    def _borrar_notificacion(self):
+        self.notificacion_programada = None
+        if self.notificacion.winfo_exists():
+            self.notificacion.config(text="")
+
+    # -------------------------------------------------------
+    # Línea de tiempo
+    # -------------------------------------------------------
+    def _actualizar_linea_tiempo(self):
+        pasos = len(self.historial)
+        # Los pasos más viejos pueden haberse descartado (historial.MAX_BYTES)
+        self.linea_tiempo.config(from_=self.historial.primero, to=max(self.historial.primero + 1, pasos),
+                                 label=f"⏱️ Paso (de {pasos})")
+        self.linea_tiempo.set(self.historial.actual)
+
+    def ir_a_paso(self, valor):
+        """Muestra el estado de un paso anterior (desde el punto de control más cercano)."""
+        paso = max(self.historial.primero, min(int(float(valor)), len(self.historial)))
+        if paso == self.historial.actual:
+            return
+        self.historial.ir_a(paso)
+        self.lista.reiniciar()
+        self.actualizar_grafico()
+
+    def mostrar_aviso(self, aviso):
+        tipo, titulo, mensaje = aviso
+        mostrar = {"info": messagebox.showinfo, "warning": messagebox.showwarning,
+                   "error": messagebox.showerror}[tipo]
+        mostrar(titulo, mensaje)
+        return aviso
+
+    # -------------------------------------------------------
+    # Actualización del gráfico (blit incremental)
+    # -------------------------------------------------------
+    @metricas.medir("actualizar_grafico")
+    def actualizar_grafico(self, indices=None):
+        """
+        Marca como pendientes las barras que cambiaron y agenda un único
+        redibujado con after_idle: varias actualizaciones en la misma
+        vuelta del bucle de eventos se resuelven en un solo dibujo.
+        """
+        if self.modo_histograma and max(self.alturas, default=0) >= self.bordes[-1]:
+            # Las alturas superaron el rango: se rehacen los intervalos
+            self.bordes = self._bordes_histograma()
+            ancho = self.bordes[1] - self.bordes[0]
+            for rect, x in zip(self.barras, self.bordes[:-1]):
+                rect.set_x(x)
+                rect.set_width(ancho)
+            self.ax.set_xlim(self.bordes[0], self.bordes[-1])
+            self.fondo = None
+
+        for i, (rect, h) in enumerate(zip(self.barras, self._valores_barras())):
+            if rect.get_height() != h:
+                rect.set_height(h)
+                self.barras_pendientes.add(i)
+        self.barras_pendientes.update(indices or ())
+
+        if self.redibujo_programado is None:
+            self.redibujo_programado = self.root.after_idle(self._redibujar)
+
+    def _al_dibujar(self, event):
+        """Tras cada dibujo completo guarda el fondo (todo menos las barras)."""
+        self.fondo = self.canvas.copy_from_bbox(self.fig.bbox)
+        for rect in self.barras:
+            self.ax.draw_artist(rect)
+
+    def _bordes_histograma(self):
+        """Intervalos de altura del histograma, con margen para seguir creciendo."""
+        import numpy as np
+        tope = max(20, max(self.alturas, default=0) * 1.5 + 2)
+        return np.linspace(0, tope, BARRAS_HISTOGRAMA + 1)
+
+    def _valores_barras(self):
+        """Altura de cada barra: la de cada planta, o la cantidad por intervalo."""
+        if not self.modo_histograma:
+            return self.alturas
+        import numpy as np
+        alturas, muertas, _, _, _ = self.poblacion.vistas()
+        cantidades, _ = np.histogram(alturas[~muertas], bins=self.bordes)
+        return cantidades.tolist()
+
+    def _limite_y(self):
+        if not self.modo_histograma:
+            return (0, max(20, max(self.alturas, default=0) + 2))
+        # Se redondea a potencias de 2 para no redibujar todo en cada paso
+        tope = max(self._valores_barras(), default=0)
+        return (0, max(8, 1 << int(tope).bit_length()))
+
+    @metricas.medir("redibujar_grafico")
+    def _redibujar(self):
+        from matplotlib.transforms import Bbox
+
+        self.redibujo_programado = None
+        limite = self._limite_y()
+
+        if self.fondo is None or self.ax.get_ylim() != limite:
+            # Cambió la escala: hace falta un dibujo completo
+            self.ax.set_ylim(*limite)
+            self.canvas.draw()
+        elif self.barras_pendientes:
+            # Se repone el fondo en memoria, se dibujan las barras y solo
+            # se copian a pantalla las columnas de las que cambiaron
+            self.canvas.restore_region(self.fondo)
+            for rect in self.barras:
+                self.ax.draw_artist(rect)
+            columnas = [self.barras[i].get_window_extent() for i in self.barras_pendientes]
+            region = Bbox.union([Bbox.from_extents(c.x0, self.ax.bbox.y0, c.x1, self.ax.bbox.y1)
+                                 for c in columnas]).padded(2)
+            self.canvas.blit(region)
+        self.barras_pendientes.clear()
 
     # -------------------------------------------------------
     # Guardar progreso
     # -------------------------------------------------------
     def guardar_progreso(self):
-        datos = {"alturas": self.alturas, "muertas": self.muertas, "condiciones": self.condiciones}
-        guardar_simulacion(datos)
-        messagebox.showinfo("Guardado exitoso", "💾 Simulación guardada correctamente.")
+        # Se toma una copia del estado y se escribe en segundo plano; si se
+        # guarda varias veces seguidas, se escribe solo el último estado
+        datos = self.poblacion.a_simulacion()
+        datos["historial"] = self.historial.a_texto()
+        if not self.escritor.encolar(datos, clave=self.sesion):
+            messagebox.showwarning("Guardado", "Hay demasiados guardados pendientes. Probá en unos segundos.")
+            return
+        self.estado_guardado.config(text="💾 Guardando...")
+        if self.revision_guardados is None:
+            self.revision_guardados = self.root.after(50, self.revisar_guardados)
+
+    def revisar_guardados(self):
+        """Muestra los resultados que dejó el hilo de guardado (vía root.after)."""
+        self.revision_guardados = None
+        en_curso = self.escritor.en_curso()
+        while not self.escritor.resultados.empty():
+            _, numero, error = self.escritor.resultados.get_nowait()
+            if error is not None:
+                messagebox.showerror("Error al guardar", f"No se pudo guardar la simulación:\n{error}")
+                texto = "⚠️ Error al guardar"
+            elif isinstance(numero, int):
+                texto = f"💾 Simulación #{numero} guardada correctamente."
+            else:
+                # En formato "fragmentos" se recibe el id: el número se asigna al leer
+                texto = "💾 Simulación guardada correctamente."
+            if self.estado_guardado.winfo_exists():
+                self.estado_guardado.config(text=texto)
+        if en_curso:
+            self.revision_guardados = self.root.after(50, self.revisar_guardados)
+
+    def cerrar(self):
+        """Al cerrar la ventana se terminan de escribir los guardados pendientes."""
+        if self.cuadro_programado is not None:
+            self.root.after_cancel(self.cuadro_programado)
+        self.escritor.detener(esperar=True)
+        self.root.destroy()
 
     # -------------------------------------------------------
     # Reiniciar simulación actual (cambia colores aleatorios)
     # -------------------------------------------------------
     def reiniciar_simulacion(self):
-        self.alturas = [3,3,3,3]
-        self.muertas = [False]*4
-        self.condiciones = [{"agua":80,"luz":8,"temp":22} for _ in range(4)]
+        self.poblacion.reiniciar()
+        self.historial = Historial(self.poblacion)
+        self._actualizar_linea_tiempo()
         
         # Cambiar colores aleatoriamente solo al reiniciar
-        colores = ["#%06x" % random.randint(0, 0xFFFFFF) for _ in range(4)]
+        colores = ["#%06x" % random.randint(0, 0xFFFFFF) for _ in range(len(self.barras))]
         for rect, color in zip(self.barras, colores):
             rect.set_color(color)
+        self.barras_pendientes.update(range(len(self.barras)))
         
-        for i, (agua, luz, temp) in enumerate(self.entradas):
-            agua.delete(0, tk.END)
-            agua.insert(0, "80")
-            luz.delete(0, tk.END)
-            luz.insert(0, "8")
-            temp.delete(0, tk.END)
-            temp.insert(0, "22")
+        self.lista.reiniciar()
         
         self.actualizar_grafico()
 
@@ -292,63 +701,515 @@ class SimuladorPlantas:
     # Volver al inicio
     # -------------------------------------------------------
     def volver_inicio(self):
+        self.pausar()
+        if self.notificacion_programada is not None:
+            self.root.after_cancel(self.notificacion_programada)
+            self.notificacion_programada = None
+        if self.redibujo_programado is not None:
+            self.root.after_cancel(self.redibujo_programado)
+            self.redibujo_programado = None
         self.control_frame.destroy()
-        self.canvas.get_tk_widget().destroy()
+        self.linea_tiempo.destroy()
+        self.boton_volver.destroy()
+        # La figura se conserva para la próxima simulación, pero vacía:
+        # así la memoria no crece al ir y volver
+        self.canvas.get_tk_widget().place_forget()
+        self.fig.clear()
+        self.barras = ()
+        self.fondo = None
         self.pantalla_inicio()
 
     # -------------------------------------------------------
     # Cargar guardados
     # -------------------------------------------------------
     def mostrar_guardados(self):
-        simulaciones = cargar_simulaciones()
-        if not simulaciones:
+        if contar_simulaciones() == 0:
             messagebox.showinfo("Simulaciones guardadas", "No hay simulaciones guardadas.")
             return
 
-        # Abrir una ventana por cada simulación guardada
-        for idx, datos in enumerate(simulaciones, start=1):
-            ventana = tk.Toplevel(self.root)
-            ventana.title(f"Simulación guardada #{idx}")
-            ventana.geometry("1300x750")
-            ventana.configure(bg="#fff9e6")
-
-            # Número de orden visible
-            tk.Label(ventana, text=f"Simulación #{idx}", font=("Times New Roman", 16, "bold"), bg="#fff9e6").pack(pady=5)
-
-            # --- Gráfico ---
-            fig, ax = plt.subplots(figsize=(7,5))
-            barras = ax.bar(
-                ["Planta 1","Planta 2","Planta 3","Planta 4"],
-                datos["alturas"],
-                color=["#4CAF50", "#CDDC39", "#00BCD4", "#FFEB3B"]
-            )
-            ax.set_ylim(0, max(20, max(datos["alturas"])+2))
-            ax.set_ylabel("Altura (cm)")
-            ax.set_title("Crecimiento de plantas de tomate")
-            canvas = FigureCanvasTkAgg(fig, master=ventana)
-            canvas.get_tk_widget().pack(pady=20)
-
-            # --- Datos en 4 columnas ---
-            data_frame = tk.Frame(ventana, bg="#fff9e6")
-            data_frame.pack(pady=10)
-
-            for col in range(4):
-                col_frame = tk.Frame(data_frame, bg="#fff9e6", relief="groove", bd=1, padx=10, pady=5)
-                col_frame.grid(row=0, column=col, padx=10)
-
-                altura = datos["alturas"][col]
-                muerta = datos["muertas"][col]
-                condiciones = datos.get("condiciones", [{}]*4)[col]
-                estado = "💀 Muerta" if muerta else f"{altura:.1f} cm"
-                agua = condiciones.get("agua", "N/A")
-                luz = condiciones.get("luz", "N/A")
-                temp = condiciones.get("temp", "N/A")
-
-                tk.Label(col_frame, text=f"Planta {col+1}", font=("Times New Roman", 12, "bold"), bg="#fff9e6").pack()
-                tk.Label(col_frame, text=f"Altura: {estado}", font=("Times New Roman", 12), bg="#fff9e6").pack()
-                tk.Label(col_frame, text=f"Agua: {agua} ml", font=("Times New Roman", 12), bg="#fff9e6").pack()
-                tk.Label(col_frame, text=f"Luz: {luz} h", font=("Times New Roman", 12), bg="#fff9e6").pack()
-                tk.Label(col_frame, text=f"Temp: {temp} °C", font=("Times New Roman", 12), bg="#fff9e6").pack()
+        # Una sola ventana para recorrer todas las simulaciones por páginas.
+        # Si ya está abierta, se trae al frente en vez de abrir otra.
+        if getattr(self, "navegador", None) and self.navegador.ventana.winfo_exists():
+            self.navegador.ventana.lift()
+            return
+        self.navegador = NavegadorGuardados(self.root)
+
+    def mostrar_estadisticas(self):
+        if getattr(self, "panel_estadisticas", None) and self.panel_estadisticas.winfo_exists():
+            self.panel_estadisticas.destroy()
+        self.panel_estadisticas = PanelEstadisticas(self.root, resumir())
+
+    def mostrar_metricas(self):
+        if getattr(self, "panel_metricas", None) and self.panel_metricas.winfo_exists():
+            self.panel_metricas.lift()
+            self.panel_metricas.actualizar()
+            return
+        self.panel_metricas = PanelMetricas(self.root)
+
+
+# -------------------------------------------------------
+# Lista virtual de plantas
+# -------------------------------------------------------
+class ListaPlantasVirtual(tk.Frame):
+    """
+    Panel desplazable con las entradas de agua, luz y temperatura de
+    cada planta. Solo se crean los widgets de las filas visibles; al
+    desplazarse se reutilizan para mostrar otras plantas. Lo que el
+    usuario escribió en filas que salen de la vista se conserva aparte.
+    """
+
+    FILAS_VISIBLES = 4
+
+    # Espera desde la última tecla hasta actualizar la previsión
+    RETARDO_PREVISION_MS = 150
+
+    def __init__(self, master, poblacion, al_simular):
+        super().__init__(master, bg="#fff9e6")
+        self.poblacion = poblacion
+        self.textos = {}
+        self.previsiones_programadas = {}
+        self.primera = 0
+        self.n_filas = min(len(poblacion), self.FILAS_VISIBLES)
+        self.indices = [None] * self.n_filas
+        self.filas = []
+        self.previsiones = []
+
+        for f in range(self.n_filas):
+            frame = tk.LabelFrame(self, bg="#fff9e6", font=("Times New Roman", 12, "bold"))
+            frame.grid(row=f, column=0, pady=5, sticky="ew")
+
+            agua = tk.Entry(frame, width=6, font=("Times New Roman", 12))
+            luz = tk.Entry(frame, width=6, font=("Times New Roman", 12))
+            temp = tk.Entry(frame, width=6, font=("Times New Roman", 12))
+
+            tk.Label(frame, text="Agua (ml):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=0, padx=2)
+            agua.grid(row=0, column=1, padx=2)
+            tk.Label(frame, text="Luz (h):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=2, padx=2)
+            luz.grid(row=0, column=3, padx=2)
+            tk.Label(frame, text="Temp (°C):", bg="#fff9e6", font=("Times New Roman", 12)).grid(row=0, column=4, padx=2)
+            temp.grid(row=0, column=5, padx=2)
+            prevision = tk.Label(frame, width=10, anchor="w", bg="#fff9e6", font=("Times New Roman", 12))
+            prevision.grid(row=0, column=6, padx=4)
+
+            tk.Button(
+                frame,
+                text="Simular esta planta",
+                font=("Times New Roman", 12),
+                command=lambda f=f: al_simular(self.indices[f])
+            ).grid(row=1, column=0, columnspan=6, pady=4)
+
+            for widget in (frame, agua, luz, temp):
+                widget.bind("<MouseWheel>", self._rueda)
+                widget.bind("<Button-4>", self._rueda)
+                widget.bind("<Button-5>", self._rueda)
+            for entrada in (agua, luz, temp):
+                entrada.bind("<KeyRelease>", lambda e, f=f: self._programar_prevision(f))
+            self.filas.append((frame, (agua, luz, temp)))
+            self.previsiones.append(prevision)
+
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self.desplazar)
+        if len(poblacion) > self.n_filas:
+            self.barra.grid(row=0, column=1, rowspan=self.n_filas, sticky="ns")
+
+        self.mostrar_desde(0)
+
+    def _textos_poblacion(self, i):
+        condiciones = self.poblacion.condicion(i)
+        return tuple(f"{condiciones[f]:g}" for f in ("agua", "luz", "temp"))
+
+    def _guardar_visibles(self):
+        """Guarda lo escrito en las filas visibles antes de reutilizarlas."""
+        for i, (_, entradas) in zip(self.indices, self.filas):
+            if i is None:
+                continue
+            textos = tuple(e.get() for e in entradas)
+            if textos != self._textos_poblacion(i):
+                self.textos[i] = textos
+            else:
+                self.textos.pop(i, None)
+
+    def mostrar_desde(self, primera):
+        """Muestra las plantas desde la posición `primera`, reutilizando las filas."""
+        total = len(self.poblacion)
+        primera = max(0, min(primera, total - self.n_filas))
+        self._guardar_visibles()
+        self.primera = primera
+
+        for f, (frame, entradas) in enumerate(self.filas):
+            i = primera + f
+            self.indices[f] = i
+            frame.config(text=f"Planta {i+1}")
+            for entrada, texto in zip(entradas, self.textos.get(i) or self._textos_poblacion(i)):
+                entrada.delete(0, tk.END)
+                entrada.insert(0, texto)
+        if total:
+            self.barra.set(primera / total, (primera + self.n_filas) / total)
+        self.actualizar_previsiones()
+
+    # --- Previsión del próximo paso ---
+    def _programar_prevision(self, f):
+        """Agenda la previsión de la fila f; cada tecla nueva reinicia la espera."""
+        if f in self.previsiones_programadas:
+            self.after_cancel(self.previsiones_programadas[f])
+        self.previsiones_programadas[f] = self.after(self.RETARDO_PREVISION_MS,
+                                                     lambda: self._actualizar_prevision(f))
+
+    def _actualizar_prevision(self, f):
+        self.previsiones_programadas.pop(f, None)
+        i = self.indices[f]
+        if i is None:
+            return
+        if self.poblacion.muertas[i]:
+            texto = "💀 Muerta"
+        else:
+            texto = prever((e.get() for e in self.filas[f][1]), self.poblacion.especie)
+        self.previsiones[f].config(text=texto)
+
+    def actualizar_previsiones(self):
+        """Actualiza la previsión de las filas visibles (por ejemplo, tras un paso)."""
+        for f in range(self.n_filas):
+            self._actualizar_prevision(f)
+
+    def destroy(self):
+        for programada in self.previsiones_programadas.values():
+            self.after_cancel(programada)
+        self.previsiones_programadas.clear()
+        super().destroy()
+
+    def desplazar(self, *args):
+        """Recibe los comandos de la barra de desplazamiento."""
+        if args[0] == "moveto":
+            self.mostrar_desde(int(float(args[1]) * len(self.poblacion)))
+        elif args[0] == "scroll":
+            paso = self.n_filas if args[2] == "pages" else 1
+            self.mostrar_desde(self.primera + int(args[1]) * paso)
+
+    def _rueda(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.mostrar_desde(self.primera - 1)
+        else:
+            self.mostrar_desde(self.primera + 1)
+        return "break"
+
+    def textos_planta(self, i):
+        """Texto de agua, luz y temp de la planta i (visible o no)."""
+        if self.primera <= i < self.primera + self.n_filas:
+            return tuple(e.get() for e in self.filas[i - self.primera][1])
+        return self.textos.get(i) or self._textos_poblacion(i)
+
+    def valores(self, i):
+        """Valores numéricos de la planta i. Lanza ValueError si no son números."""
+        return tuple(float(t) for t in self.textos_planta(i))
+
+    def plantas_editadas(self):
+        """Plantas cuyas entradas pueden diferir de las condiciones guardadas."""
+        return sorted(set(self.textos) | {i for i in self.indices if i is not None})
+
+    def olvidar_ediciones(self):
+        self.textos.clear()
+
+    def reiniciar(self):
+        """Descarta lo escrito y vuelve a mostrar las condiciones de la población."""
+        self.textos.clear()
+        self.indices = [None] * self.n_filas
+        self.mostrar_desde(self.primera)
+
+
+# -------------------------------------------------------
+# Navegador de simulaciones guardadas
+# -------------------------------------------------------
+class NavegadorGuardados:
+    """
+    Ventana única para recorrer las simulaciones guardadas.
+
+    Solo se cargan y dibujan las simulaciones de la página visible
+    (listar_simulaciones con desplazamiento y límite). Las miniaturas ya
+    dibujadas quedan en una caché LRU chica, y el detalle usa siempre la
+    misma figura de Matplotlib, que se cierra junto con la ventana.
+    Con más de UMBRAL_HISTOGRAMA plantas se dibuja un histograma, y con
+    más de MAX_COLUMNAS los datos se resumen en una sola columna.
+    """
+
+    POR_PAGINA = 8
+    MAX_MINIATURAS = 64
+    MAX_COLUMNAS = 10
+    COLORES = ["#4CAF50", "#CDDC39", "#00BCD4", "#FFEB3B"]
+
+    def __init__(self, root):
+        self.pagina = 0
+        self.total = contar_simulaciones()
+        self.miniaturas = OrderedDict()
+
+        self.ventana = tk.Toplevel(root)
+        self.ventana.title("Simulaciones guardadas")
+        self.ventana.geometry("1300x750")
+        self.ventana.configure(bg="#fff9e6")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        # --- Lista de la página actual (izquierda) ---
+        self.frame_lista = tk.Frame(self.ventana, bg="#fff9e6")
+        self.frame_lista.place(x=20, y=20)
+        self.frame_botones = tk.Frame(self.frame_lista, bg="#fff9e6")
+        self.frame_botones.grid(row=0, column=0, columnspan=3)
+
+        tk.Button(self.frame_lista, text="◀ Anterior", font=("Times New Roman", 12),
+                  command=lambda: self.ir_a_pagina(self.pagina - 1)).grid(row=1, column=0, pady=10)
+        self.etiqueta_pagina = tk.Label(self.frame_lista, bg="#fff9e6", font=("Times New Roman", 12))
+        self.etiqueta_pagina.grid(row=1, column=1, padx=10)
+        tk.Button(self.frame_lista, text="Siguiente ▶", font=("Times New Roman", 12),
+                  command=lambda: self.ir_a_pagina(self.pagina + 1)).grid(row=1, column=2, pady=10)
+
+        # --- Detalle de la simulación elegida (derecha) ---
+        self.titulo_detalle = tk.Label(self.ventana, font=("Times New Roman", 16, "bold"), bg="#fff9e6")
+        self.titulo_detalle.place(x=520, y=10)
+
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=(7, 5))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.ventana)
+        self.canvas.get_tk_widget().place(x=520, y=50)
+
+        self.frame_datos = tk.Frame(self.ventana, bg="#fff9e6")
+        self.frame_datos.place(x=520, y=560)
+
+        # Figura pequeña y sin Tk, reutilizada para todas las miniaturas
+        self.fig_miniatura = Figure(figsize=(2, 1.4), dpi=60)
+        FigureCanvasAgg(self.fig_miniatura)
+
+        self.ir_a_pagina(0)
+
+    def ir_a_pagina(self, pagina):
+        paginas = max(1, -(-self.total // self.POR_PAGINA))
+        if not 0 <= pagina < paginas:
+            return
+        self.pagina = pagina
+        self.etiqueta_pagina.config(text=f"Página {pagina + 1} de {paginas}")
+
+        for widget in self.frame_botones.winfo_children():
+            widget.destroy()
+
+        simulaciones = listar_simulaciones(pagina * self.POR_PAGINA, self.POR_PAGINA)
+        for n, datos in enumerate(simulaciones):
+            tk.Button(
+                self.frame_botones,
+                text=f"Simulación #{datos['numero']}",
+                image=self.miniatura(datos),
+                compound="top",
+                font=("Times New Roman", 11),
+                command=lambda datos=datos: self.mostrar_detalle(datos)
+            ).grid(row=n // 2, column=n % 2, padx=6, pady=6)
+
+        if simulaciones:
+            self.mostrar_detalle(simulaciones[0])
+
+    def miniatura(self, datos):
+        """Devuelve la miniatura de una simulación, dibujándola solo si no está en caché."""
+        # En formato "fragmentos" el número puede correrse; el id no
+        clave = datos.get("id", datos["numero"])
+        if clave in self.miniaturas:
+            self.miniaturas.move_to_end(clave)
+            return self.miniaturas[clave]
+
+        self.fig_miniatura.clear()
+        ax = self.fig_miniatura.add_subplot()
+        self.graficar(ax, datos)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        buffer = io.BytesIO()
+        self.fig_miniatura.savefig(buffer, format="png")
+        imagen = tk.PhotoImage(master=self.ventana, data=base64.b64encode(buffer.getvalue()))
+
+        self.miniaturas[clave] = imagen
+        if len(self.miniaturas) > self.MAX_MINIATURAS:
+            self.miniaturas.popitem(last=False)
+        return imagen
+
+    def graficar(self, ax, datos):
+        """Una barra por planta o, si son muchas, el histograma de alturas de las vivas."""
+        alturas = datos["alturas"]
+        if len(alturas) > UMBRAL_HISTOGRAMA:
+            muertas = datos.get("muertas", [False] * len(alturas))
+            ax.hist([a for a, m in zip(alturas, muertas) if not m], bins=BARRAS_HISTOGRAMA,
+                    color=self.COLORES[0])
+        else:
+            ax.bar([f"Planta {i+1}" for i in range(len(alturas))], alturas, color=self.COLORES)
+            ax.set_ylim(0, max(20, max(alturas, default=0) + 2))
+
+    def columnas_detalle(self, datos):
+        """
+        Textos de las columnas bajo el gráfico: (título, líneas) de cada
+        planta, o una sola columna de resumen si hay más de MAX_COLUMNAS.
+        """
+        alturas = datos["alturas"]
+        n = len(alturas)
+        muertas = datos.get("muertas", [False] * n)
+        condiciones = datos.get("condiciones", [{}] * n)
+        if n > self.MAX_COLUMNAS:
+            vivas = [a for a, m in zip(alturas, muertas) if not m]
+            lineas = [f"Plantas: {n} ({len(vivas)} vivas)",
+                      f"Altura media de las vivas: {sum(vivas) / len(vivas):.1f} cm" if vivas
+                      else "Altura media de las vivas: N/A"]
+            for factor, nombre, unidad in (("agua", "Agua", "ml"), ("luz", "Luz", "h"), ("temp", "Temp", "°C")):
+                valores = [c[factor] for c in condiciones if c.get(factor) is not None]
+                media = f"{sum(valores) / len(valores):.1f}" if valores else "N/A"
+                lineas.append(f"{nombre} media: {media} {unidad}")
+            return [("Resumen", lineas)]
+
+        columnas = []
+        for col, altura in enumerate(alturas):
+            c = condiciones[col]
+            estado = "💀 Muerta" if muertas[col] else f"{altura:.1f} cm"
+            columnas.append((f"Planta {col+1}", [
+                f"Altura: {estado}",
+                f"Agua: {c.get('agua', 'N/A')} ml",
+                f"Luz: {c.get('luz', 'N/A')} h",
+                f"Temp: {c.get('temp', 'N/A')} °C",
+            ]))
+        return columnas
+
+    def mostrar_detalle(self, datos):
+        self.titulo_detalle.config(text=f"Simulación #{datos['numero']}")
+
+        # --- Gráfico (misma figura para todas las simulaciones) ---
+        self.ax.clear()
+        self.graficar(self.ax, datos)
+        if len(datos["alturas"]) > UMBRAL_HISTOGRAMA:
+            self.ax.set_xlabel("Altura (cm)")
+            self.ax.set_ylabel("Cantidad de plantas vivas")
+        else:
+            self.ax.set_ylabel("Altura (cm)")
+        self.ax.set_title(f"Crecimiento de plantas de {datos.get('especie', ESPECIE_POR_DEFECTO)}")
+        self.canvas.draw_idle()
+
+        # --- Datos en una columna por planta (o un resumen) ---
+        for widget in self.frame_datos.winfo_children():
+            widget.destroy()
+
+        for col, (titulo, lineas) in enumerate(self.columnas_detalle(datos)):
+            col_frame = tk.Frame(self.frame_datos, bg="#fff9e6", relief="groove", bd=1, padx=10, pady=5)
+            col_frame.grid(row=0, column=col, padx=10)
+            tk.Label(col_frame, text=titulo, font=("Times New Roman", 12, "bold"), bg="#fff9e6").pack()
+            for linea in lineas:
+                tk.Label(col_frame, text=linea, font=("Times New Roman", 12), bg="#fff9e6").pack()
+
+    def cerrar(self):
+        self.miniaturas.clear()
+        self.fig.clear()
+        self.fig_miniatura.clear()
+        self.ventana.destroy()
+
+
+# -------------------------------------------------------
+# Panel de estadísticas
+# -------------------------------------------------------
+class PanelEstadisticas(tk.Toplevel):
+    """
+    Ventana con el resumen de todas las simulaciones guardadas (ver
+    analisis.resumir): totales, supervivencia por posición de planta y
+    una tabla de plantas y muertes por banda de cada factor.
+    """
+
+    FACTORES = (("agua", "💧 Agua"), ("luz", "☀️ Luz"), ("temp", "🌡️ Temperatura"))
+
+    def __init__(self, root, resumen):
+        super().__init__(root)
+        self.title("Estadísticas de las simulaciones")
+        self.configure(bg="#fff9e6", padx=20, pady=20)
+
+        texto = (
+            f"Simulaciones: {resumen['simulaciones']}   |   "
+            f"Plantas: {resumen['plantas']} ({resumen['vivas']} vivas, "
+            f"{resumen['supervivencia']:.0%} de supervivencia)\n"
+            f"Altura media: {resumen['altura_media']:.1f} cm   |   "
+            f"Altura media de las vivas: {resumen['altura_media_vivas']:.1f} cm"
+        )
+        tk.Label(self, text=texto, font=("Times New Roman", 13), bg="#fff9e6",
+                 justify="left").pack(anchor="w", pady=(0, 10))
+
+        # --- Supervivencia por posición de planta ---
+        tk.Label(self, text="Supervivencia por planta", font=("Times New Roman", 13, "bold"),
+                 bg="#fff9e6").pack(anchor="w")
+        posiciones = ttk.Treeview(self, columns=("planta", "supervivencia"), show="headings", height=6)
+        posiciones.heading("planta", text="Planta")
+        posiciones.heading("supervivencia", text="Supervivencia")
+        for i, fraccion in enumerate(resumen["supervivencia_por_posicion"]):
+            posiciones.insert("", "end", values=(f"Planta {i + 1}", f"{fraccion:.0%}"))
+        posiciones.pack(fill="x", pady=(0, 10))
+
+        # --- Muertes por banda de cada factor ---
+        tk.Label(self, text="Plantas y muertes por banda (respecto del rango ideal)",
+                 font=("Times New Roman", 13, "bold"), bg="#fff9e6").pack(anchor="w")
+        bandas = ttk.Treeview(self, columns=("factor", "banda", "plantas", "muertas"),
+                              show="headings", height=12)
+        for columna, titulo in (("factor", "Factor"), ("banda", "Banda"),
+                                ("plantas", "Plantas"), ("muertas", "Muertas")):
+            bandas.heading(columna, text=titulo)
+        for factor, nombre in self.FACTORES:
+            for banda, cuenta in resumen["bandas"][factor].items():
+                bandas.insert("", "end", values=(nombre, banda, cuenta["plantas"], cuenta["muertas"]))
+        bandas.pack(fill="both", expand=True)
+
+
+# -------------------------------------------------------
+# Panel de métricas (solo con SIMULADOR_METRICAS o --metricas)
+# -------------------------------------------------------
+class PanelMetricas(tk.Toplevel):
+    """
+    Ventana de depuración con las métricas de metricas.py: llamadas,
+    duración media y máxima, bytes leídos y escritos, e histograma de
+    duraciones de cada función medida.
+    """
+
+    COLUMNAS = (("funcion", "Función", 160), ("llamadas", "Llamadas", 80),
+                ("media", "Media (ms)", 90), ("maximo", "Máx. (ms)", 90),
+                ("leidos", "Leídos", 90), ("escritos", "Escritos", 90),
+                ("histograma", "Histograma", 380))
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.title("Métricas de rendimiento")
+        self.configure(bg="#fff9e6", padx=20, pady=20)
+
+        limites = " | ".join("∞" if l == float("inf") else f"≤{l * 1000:g}"
+                             for l in metricas.LIMITES_HISTOGRAMA)
+        tk.Label(self, text=f"Intervalos del histograma (ms): {limites}",
+                 font=("Times New Roman", 11), bg="#fff9e6").pack(anchor="w", pady=(0, 8))
+
+        self.tabla = ttk.Treeview(self, columns=[c for c, _, _ in self.COLUMNAS],
+                                  show="headings", height=8)
+        for columna, titulo, ancho in self.COLUMNAS:
+            self.tabla.heading(columna, text=titulo)
+            self.tabla.column(columna, width=ancho, anchor="w" if columna == "funcion" else "e")
+        self.tabla.pack(fill="both", expand=True)
+
+        botones = tk.Frame(self, bg="#fff9e6")
+        botones.pack(pady=(10, 0))
+        ttk.Button(botones, text="🔄 Actualizar", command=self.actualizar).pack(side="left", padx=5)
+        ttk.Button(botones, text="🧹 Reiniciar", command=self.reiniciar).pack(side="left", padx=5)
+        ttk.Button(botones, text="💾 Guardar JSON", command=self.guardar).pack(side="left", padx=5)
+        self.actualizar()
+
+    def actualizar(self):
+        self.tabla.delete(*self.tabla.get_children())
+        for nombre, m in sorted(metricas.resumen().items()):
+            self.tabla.insert("", "end", values=(
+                nombre, m["llamadas"], f"{m['media'] * 1000:.2f}", f"{m['maximo'] * 1000:.2f}",
+                m["bytes_leidos"], m["bytes_escritos"], " ".join(map(str, m["histograma"])),
+            ))
+
+    def reiniciar(self):
+        metricas.reiniciar()
+        self.actualizar()
+
+    def guardar(self):
+        ruta = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")],
+                                            initialfile="metricas.json")
+        if ruta:
+            metricas.volcar_json(ruta)
 
 
 # -------------------------------------------------------
@@ -8,71 +8,338 @@
 # - Interacción con archivo JSON para guardar y cargar progresos
 # ---------------------------------------------------------------------
 
+import struct
+import sys
+from array import array
+
+from especies import (MUERTE, ESPECIE_POR_DEFECTO, TABLAS, evaluar_tabla,
+                      rangos_ideales, tolerancias, PLANTAS_POR_DEFECTO,
+                      ALTURA_INICIAL, CONDICIONES_INICIALES, MAX_BYTES_NOMBRE,
+                      validar_nombre)
+
 # --- Valores ideales para plantas de tomate ---
-VALORES_IDEALES = {
-    "agua": (70, 90),   # Rango en ml
-    "luz": (6, 10),     # Rango en horas de exposición
-    "temp": (18, 28)    # Rango en °C
-}
+# Se toman del perfil de la especie por defecto (ver especies.py):
+# agua en ml, luz en horas de exposición y temperatura en °C
+VALORES_IDEALES = rangos_ideales(ESPECIE_POR_DEFECTO)
+
+# Tolerancias de cada factor: (tolerancia extendida, tolerancia cercana)
+TOLERANCIAS = tolerancias(ESPECIE_POR_DEFECTO)
 
-# Constante que indica que la planta muere
-MUERTE = -999  
 
 # ---------------------------------------------------------------------
 # Función principal de cálculo de crecimiento
 # ---------------------------------------------------------------------
-def calcular_crecimiento(agua, luz, temp):
+def calcular_crecimiento(agua, luz, temp, especie=ESPECIE_POR_DEFECTO):
     """
     Calcula el cambio en altura de la planta según los valores de
     agua, luz y temperatura ingresados.
 
-    Reglas de crecimiento:
+    Reglas de crecimiento (perfil del tomate):
     - Condiciones ideales → +6 cm
     - Dentro de tolerancia extendida → +3 cm
     - Fuera de tolerancia pero cercanas → +1 cm
     - Condiciones extremas → MUERTE (-999)
 
     Se toma el factor más restrictivo como limitante del crecimiento.
+    Cada factor se resuelve con una bisección sobre la tabla compilada
+    de la especie, así que el costo no depende de cuántas bandas tenga.
     """
+    tabla_agua, tabla_luz, tabla_temp = TABLAS[especie]
+
+    # Como MUERTE es menor que cualquier crecimiento, el mínimo ya la
+    # propaga: basta con quedarse con el valor más restrictivo
+    return min(evaluar_tabla(tabla_agua, agua),
+               evaluar_tabla(tabla_luz, luz),
+               evaluar_tabla(tabla_temp, temp))
+
+
+# ---------------------------------------------------------------------
+# Versión vectorizada para poblaciones grandes
+# ---------------------------------------------------------------------
+def _crecimiento_lote_especie(agua, luz, temp, especie):
+    """Aplica las tablas de una sola especie a tres arreglos de NumPy."""
+    import numpy as np
+
+    resultado = None
+    for (umbrales, valores), columna in zip(TABLAS[especie], (agua, luz, temp)):
+        indices = np.searchsorted(umbrales, columna, side="right")
+        factor = np.asarray(valores, dtype=np.int32)[indices]
+        resultado = factor if resultado is None else np.minimum(resultado, factor, out=resultado)
+    return resultado
+
+
+def calcular_crecimiento_lote(agua, luz, temp, especie=ESPECIE_POR_DEFECTO):
+    """
+    Calcula el crecimiento de muchas plantas en una sola pasada.
+
+    Args:
+        agua, luz, temp: arreglos de NumPy, listas o cualquier objeto con
+            protocolo de buffer (array.array, memoryview...) del mismo largo.
+        especie: nombre de la especie, o un arreglo con el nombre de la
+            especie de cada planta para poblaciones mixtas.
+    Returns:
+        Arreglo de NumPy (int32) con el crecimiento o MUERTE de cada planta,
+        idéntico a llamar a calcular_crecimiento elemento por elemento.
+    """
+    import numpy as np
+
+    agua = np.asarray(agua, dtype=np.float64)
+    luz = np.asarray(luz, dtype=np.float64)
+    temp = np.asarray(temp, dtype=np.float64)
+    if not (agua.shape == luz.shape == temp.shape):
+        raise ValueError("agua, luz y temp deben tener la misma forma.")
+
+    if isinstance(especie, str):
+        return _crecimiento_lote_especie(agua, luz, temp, especie)
+
+    # Poblaciones mixtas: una pasada vectorizada por cada especie presente
+    especie = np.asarray(especie)
+    if especie.shape != agua.shape:
+        raise ValueError("especie debe tener la misma forma que las condiciones.")
+    resultado = np.empty(agua.shape, dtype=np.int32)
+    for nombre in np.unique(especie):
+        mascara = especie == nombre
+        resultado[mascara] = _crecimiento_lote_especie(agua[mascara], luz[mascara], temp[mascara], str(nombre))
+    return resultado
+
+
+# ---------------------------------------------------------------------
+# Reglas de avance de la simulación (sin interfaz gráfica)
+# ---------------------------------------------------------------------
+def paso_planta(altura, muerta, agua, luz, temp, especie=ESPECIE_POR_DEFECTO):
+    """
+    Avanza un paso (un día) de una sola planta.
+
+    Reglas:
+    - Una planta muerta no cambia.
+    - Si el crecimiento es MUERTE, la altura pasa a 0 y la planta muere.
+    - Si no, se suma el crecimiento; si la altura llega a 0, muere.
+
+    Returns:
+        Tupla (nueva_altura, muerta, resultado), donde resultado es el
+        valor de calcular_crecimiento (None si la planta ya estaba muerta).
+    """
+    if muerta:
+        return altura, True, None
+
+    resultado = calcular_crecimiento(agua, luz, temp, especie)
+    if resultado == MUERTE:
+        return 0, True, resultado
+
+    altura = max(0, altura + resultado)
+    return altura, altura <= 0, resultado
+
+
+def paso_poblacion(alturas, muertas, agua, luz, temp, especie=ESPECIE_POR_DEFECTO):
+    """
+    Versión vectorizada de paso_planta: avanza toda la población un día.
+    Modifica alturas (float) y muertas (bool) en el lugar.
+
+    Args:
+        alturas, muertas: arreglos de NumPy de largo N.
+        agua, luz, temp: escalares o arreglos de largo N.
+    Returns:
+        Arreglo con el crecimiento de cada planta en este paso.
+    """
+    import numpy as np
+
+    n = alturas.shape[0]
+    agua, luz, temp = (np.broadcast_to(np.asarray(c, dtype=np.float64), (n,))
+                       for c in (agua, luz, temp))
+    resultado = calcular_crecimiento_lote(agua, luz, temp, especie)
 
-    # Extraemos los rangos ideales
-    a_min, a_max = VALORES_IDEALES["agua"]
-    l_min, l_max = VALORES_IDEALES["luz"]
-    t_min, t_max = VALORES_IDEALES["temp"]
+    # Las plantas muertas no cambian
+    resultado[muertas] = 0
+    murieron = resultado == MUERTE
+    alturas[murieron] = 0
+    vivas = ~(muertas | murieron)
+    alturas[vivas] = np.maximum(0, alturas[vivas] + resultado[vivas])
+    muertas |= murieron | (alturas <= 0)
+    return resultado
 
-    # --- Función auxiliar para evaluar la contribución de cada factor ---
-    def evaluar_factor(valor, minimo, maximo, tol_extendida, tol_cercana):
+
+def cronograma_constante(agua, luz, temp, dias):
+    """Cronograma de `dias` pasos con las mismas condiciones cada día."""
+    from itertools import repeat
+    return repeat((agua, luz, temp), dias)
+
+
+def simular_dias(alturas, muertas, cronograma, especie=ESPECIE_POR_DEFECTO):
+    """
+    Motor de simulación de varios días, sin interfaz gráfica.
+
+    Args:
+        alturas, muertas: estado inicial (listas o arreglos de largo N).
+        cronograma: iterable (puede ser un generador) que entrega, para
+            cada día, una tupla (agua, luz, temp) con escalares o arreglos
+            de largo N.
+        especie: nombre de la especie o arreglo de especies por planta.
+    Yields:
+        Tuplas (dia, alturas, muertas, crecimiento) con dia desde 1.
+
+    El estado se genera de a un paso y se reutilizan los mismos arreglos,
+    así que nunca se guarda la trayectoria completa en memoria. Si se
+    necesita conservar un paso, hay que copiarlo (por ejemplo alturas.copy()).
+    """
+    import numpy as np
+
+    alturas = np.array(alturas, dtype=np.float64)
+    muertas = np.array(muertas, dtype=bool)
+    for dia, (agua, luz, temp) in enumerate(cronograma, start=1):
+        crecimiento = paso_poblacion(alturas, muertas, agua, luz, temp, especie)
+        yield dia, alturas, muertas, crecimiento
+
+
+# ---------------------------------------------------------------------
+# Población de plantas con almacenamiento compacto
+# ---------------------------------------------------------------------
+class Poblacion:
+    """
+    Estado de N plantas guardado en arreglos contiguos:
+    - alturas: array('f'), 4 bytes por planta
+    - muertas: bytearray, 1 byte por planta (0 = viva, 1 = muerta)
+    - agua, luz, temp: array('d'), 8 bytes por planta cada uno, para
+      conservar exactamente los valores ingresados
+
+    Un millón de plantas ocupa unos 29 MB. Los pasos y el reinicio se
+    hacen sobre vistas de NumPy de esos mismos arreglos, sin copiarlos.
+    """
+
+    # Encabezado de a_bytes(): marca, cantidad de plantas y especie
+    FORMATO_ENCABEZADO = f"<4sI{MAX_BYTES_NOMBRE}s"
+    MARCA = b"POB1"
+
+    def __init__(self, n=PLANTAS_POR_DEFECTO, especie=ESPECIE_POR_DEFECTO,
+                 altura=ALTURA_INICIAL, condiciones=CONDICIONES_INICIALES):
+        self.especie = especie
+        self.alturas = array("f", [altura]) * n
+        self.muertas = bytearray(n)
+        self.agua = array("d", [condiciones["agua"]]) * n
+        self.luz = array("d", [condiciones["luz"]]) * n
+        self.temp = array("d", [condiciones["temp"]]) * n
+
+    def __len__(self):
+        return len(self.alturas)
+
+    def vistas(self):
+        """Vistas de NumPy (sin copia) de alturas, muertas, agua, luz y temp."""
+        import numpy as np
+        return (np.frombuffer(self.alturas, dtype=np.float32),
+                np.frombuffer(self.muertas, dtype=bool),
+                np.frombuffer(self.agua, dtype=np.float64),
+                np.frombuffer(self.luz, dtype=np.float64),
+                np.frombuffer(self.temp, dtype=np.float64))
+
+    # --- Condiciones ---
+    def condicion(self, i):
+        """Condiciones de la planta i como diccionario."""
+        return {"agua": self.agua[i], "luz": self.luz[i], "temp": self.temp[i]}
+
+    def fijar_condiciones(self, agua=None, luz=None, temp=None):
+        """Fija las condiciones de todas las plantas (escalares o arreglos de largo N)."""
+        _, _, v_agua, v_luz, v_temp = self.vistas()
+        for vista, valor in ((v_agua, agua), (v_luz, luz), (v_temp, temp)):
+            if valor is not None:
+                vista[:] = valor
+
+    # --- Pasos de simulación ---
+    def paso_una(self, i, agua, luz, temp):
+        """
+        Avanza la planta i un paso con las condiciones dadas (ver paso_planta).
+        Devuelve el resultado de calcular_crecimiento, o None si ya estaba muerta.
+        """
+        self.agua[i], self.luz[i], self.temp[i] = agua, luz, temp
+        altura, muerta, resultado = paso_planta(self.alturas[i], bool(self.muertas[i]),
+                                                agua, luz, temp, self.especie)
+        self.alturas[i], self.muertas[i] = altura, muerta
+        return resultado
+
+    def paso(self, agua=None, luz=None, temp=None):
+        """
+        Avanza todas las plantas un paso, en forma vectorizada. Si se pasan
+        condiciones, primero se fijan; si no, se usan las guardadas.
+        Devuelve el crecimiento de cada planta.
+        """
+        self.fijar_condiciones(agua, luz, temp)
+        alturas, muertas, v_agua, v_luz, v_temp = self.vistas()
+        return paso_poblacion(alturas, muertas, v_agua, v_luz, v_temp, self.especie)
+
+    def simular(self, cronograma):
         """
-        Determina cuánto contribuye un factor al crecimiento.
-        Args:
-            valor: valor ingresado del factor (agua, luz, temp)
-            minimo, maximo: rango ideal
-            tol_extendida: tolerancia extendida (crecimiento +3)
-            tol_cercana: tolerancia cercana (crecimiento +1)
-        Returns:
-            Entero: 6, 3, 1 o MUERTE
+        Avanza la población según un cronograma (como simular_dias), pero
+        sobre sus propios arreglos. Genera (dia, crecimiento) en cada paso.
         """
-        if minimo <= valor <= maximo:
-            return 6        # Condición ideal
-        elif (minimo - tol_extendida) <= valor < minimo or maximo < valor <= (maximo + tol_extendida):
-            return 3        # Dentro de tolerancia extendida
-        elif (minimo - tol_extendida - tol_cercana) <= valor < (minimo - tol_extendida) or \
-             (maximo + tol_extendida) < valor <= (maximo + tol_extendida + tol_cercana):
-            return 1        # Fuera pero cercano
-        else:
-            return MUERTE    # Condición extrema → planta muere
+        for dia, (agua, luz, temp) in enumerate(cronograma, start=1):
+            yield dia, self.paso(agua, luz, temp)
 
-    # Evaluamos cada factor
-    crecimiento_agua = evaluar_factor(agua, a_min, a_max, tol_extendida=50, tol_cercana=10)
-    crecimiento_luz = evaluar_factor(luz, l_min, l_max, tol_extendida=2, tol_cercana=2)
-    crecimiento_temp = evaluar_factor(temp, t_min, t_max, tol_extendida=2, tol_cercana=2)
+    def reiniciar(self, altura=ALTURA_INICIAL, condiciones=CONDICIONES_INICIALES):
+        """Vuelve todas las plantas al estado inicial."""
+        alturas, muertas, _, _, _ = self.vistas()
+        alturas[:] = altura
+        muertas[:] = False
+        self.fijar_condiciones(condiciones["agua"], condiciones["luz"], condiciones["temp"])
 
-    # Si algún factor indica MUERTE, la planta muere
-    if MUERTE in [crecimiento_agua, crecimiento_luz, crecimiento_temp]:
-        return MUERTE
+    # --- Serialización ---
+    def a_simulacion(self):
+        """Convierte la población al diccionario que usa guardado_json."""
+        return {
+            "alturas": self.alturas.tolist(),
+            "muertas": [bool(m) for m in self.muertas],
+            "condiciones": [self.condicion(i) for i in range(len(self))],
+        }
+
+    @classmethod
+    def desde_simulacion(cls, datos, especie=ESPECIE_POR_DEFECTO):
+        """Crea una población a partir de una simulación guardada."""
+        alturas = datos.get("alturas", [ALTURA_INICIAL] * PLANTAS_POR_DEFECTO)
+        n = len(alturas)
+        poblacion = cls(0, datos.get("especie", especie))
+        poblacion.alturas = array("f", alturas)
+        poblacion.muertas = bytearray(bool(m) for m in datos.get("muertas", [False] * n))
+        condiciones = datos.get("condiciones", [CONDICIONES_INICIALES] * n)
+        for factor in ("agua", "luz", "temp"):
+            setattr(poblacion, factor, array("d", (float(c.get(factor, CONDICIONES_INICIALES[factor]))
+                                                   for c in condiciones)))
+        return poblacion
+
+    def a_bytes(self):
+        """
+        Serializa la población en binario: un encabezado y luego los
+        arreglos tal como están en memoria (en little-endian). Lanza
+        ValueError si el nombre de la especie no entra en el encabezado.
+        """
+        validar_nombre(self.especie)
+        encabezado = struct.pack(self.FORMATO_ENCABEZADO, self.MARCA, len(self),
+                                 self.especie.encode("utf-8"))
+        partes = [encabezado]
+        for arreglo in (self.alturas, self.muertas, self.agua, self.luz, self.temp):
+            if sys.byteorder == "big" and isinstance(arreglo, array):
+                arreglo = array(arreglo.typecode, arreglo)
+                arreglo.byteswap()
+            partes.append(bytes(arreglo))
+        return b"".join(partes)
 
-    # Retornamos el valor más restrictivo como limitante
-    return min(crecimiento_agua, crecimiento_luz, crecimiento_temp)
+    @classmethod
+    def desde_bytes(cls, datos):
+        """Reconstruye una población serializada con a_bytes()."""
+        marca, n, especie = struct.unpack_from(cls.FORMATO_ENCABEZADO, datos)
+        if marca != cls.MARCA:
+            raise ValueError("Los datos no son una población serializada.")
+        poblacion = cls(0, especie.rstrip(b"\0").decode("utf-8"))
+        posicion = struct.calcsize(cls.FORMATO_ENCABEZADO)
+        for nombre, tipo in (("alturas", "f"), ("muertas", None), ("agua", "d"), ("luz", "d"), ("temp", "d")):
+            tamano = n * (array(tipo).itemsize if tipo else 1)
+            bloque = datos[posicion:posicion + tamano]
+            posicion += tamano
+            if tipo is None:
+                setattr(poblacion, nombre, bytearray(bloque))
+                continue
+            arreglo = array(tipo)
+            arreglo.frombytes(bloque)
+            if sys.byteorder == "big":
+                arreglo.byteswap()
+            setattr(poblacion, nombre, arreglo)
+        return poblacion
 
 
 # ---------------------------------------------------------------------
@@ -80,13 +347,13 @@ def calcular_crecimiento(agua, luz, temp):
 # ---------------------------------------------------------------------
 from guardado_json import guardar_simulacion, cargar_simulaciones, reiniciar_guardado
 
-def valores_iniciales():
+def valores_iniciales(n=PLANTAS_POR_DEFECTO):
     """
     Devuelve los valores iniciales de la simulación actual:
     - Altura inicial de cada planta: 3 cm
     - Estado de cada planta: viva (False = no muerta)
     """
-    return {"alturas": [3, 3, 3, 3], "muertas": [False, False, False, False]}
+    return {"alturas": [ALTURA_INICIAL] * n, "muertas": [False] * n}
 
 def reiniciar_simulacion_actual():
     """
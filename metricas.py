@@ -0,0 +1,136 @@
+# ---------------------------------------------------------------------
+# metricas.py
+# ---------------------------------------------------------------------
+# Instrumentación opcional de los caminos más usados del simulador:
+# cantidad de llamadas, histograma de duraciones y bytes leídos y
+# escritos de cada función marcada con @medir.
+#
+# Está apagada por defecto. Se activa con la variable de entorno
+# SIMULADOR_METRICAS=1 (o SIMULADOR_METRICAS=archivo.json para volcar
+# las métricas al salir), o con la opción --metricas de ejecutar.py.
+# Apagada, @medir devuelve la misma función sin envolver: no agrega
+# ningún costo. Por eso hay que activarla antes de importar los módulos
+# instrumentados.
+#
+# Para un perfil completo, ejecutar.py --perfil=salida.pstats corre el
+# programa con cProfile (se lee con python -m pstats salida.pstats).
+# ---------------------------------------------------------------------
+
+import atexit
+import cProfile
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+_variable = os.environ.get("SIMULADOR_METRICAS", "")
+ACTIVAS = _variable not in ("", "0")
+
+# Límites superiores (en segundos) de cada intervalo del histograma
+LIMITES_HISTOGRAMA = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, math.inf)
+
+_metricas = {}
+_lock = threading.Lock()
+# Pila de funciones medidas en curso de cada hilo, para atribuir los bytes
+_en_curso = threading.local()
+
+
+def _nueva():
+    return {"llamadas": 0, "total": 0.0, "maximo": 0.0,
+            "histograma": [0] * len(LIMITES_HISTOGRAMA),
+            "bytes_leidos": 0, "bytes_escritos": 0}
+
+
+def activar(archivo=None):
+    """
+    Activa la instrumentación. Si se indica un archivo, las métricas se
+    vuelcan ahí en JSON al terminar el programa.
+    """
+    global ACTIVAS
+    ACTIVAS = True
+    if archivo:
+        atexit.register(volcar_json, archivo)
+
+
+def medir(nombre):
+    """Decorador que registra llamadas, duración y bytes de la función."""
+    def decorador(funcion):
+        if not ACTIVAS:
+            return funcion
+
+        @functools.wraps(funcion)
+        def medida(*args, **kwargs):
+            pila = getattr(_en_curso, "pila", None)
+            if pila is None:
+                pila = _en_curso.pila = []
+            pila.append(nombre)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                duracion = time.perf_counter() - inicio
+                pila.pop()
+                with _lock:
+                    metrica = _metricas.setdefault(nombre, _nueva())
+                    metrica["llamadas"] += 1
+                    metrica["total"] += duracion
+                    metrica["maximo"] = max(metrica["maximo"], duracion)
+                    for i, limite in enumerate(LIMITES_HISTOGRAMA):
+                        if duracion <= limite:
+                            metrica["histograma"][i] += 1
+                            break
+        return medida
+    return decorador
+
+
+def contar_bytes(leidos=0, escritos=0):
+    """
+    Suma bytes leídos o escritos a la función medida en curso (la más
+    interna del hilo actual). Quien llama debe chequear ACTIVAS antes,
+    para no calcular tamaños cuando la instrumentación está apagada.
+    """
+    pila = getattr(_en_curso, "pila", None)
+    nombre = pila[-1] if pila else "sin_funcion"
+    with _lock:
+        metrica = _metricas.setdefault(nombre, _nueva())
+        metrica["bytes_leidos"] += leidos
+        metrica["bytes_escritos"] += escritos
+
+
+def resumen():
+    """Copia de las métricas, con la duración media de cada función."""
+    with _lock:
+        copia = {nombre: dict(m, histograma=list(m["histograma"])) for nombre, m in _metricas.items()}
+    for metrica in copia.values():
+        metrica["media"] = metrica["total"] / metrica["llamadas"] if metrica["llamadas"] else 0.0
+    return copia
+
+
+def reiniciar():
+    with _lock:
+        _metricas.clear()
+
+
+def volcar_json(ruta):
+    """Escribe las métricas en un archivo JSON."""
+    datos = {
+        "limites_histograma": [None if math.isinf(l) else l for l in LIMITES_HISTOGRAMA],
+        "funciones": resumen(),
+    }
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, ensure_ascii=False)
+
+
+def perfilar(funcion, ruta):
+    """Ejecuta funcion() con cProfile y guarda el perfil en `ruta` (formato pstats)."""
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcion)
+    finally:
+        perfil.dump_stats(ruta)
+
+
+if ACTIVAS and _variable != "1":
+    atexit.register(volcar_json, _variable)
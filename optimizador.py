@@ -0,0 +1,217 @@
+# ---------------------------------------------------------------------
+# optimizador.py
+# ---------------------------------------------------------------------
+# Recomendación de condiciones: las más económicas (menos agua y, a
+# igual agua, menos horas de luz) que llevan una planta a una altura
+# objetivo en una cantidad de días, con límites opcionales por día.
+#
+# El crecimiento es constante por tramos: cada factor cae en una banda
+# de su tabla (ver especies.compilar_factor) y el resultado es el mínimo
+# entre los tres. Para cada nivel de crecimiento posible se busca
+# directamente, sobre los intervalos de las bandas, el valor más barato
+# de cada factor que lo alcanza. Después una programación dinámica por
+# días elige qué nivel usar cada día. No se recorre ninguna grilla.
+# ---------------------------------------------------------------------
+
+import math
+
+from especies import MUERTE, ESPECIE_POR_DEFECTO, FACTORES, TABLAS, ALTURA_INICIAL
+from logica import calcular_crecimiento
+
+# Límites físicos por defecto de cada factor (agua en ml, luz en horas)
+LIMITES_POR_DEFECTO = {
+    "agua": (0, math.inf),
+    "luz": (0, 24),
+    "temp": (-math.inf, math.inf),
+}
+
+
+def _intervalos(tabla, nivel, minimo, maximo):
+    """
+    Genera los intervalos [inicio, último] (ambos incluidos) de valores
+    dentro de [minimo, maximo] con los que el factor crece al menos `nivel`.
+    La banda j de la tabla es [umbrales[j-1], umbrales[j]), igual que en
+    bisect_right.
+    """
+    umbrales, valores = tabla
+    bordes = (-math.inf,) + tuple(umbrales) + (math.inf,)
+    for j, valor in enumerate(valores):
+        if valor == MUERTE or valor < nivel:
+            continue
+        inicio = max(minimo, bordes[j])
+        ultimo = min(maximo, math.nextafter(bordes[j + 1], -math.inf))
+        if inicio <= ultimo:
+            yield inicio, ultimo
+
+
+def _mas_barato(tabla, nivel, limites):
+    """Menor valor del factor que alcanza `nivel`, o None si no hay ninguno."""
+    return min((inicio for inicio, _ in _intervalos(tabla, nivel, *limites)), default=None)
+
+
+def _mas_cercano(tabla, nivel, limites, centro):
+    """Valor que alcanza `nivel` más cercano a `centro`, o None si no hay ninguno."""
+    candidatos = [min(max(centro, inicio), ultimo) for inicio, ultimo in _intervalos(tabla, nivel, *limites)]
+    return min(candidatos, key=lambda v: abs(v - centro), default=None)
+
+
+def _limites_del_dia(restricciones, dia):
+    """Límites (mínimo, máximo) de cada factor para un día."""
+    if restricciones is None:
+        propias = {}
+    elif isinstance(restricciones, dict):
+        propias = restricciones
+    else:
+        propias = restricciones[dia] or {}
+    limites = {}
+    for factor in FACTORES:
+        minimo, maximo = LIMITES_POR_DEFECTO[factor]
+        pedido = propias.get(factor, (None, None))
+        limites[factor] = (minimo if pedido[0] is None else max(minimo, pedido[0]),
+                           maximo if pedido[1] is None else min(maximo, pedido[1]))
+    return limites
+
+
+def opciones_del_dia(limites, especie=ESPECIE_POR_DEFECTO):
+    """
+    Devuelve {nivel: (agua, luz, temp)} con las condiciones más baratas
+    para crecer al menos cada nivel posible de la especie dentro de los
+    límites de un día. La temperatura no tiene costo: se elige la más
+    cercana al centro de su rango ideal.
+    """
+    tabla_agua, tabla_luz, tabla_temp = TABLAS[especie]
+    umbrales_temp, valores_temp = tabla_temp
+    ideal = valores_temp.index(max(valores_temp))
+    centro = (umbrales_temp[ideal - 1] + umbrales_temp[ideal]) / 2
+
+    niveles = sorted({v for tabla in TABLAS[especie] for v in tabla[1] if v != MUERTE})
+    opciones = {}
+    for nivel in niveles:
+        agua = _mas_barato(tabla_agua, nivel, limites["agua"])
+        luz = _mas_barato(tabla_luz, nivel, limites["luz"])
+        temp = _mas_cercano(tabla_temp, nivel, limites["temp"], centro)
+        if None not in (agua, luz, temp):
+            opciones[nivel] = (agua, luz, temp)
+    return opciones
+
+
+def recomendar(altura_objetivo, dias, altura_inicial=ALTURA_INICIAL,
+               especie=ESPECIE_POR_DEFECTO, restricciones=None):
+    """
+    Busca las condiciones más económicas para llegar a `altura_objetivo`
+    en `dias` pasos sin que la planta muera.
+
+    Args:
+        restricciones: límites opcionales {factor: (mínimo, máximo)},
+            iguales para todos los días, o una lista con esos límites
+            para cada día (None en un día significa sin límites).
+    Returns:
+        Diccionario con "dias" (agua, luz, temp y crecimiento de cada
+        día), "agua_total", "luz_total" y "altura_final", o None si no
+        se puede llegar a la altura objetivo.
+    """
+    # NumPy se carga recién al pedir una recomendación: la interfaz
+    # importa este módulo al arrancar
+    import numpy as np
+
+    if not isinstance(restricciones, (type(None), dict)) and len(restricciones) != dias:
+        raise ValueError("Se necesitan restricciones para cada día")
+
+    falta = max(0, math.ceil(altura_objetivo - altura_inicial))
+    estados = falta + 1
+
+    # Costo mínimo (agua, luz) para haber crecido s cm (s topeado en lo
+    # que falta), y el nivel elegido cada día para reconstruir el plan
+    agua = np.full(estados, np.inf)
+    luz = np.full(estados, np.inf)
+    agua[0] = luz[0] = 0.0
+    elecciones = []
+    opciones_por_dia = []
+    cache = {}
+
+    for dia in range(dias):
+        limites = _limites_del_dia(restricciones, dia)
+        clave = tuple(limites[f] for f in FACTORES)
+        if clave not in cache:
+            cache[clave] = opciones_del_dia(limites, especie)
+        opciones = cache[clave]
+        opciones_por_dia.append(opciones)
+
+        nuevo_agua = np.full(estados, np.inf)
+        nuevo_luz = np.full(estados, np.inf)
+        eleccion = np.full(estados, -1, dtype=np.int64)
+        origen = np.full(estados, -1, dtype=np.int64)
+        for nivel, (a, l, _) in opciones.items():
+            if int(nivel) != nivel:
+                raise ValueError(f"El crecimiento {nivel} de {especie} no es un número entero de cm")
+            nivel = int(nivel)
+            # Destino de cada estado s: s + nivel, topeado en lo que falta.
+            # Los que llegan al tope se reducen a su mejor candidato.
+            corte = max(0, falta - nivel)
+            cola = np.arange(corte, estados)
+            mejor = cola[np.lexsort((luz[cola], agua[cola]))[0]]
+            fuentes = np.append(np.arange(corte), mejor)
+            destinos = np.append(np.arange(nivel, nivel + corte), falta)
+            candidato_agua = agua[fuentes] + a
+            candidato_luz = luz[fuentes] + l
+            mejora = ((candidato_agua < nuevo_agua[destinos]) |
+                      ((candidato_agua == nuevo_agua[destinos]) & (candidato_luz < nuevo_luz[destinos])))
+            destinos, fuentes = destinos[mejora], fuentes[mejora]
+            nuevo_agua[destinos] = candidato_agua[mejora]
+            nuevo_luz[destinos] = candidato_luz[mejora]
+            eleccion[destinos] = nivel
+            origen[destinos] = fuentes
+        agua, luz = nuevo_agua, nuevo_luz
+        elecciones.append((eleccion, origen))
+
+    if not np.isfinite(agua[falta]):
+        return None
+
+    # Reconstrucción del plan de atrás hacia adelante
+    plan = []
+    estado = falta
+    for dia in range(dias - 1, -1, -1):
+        eleccion, origen = elecciones[dia]
+        condiciones = opciones_por_dia[dia][int(eleccion[estado])]
+        plan.append(dict(zip(FACTORES, condiciones)))
+        estado = int(origen[estado])
+    plan.reverse()
+
+    altura = altura_inicial
+    for condiciones in plan:
+        condiciones["crecimiento"] = calcular_crecimiento(
+            condiciones["agua"], condiciones["luz"], condiciones["temp"], especie)
+        altura += condiciones["crecimiento"]
+    return {
+        "especie": especie,
+        "dias": plan,
+        "agua_total": sum(c["agua"] for c in plan),
+        "luz_total": sum(c["luz"] for c in plan),
+        "altura_final": altura,
+    }
+
+
+def recomendar_por_especie(altura_objetivo, dias, especies=None, **opciones):
+    """Aplica recomendar() a varias especies (por defecto, a todas)."""
+    return {especie: recomendar(altura_objetivo, dias, especie=especie, **opciones)
+            for especie in (especies or TABLAS)}
+
+
+def describir_plan(plan):
+    """Texto corto con el plan, agrupando los días consecutivos iguales."""
+    if plan is None:
+        return "No hay condiciones que lleguen a esa altura en esos días."
+    lineas = []
+    inicio = 0
+    dias = plan["dias"]
+    for i in range(1, len(dias) + 1):
+        if i < len(dias) and dias[i] == dias[inicio]:
+            continue
+        c = dias[inicio]
+        rango = f"Día {inicio + 1}" if i - inicio == 1 else f"Días {inicio + 1}–{i}"
+        lineas.append(f"{rango}: 💧 {c['agua']:g} ml, ☀️ {c['luz']:g} h, "
+                      f"🌡️ {c['temp']:g} °C → +{c['crecimiento']} cm")
+        inicio = i
+    lineas.append(f"Total: {plan['agua_total']:g} ml de agua, {plan['luz_total']:g} h de luz, "
+                  f"altura final {plan['altura_final']:g} cm")
+    return "\n".join(lineas)
@@ -0,0 +1,32 @@
+# ---------------------------------------------------------------------
+# prevision.py
+# ---------------------------------------------------------------------
+# Previsión del resultado de un paso mientras se escriben condiciones.
+#
+# calcular_crecimiento ya lee tablas precompiladas de cada especie (una
+# bisección por factor, ver especies.py), así que la previsión es exacta
+# para cualquier valor y cuesta lo mismo que leer una tabla 3D, sin su
+# memoria ni su tiempo de armado.
+# ---------------------------------------------------------------------
+
+from especies import ESPECIE_POR_DEFECTO, MUERTE
+from logica import calcular_crecimiento
+
+
+def describir(crecimiento):
+    """Texto corto de la previsión de un paso."""
+    if crecimiento == MUERTE:
+        return "💀 Muere"
+    return f"🌱 +{crecimiento} cm" if crecimiento >= 0 else f"🥀 {crecimiento} cm"
+
+
+def prever(textos, especie=ESPECIE_POR_DEFECTO):
+    """
+    Previsión a partir de lo escrito en agua, luz y temp. Devuelve el
+    texto a mostrar, o un guion si algún valor todavía no es un número.
+    """
+    try:
+        agua, luz, temp = (float(t) for t in textos)
+    except ValueError:
+        return "—"
+    return describir(calcular_crecimiento(agua, luz, temp, especie))
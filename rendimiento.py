@@ -0,0 +1,303 @@
+# ---------------------------------------------------------------------
+# rendimiento.py
+# ---------------------------------------------------------------------
+# Mediciones de rendimiento de los caminos más usados del simulador:
+# - calcular_crecimiento de a una llamada y calcular_crecimiento_lote
+#   sobre un millón de plantas
+# - guardar_simulacion, cargar_simulaciones, cargar_simulacion y
+#   contar_simulaciones con 10, 1.000 y 100.000 simulaciones guardadas,
+#   y además en formato binario con 100.000
+# - actualizar_grafico de la interfaz, dibujando con Agg (sin ventana)
+#
+# Los resultados (segundos por operación, mediana de varias
+# repeticiones) se escriben en JSON y se comparan con una referencia
+# guardada: si alguno supera la referencia por más del umbral, el
+# programa termina con código 1.
+#
+# Uso:
+#    python rendimiento.py [--salida resultados.json] [--umbral 1.5]
+#    python rendimiento.py --guardar-referencia     (en una máquina nueva)
+# ---------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import guardado_json
+from logica import calcular_crecimiento, calcular_crecimiento_lote
+
+BASE_DIR = os.path.dirname(__file__)
+ARCHIVO_REFERENCIA = os.path.join(BASE_DIR, "data", "rendimiento_referencia.json")
+
+# Cantidades de simulaciones guardadas con las que se mide el guardado
+TAMANOS = (10, 1000, 100000)
+
+# Historial con el que se mide también el formato binario
+TAMANO_BINARIO = 100000
+
+# Veces que se repite cada medición (se informa la mediana)
+REPETICIONES = 5
+
+# Un resultado es una regresión si supera la referencia por este factor
+UMBRAL = 1.5
+
+# Mediciones más cortas que esto no se comparan: son puro ruido
+MINIMO_COMPARABLE = 1e-5
+
+
+def medir(funcion, repeticiones=REPETICIONES, llamadas=1):
+    """Mediana de los segundos por llamada de `funcion`."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / llamadas)
+    return statistics.median(tiempos)
+
+
+# ---------------------------------------------------------------------
+# Crecimiento
+# ---------------------------------------------------------------------
+def medir_crecimiento():
+    import numpy as np
+
+    azar = random.Random(0)
+    puntos = [(azar.uniform(0, 200), azar.uniform(0, 16), azar.uniform(5, 40)) for _ in range(1000)]
+
+    def por_llamada():
+        for agua, luz, temp in puntos:
+            calcular_crecimiento(agua, luz, temp)
+
+    generador = np.random.default_rng(0)
+    agua = generador.uniform(0, 200, 1_000_000)
+    luz = generador.uniform(0, 16, 1_000_000)
+    temp = generador.uniform(5, 40, 1_000_000)
+    return {
+        "crecimiento_por_llamada": medir(por_llamada) / len(puntos),
+        "crecimiento_lote_1m": medir(lambda: calcular_crecimiento_lote(agua, luz, temp)),
+    }
+
+
+# ---------------------------------------------------------------------
+# Guardado
+# ---------------------------------------------------------------------
+def _simulacion(azar, plantas=4):
+    return {
+        "alturas": [azar.randint(0, 40) for _ in range(plantas)],
+        "muertas": [azar.random() < 0.2 for _ in range(plantas)],
+        "condiciones": [{"agua": azar.randint(0, 200), "luz": azar.randint(0, 16),
+                         "temp": azar.randint(5, 40)} for _ in range(plantas)],
+    }
+
+
+def _preparar_historial(carpeta, formato, cantidad):
+    """
+    Arma un historial de `cantidad` simulaciones en la carpeta. Se escribe
+    directo en JSON Lines (mucho más rápido que guardar de a una) y los
+    demás formatos lo importan al usarse por primera vez.
+    """
+    guardado_json.ARCHIVO_DATOS = os.path.join(carpeta, "guardado.json")
+    guardado_json.limpiar_cache()
+    azar = random.Random(cantidad)
+    simulaciones = [dict(_simulacion(azar), numero=n) for n in range(1, cantidad + 1)]
+    if formato == "json":
+        with open(guardado_json.ARCHIVO_DATOS, "w", encoding="utf-8") as f:
+            json.dump(simulaciones, f)
+    else:
+        ruta_jsonl, _ = guardado_json._rutas_jsonl()
+        with open(ruta_jsonl, "wb") as f:
+            f.writelines(guardado_json._linea(s) for s in simulaciones)
+        guardado_json._reconstruir_indice()
+    guardado_json.contar_simulaciones()
+
+
+def medir_guardado(formato="jsonl", tamanos=TAMANOS, todas=True):
+    resultados = {}
+    anterior = guardado_json.ARCHIVO_DATOS, guardado_json.FORMATO
+    guardado_json.FORMATO = formato
+    try:
+        for cantidad in tamanos:
+            with tempfile.TemporaryDirectory() as carpeta:
+                _preparar_historial(carpeta, formato, cantidad)
+                azar = random.Random(1)
+
+                def cargar_todas():
+                    guardado_json.limpiar_cache()
+                    guardado_json.cargar_simulaciones()
+
+                # Las lecturas se miden antes de guardar, con el tamaño exacto
+                if todas:
+                    resultados[f"cargar_todas_{cantidad}"] = medir(cargar_todas, repeticiones=3)
+                resultados[f"cargar_una_{cantidad}"] = medir(
+                    lambda: guardado_json.cargar_simulacion(cantidad // 2 + 1), llamadas=20)
+                resultados[f"contar_{cantidad}"] = medir(guardado_json.contar_simulaciones, llamadas=20)
+                resultados[f"guardar_{cantidad}"] = medir(
+                    lambda: guardado_json.guardar_simulacion(_simulacion(azar)))
+                guardado_json.limpiar_cache()
+    finally:
+        guardado_json.ARCHIVO_DATOS, guardado_json.FORMATO = anterior
+    return resultados
+
+
+def medir_binario(cantidad=TAMANO_BINARIO):
+    """Guardar, cargar una y contar en formato binario con un historial grande."""
+    return {f"binario_{nombre}": tiempo
+            for nombre, tiempo in medir_guardado("binario", [cantidad], todas=False).items()}
+
+
+# ---------------------------------------------------------------------
+# Gráfico
+# ---------------------------------------------------------------------
+class _RaizInmediata:
+    """Reemplaza a la ventana de Tk: after_idle ejecuta en el momento."""
+
+    def after_idle(self, funcion):
+        funcion()
+
+
+def _grafico_agg(plantas):
+    """
+    Arma un objeto con el estado del gráfico del simulador sobre un
+    lienzo Agg, para medir los métodos reales de SimuladorPlantas.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from interfaz import SimuladorPlantas, UMBRAL_HISTOGRAMA
+    from logica import Poblacion
+
+    class GraficoAgg:
+        actualizar_grafico = SimuladorPlantas.actualizar_grafico
+        _redibujar = SimuladorPlantas._redibujar
+        _al_dibujar = SimuladorPlantas._al_dibujar
+        _bordes_histograma = SimuladorPlantas._bordes_histograma
+        _valores_barras = SimuladorPlantas._valores_barras
+        _limite_y = SimuladorPlantas._limite_y
+
+    grafico = GraficoAgg()
+    grafico.root = _RaizInmediata()
+    grafico.poblacion = Poblacion(plantas)
+    grafico.alturas, grafico.muertas = grafico.poblacion.alturas, grafico.poblacion.muertas
+    grafico.fig = Figure(figsize=(7, 5))
+    grafico.ax = grafico.fig.add_subplot()
+    grafico.canvas = FigureCanvasAgg(grafico.fig)
+    grafico.modo_histograma = plantas > UMBRAL_HISTOGRAMA
+    if grafico.modo_histograma:
+        grafico.bordes = grafico._bordes_histograma()
+        grafico.barras = grafico.ax.bar(grafico.bordes[:-1], grafico._valores_barras(),
+                                        width=grafico.bordes[1] - grafico.bordes[0], align="edge")
+    else:
+        grafico.barras = grafico.ax.bar(range(plantas), grafico.alturas)
+    grafico.ax.set_ylim(*grafico._limite_y())
+    for rect in grafico.barras:
+        rect.set_animated(True)
+    grafico.fondo = None
+    grafico.barras_pendientes = set()
+    grafico.redibujo_programado = None
+    grafico.canvas.mpl_connect("draw_event", grafico._al_dibujar)
+    grafico.canvas.draw()
+    return grafico
+
+
+def medir_grafico():
+    resultados = {}
+    for plantas in (4, 1000):
+        grafico = _grafico_agg(plantas)
+
+        def paso():
+            grafico.poblacion.paso(80, 8, 22)
+            grafico.actualizar_grafico()
+
+        resultados[f"grafico_{plantas}_plantas"] = medir(paso, llamadas=10)
+        grafico.fig.clear()
+    return resultados
+
+
+# ---------------------------------------------------------------------
+# Comparación con la referencia
+# ---------------------------------------------------------------------
+def comparar(resultados, referencia, umbral=UMBRAL):
+    """
+    Devuelve [(nombre, actual, referencia)] de las mediciones que superan
+    la referencia por más del umbral. Las que no están en la referencia
+    o son demasiado cortas para medirse con precisión no se comparan.
+    """
+    regresiones = []
+    for nombre, actual in resultados.items():
+        anterior = referencia.get(nombre)
+        if anterior is None or max(actual, anterior) < MINIMO_COMPARABLE:
+            continue
+        if actual > anterior * umbral:
+            regresiones.append((nombre, actual, anterior))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="rendimiento.py",
+        description="Mide el rendimiento del simulador y lo compara con una referencia."
+    )
+    parser.add_argument("-o", "--salida", help="archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument("--referencia", default=ARCHIVO_REFERENCIA, help="archivo JSON de referencia")
+    parser.add_argument("--umbral", type=float, default=UMBRAL,
+                        help=f"factor tolerado sobre la referencia (por defecto {UMBRAL})")
+    parser.add_argument("--formato", default="jsonl", choices=("jsonl", "json", "sqlite", "binario", "fragmentos"),
+                        help="formato de guardado a medir")
+    parser.add_argument("--tamanos", default=",".join(map(str, TAMANOS)),
+                        help="cantidades de simulaciones guardadas, separadas por comas")
+    parser.add_argument("--guardar-referencia", action="store_true",
+                        help="guarda los resultados como nueva referencia")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    resultados.update(medir_crecimiento())
+    resultados.update(medir_guardado(args.formato, [int(t) for t in args.tamanos.split(",")]))
+    if args.formato != "binario":
+        resultados.update(medir_binario())
+    resultados.update(medir_grafico())
+
+    informe = {
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "formato": args.formato,
+        "resultados": resultados,
+    }
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.guardar_referencia:
+        with open(args.referencia, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+        print(f"Referencia guardada en {args.referencia}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.referencia):
+        print("No hay referencia para comparar (usá --guardar-referencia).", file=sys.stderr)
+        return 0
+    with open(args.referencia, "r", encoding="utf-8") as f:
+        referencia = json.load(f)
+    if referencia.get("formato", "jsonl") != args.formato:
+        print("La referencia es de otro formato de guardado; no se compara.", file=sys.stderr)
+        return 0
+
+    regresiones = comparar(resultados, referencia["resultados"], args.umbral)
+    for nombre, actual, anterior in regresiones:
+        print(f"REGRESIÓN {nombre}: {actual * 1e3:.3f} ms (referencia {anterior * 1e3:.3f} ms, "
+              f"×{actual / anterior:.2f})", file=sys.stderr)
+    if not regresiones:
+        print(f"Sin regresiones ({len(resultados)} mediciones, umbral ×{args.umbral}).", file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+# ---------------------------------------------------------------------
+# sensores.py
+# ---------------------------------------------------------------------
+# Simula el crecimiento a partir de registros reales de sensores (un
+# CSV por invernadero, con lecturas por hora o por día), sin tipear las
+# condiciones de a una:
+# - Lee el archivo en bloques de FILAS_POR_BLOQUE filas y los convierte
+#   en arreglos de NumPy (np.loadtxt), así que la memoria no depende del
+#   tamaño del registro. Las lecturas vacías o no numéricas quedan NaN
+# - Agrupa las lecturas por día: agua sumada (ml), luz sumada (horas de
+#   luz de cada lectura) y temperatura promediada (°C). Un registro
+#   diario pasa igual, con una lectura por día
+# - Aplica las reglas de logica.calcular_crecimiento_lote a todos los
+#   días completos del bloque y escribe los resultados a medida que
+#   avanza
+#
+# Columnas del registro: fecha (AAAA-MM-DD, con la hora opcional
+# después), agua, luz y temp, y opcionalmente invernadero para varias
+# series en el mismo archivo. Cada serie es una planta; sus filas deben
+# estar en orden de fecha (pueden intercalarse con las de otras series).
+#
+# Lecturas faltantes: si a una fila le falta el agua (o la luz), la
+# suma del día se escala por filas del día / filas con ese dato, como si
+# la hora faltante hubiera tenido el promedio de las demás; así un hueco
+# no baja el total diario. La temperatura se promedia con las que hay.
+# Un día sin ningún dato de algún factor no se simula. Esas filas, las
+# de fecha inválida o con otra cantidad de columnas y las de días ya
+# simulados se descartan y se cuentan en el resumen.
+#
+# Uso:
+#    python sensores.py registro.csv [--salida resultados.csv] [--especie lechuga]
+# ---------------------------------------------------------------------
+
+import argparse
+import csv
+import itertools
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+from especies import ESPECIE_POR_DEFECTO, MUERTE, ALTURA_INICIAL
+from logica import calcular_crecimiento_lote
+
+# Filas del registro que se leen y procesan juntas
+FILAS_POR_BLOQUE = 65536
+
+COLUMNAS = ("fecha", "agua", "luz", "temp")
+COLUMNA_SERIE = "invernadero"
+
+COLUMNAS_SALIDA = ["invernadero", "fecha", "agua", "luz", "temp",
+                   "crecimiento", "altura", "muerta"]
+
+_SIN_DIA = np.iinfo(np.int64).min
+
+
+# ---------------------------------------------------------------------
+# Lectura por bloques
+# ---------------------------------------------------------------------
+def _tipos(encabezado):
+    """
+    dtype estructurado, columnas a leer y cantidad de columnas del CSV,
+    según el encabezado.
+    """
+    nombres = [c.strip().lower() for c in encabezado.split(",")]
+    faltan = [c for c in COLUMNAS if c not in nombres]
+    if faltan:
+        raise ValueError(f"Faltan columnas en el registro: {', '.join(faltan)}")
+    campos = [("fecha", "U10"), ("agua", "f8"), ("luz", "f8"), ("temp", "f8")]
+    if COLUMNA_SERIE in nombres:
+        campos.append((COLUMNA_SERIE, "U64"))
+    return np.dtype(campos), [nombres.index(nombre) for nombre, _ in campos], len(nombres)
+
+
+def _numero(texto):
+    try:
+        return float(texto)
+    except ValueError:
+        return math.nan
+
+
+def _a_numeros(columna):
+    """Columna de bytes a float: vacíos y valores no numéricos quedan NaN."""
+    columna[columna == b""] = b"nan"
+    try:
+        return columna.astype(np.float64)
+    except ValueError:
+        # Texto como "NA" o "error": solo esta columna se convierte de a uno
+        return np.array([_numero(v) for v in columna.tolist()])
+
+
+def _dia(texto):
+    try:
+        return np.datetime64(texto, "D").astype(np.int64)
+    except ValueError:
+        return _SIN_DIA
+
+
+def _convertir(lineas, tipo, columnas, ancho):
+    """
+    Convierte líneas del CSV en (lecturas, días). Casi siempre alcanza
+    con un np.loadtxt. Si falla, se descartan las filas con otra cantidad
+    de columnas y el bloque se vuelve a leer de una vez con las columnas
+    numéricas como texto, que se convierten con los faltantes como NaN.
+    Una fecha inválida deja el día en _SIN_DIA (NaT).
+    """
+    try:
+        lecturas = np.loadtxt(lineas, delimiter=",", dtype=tipo, usecols=columnas, ndmin=1)
+    except ValueError:
+        lineas = [l for l in lineas if l.count(",") == ancho - 1]
+        # Como bytes: convertirlos a float es varias veces más rápido que desde str
+        texto = np.dtype([(nombre, "S32" if nombre in COLUMNAS[1:] else tipo[nombre])
+                          for nombre in tipo.names])
+        crudas = np.loadtxt(lineas, delimiter=",", dtype=texto, usecols=columnas, ndmin=1)
+        lecturas = np.empty(len(crudas), dtype=tipo)
+        for nombre in tipo.names:
+            lecturas[nombre] = _a_numeros(crudas[nombre]) if nombre in COLUMNAS[1:] else crudas[nombre]
+    try:
+        dias = lecturas["fecha"].astype("datetime64[D]").astype(np.int64)
+    except ValueError:
+        dias = np.array([_dia(f) for f in lecturas["fecha"].tolist()], np.int64)
+    return lecturas, dias
+
+
+def leer_bloques(ruta, filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Genera el registro en bloques (lecturas, dias, descartadas): lecturas
+    es un arreglo estructurado con agua, luz, temp (NaN si falta la
+    lectura) y, si está, invernadero; dias es el día de cada lectura
+    (días desde 1970-01-01); descartadas cuenta las filas que no se
+    pudieron leer o no tenían una fecha válida.
+    """
+    with open(ruta, "r", encoding="utf-8") as f:
+        tipo, columnas, ancho = _tipos(f.readline())
+        while True:
+            lineas = list(itertools.islice(f, filas_por_bloque))
+            if not lineas:
+                return
+            lecturas, dias = _convertir(lineas, tipo, columnas, ancho)
+            validas = dias != _SIN_DIA
+            if not validas.all():
+                lecturas, dias = lecturas[validas], dias[validas]
+            leidas = len(lineas)
+            if len(lecturas) < leidas:
+                # np.loadtxt saltea las líneas vacías: no cuentan como descartadas
+                leidas -= sum(1 for l in lineas if not l.strip())
+            yield lecturas, dias, leidas - len(lecturas)
+
+
+# ---------------------------------------------------------------------
+# Agregación por día
+# ---------------------------------------------------------------------
+class AgregadorDiario:
+    """
+    Suma las lecturas de cada (serie, día) a lo largo de los bloques. El
+    último día de cada serie se guarda hasta ver uno posterior, porque
+    sus lecturas pueden seguir en el bloque siguiente.
+    """
+
+    def __init__(self):
+        # Días en curso: serie, día, sumas de agua, luz y temp, filas y
+        # filas con dato de agua, luz y temp
+        self.pendiente = ((np.empty(0, np.int64),) * 2 + (np.empty(0),) * 3
+                          + (np.empty(0, np.int64),) * 4)
+        self.ultimo_emitido = np.empty(0, np.int64)
+        self.desordenadas = 0
+        self.sin_datos = 0
+
+    def agregar(self, series, dias, agua, luz, temp, final=False):
+        """
+        Incorpora un bloque y devuelve los días completos, ordenados por
+        serie y fecha: (serie, dia, agua, luz, temp). Los NaN son
+        lecturas faltantes (ver el encabezado del módulo). Con final=True
+        devuelve también los días en curso.
+        """
+        if len(series):
+            faltan = series.max() + 1 - len(self.ultimo_emitido)
+            if faltan > 0:
+                self.ultimo_emitido = np.concatenate([self.ultimo_emitido, np.full(faltan, _SIN_DIA)])
+            # Días que ya se simularon: el registro no estaba en orden
+            vigentes = dias > self.ultimo_emitido[series]
+            self.desordenadas += int(len(dias) - vigentes.sum())
+            series, dias, agua, luz, temp = (c[vigentes] for c in (series, dias, agua, luz, temp))
+
+        pendiente = self.pendiente
+        serie = np.concatenate([pendiente[0], series])
+        dia = np.concatenate([pendiente[1], dias])
+        if not len(serie):
+            return pendiente[:5]
+
+        # Una clave por (serie, día); np.unique la deja ordenada
+        clave = (serie << 32) + (dia - dia.min())
+        claves, grupo = np.unique(clave, return_inverse=True)
+        g_serie = claves >> 32
+        g_dia = (claves & 0xFFFFFFFF) + dia.min()
+        sumas, cuentas = [], [np.bincount(grupo, np.concatenate([pendiente[5], np.ones(len(dias), np.int64)]),
+                                          len(claves))]
+        for i, valores in enumerate((agua, luz, temp)):
+            con_dato = ~np.isnan(valores)
+            sumas.append(np.bincount(grupo, np.concatenate([pendiente[2 + i], np.where(con_dato, valores, 0)]),
+                                     len(claves)))
+            cuentas.append(np.bincount(grupo, np.concatenate([pendiente[6 + i], con_dato]), len(claves)))
+
+        # El último día de cada serie queda pendiente (salvo al final)
+        ultimo = np.r_[g_serie[1:] != g_serie[:-1], True]
+        listo = np.ones(len(claves), bool) if final else ~ultimo
+        en_curso = ~listo
+        self.pendiente = (g_serie[en_curso], g_dia[en_curso], *(c[en_curso] for c in sumas),
+                          *(c[en_curso] for c in cuentas))
+        self.ultimo_emitido[g_serie[listo]] = g_dia[listo]
+
+        # Días sin ningún dato de algún factor: no se simulan
+        filas, con_agua, con_luz, con_temp = cuentas
+        completo = listo & (con_agua > 0) & (con_luz > 0) & (con_temp > 0)
+        self.sin_datos += int(filas[listo & ~completo].sum())
+        filas, con_agua, con_luz, con_temp = (c[completo] for c in cuentas)
+        g_agua, g_luz, g_temp = (c[completo] for c in sumas)
+        return (g_serie[completo], g_dia[completo], g_agua * filas / con_agua,
+                g_luz * filas / con_luz, g_temp / con_temp)
+
+
+# ---------------------------------------------------------------------
+# Crecimiento por bloque
+# ---------------------------------------------------------------------
+class EstadoSeries:
+    """Altura y estado de cada serie (una planta por serie) entre bloques."""
+
+    def __init__(self, altura_inicial=ALTURA_INICIAL, especie=ESPECIE_POR_DEFECTO):
+        self.altura_inicial = altura_inicial
+        self.especie = especie
+        self.alturas = np.empty(0)
+        self.muertas = np.empty(0, bool)
+
+    def aplicar(self, serie, agua, luz, temp):
+        """
+        Avanza un paso por cada día, con las reglas de paso_planta, para
+        días ordenados por serie y fecha. Las sumas acumuladas se hacen
+        por serie, así que no hay un bucle de Python por día.
+        Devuelve (crecimiento, alturas, muertas, ya_muertas) de cada día;
+        ya_muertas indica las plantas que estaban muertas antes del paso.
+        """
+        faltan = (serie.max() + 1 - len(self.alturas)) if len(serie) else 0
+        if faltan > 0:
+            self.alturas = np.concatenate([self.alturas, np.full(faltan, float(self.altura_inicial))])
+            self.muertas = np.concatenate([self.muertas, np.zeros(faltan, bool)])
+        if not len(serie):
+            return (np.empty(0, np.int32), np.empty(0), np.empty(0, bool), np.empty(0, bool))
+
+        crecimiento = calcular_crecimiento_lote(agua, luz, temp, self.especie)
+        inicio = np.flatnonzero(np.r_[True, serie[1:] != serie[:-1]])
+        grupo = np.repeat(np.arange(len(inicio)), np.diff(np.r_[inicio, len(serie)]))
+
+        def acumular_por_serie(valores):
+            acumulado = np.cumsum(valores)
+            return acumulado - (acumulado - valores)[inicio][grupo]
+
+        efectivo = np.where(crecimiento == MUERTE, 0, crecimiento).astype(np.float64)
+        alturas = self.alturas[serie] + acumular_por_serie(efectivo)
+        evento = (crecimiento == MUERTE) | (alturas <= 0) | self.muertas[serie]
+        muertas = acumular_por_serie(evento.astype(np.int64)) > 0
+        ya_muertas = np.r_[False, muertas[:-1]]
+        ya_muertas[inicio] = self.muertas[serie[inicio]]
+        alturas[muertas] = 0
+
+        fin = np.r_[inicio[1:], len(serie)] - 1
+        self.alturas[serie[fin]] = alturas[fin]
+        self.muertas[serie[fin]] = muertas[fin]
+        return crecimiento, alturas, muertas, ya_muertas
+
+
+# ---------------------------------------------------------------------
+# Registro completo
+# ---------------------------------------------------------------------
+def procesar(ruta, salida, especie=ESPECIE_POR_DEFECTO, altura_inicial=ALTURA_INICIAL,
+             filas_por_bloque=FILAS_POR_BLOQUE):
+    """
+    Simula un registro de sensores y escribe un CSV con un paso por día y
+    serie en `salida` (un archivo de texto abierto), bloque por bloque.
+    Devuelve un resumen con las filas leídas y descartadas, los días
+    simulados y el estado final de cada serie.
+    """
+    nombre_por_defecto = os.path.splitext(os.path.basename(ruta))[0]
+    ids = {}
+    agregador = AgregadorDiario()
+    estado = EstadoSeries(altura_inicial, especie)
+    escritor = csv.writer(salida)
+    escritor.writerow(COLUMNAS_SALIDA)
+    filas = descartadas = dias = 0
+
+    def simular(dias_completos):
+        serie, dia, agua, luz, temp = dias_completos
+        crecimiento, alturas, muertas, ya_muertas = estado.aplicar(serie, agua, luz, temp)
+        crecimiento = np.where(ya_muertas, None, crecimiento)
+        fechas = dia.astype("datetime64[D]").astype(str)
+        escritor.writerows(zip(np.array(list(ids), dtype=object)[serie], fechas, agua.round(3).tolist(),
+                               luz.round(3).tolist(), temp.round(3).tolist(), crecimiento.tolist(),
+                               alturas.tolist(), muertas.tolist()))
+        return len(serie)
+
+    for lecturas, dias_lectura, fallidas in leer_bloques(ruta, filas_por_bloque):
+        filas += len(lecturas) + fallidas
+        descartadas += fallidas
+        # Cada nombre de serie recibe un número (un diccionario es mucho
+        # más rápido que np.unique sobre cadenas)
+        if COLUMNA_SERIE in lecturas.dtype.names:
+            series = np.fromiter((ids.setdefault(n, len(ids)) for n in lecturas[COLUMNA_SERIE].tolist()),
+                                 np.int64, len(lecturas))
+        else:
+            series = np.full(len(lecturas), ids.setdefault(nombre_por_defecto, len(ids)), np.int64)
+        dias += simular(agregador.agregar(series, dias_lectura, lecturas["agua"],
+                                          lecturas["luz"], lecturas["temp"]))
+    vacio = np.empty(0)
+    dias += simular(agregador.agregar(np.empty(0, np.int64), np.empty(0, np.int64),
+                                      vacio, vacio, vacio, final=True))
+
+    return {
+        "filas": filas,
+        "descartadas": descartadas + agregador.desordenadas + agregador.sin_datos,
+        "dias": dias,
+        "series": {nombre: {"altura": float(estado.alturas[i]), "muerta": bool(estado.muertas[i])}
+                   for i, nombre in enumerate(ids)},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="sensores.py",
+        description="Simula el crecimiento a partir de registros de sensores (CSV por hora o por día)."
+    )
+    parser.add_argument("registro", help="CSV con fecha, agua, luz, temp y opcionalmente invernadero")
+    parser.add_argument("-o", "--salida", help="archivo CSV de resultados (por defecto, salida estándar)")
+    parser.add_argument("--especie", default=ESPECIE_POR_DEFECTO, help="especie simulada")
+    parser.add_argument("--altura", type=float, default=ALTURA_INICIAL, help="altura inicial (cm)")
+    parser.add_argument("--filas-por-bloque", type=int, default=FILAS_POR_BLOQUE,
+                        help=f"filas leídas por bloque (por defecto {FILAS_POR_BLOQUE})")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    salida = open(args.salida, "w", encoding="utf-8", newline="") if args.salida else sys.stdout
+    try:
+        resumen = procesar(args.registro, salida, args.especie, args.altura, args.filas_por_bloque)
+    except (OSError, ValueError) as error:
+        print(f"{args.registro}: no se pudo procesar ({error})", file=sys.stderr)
+        return 1
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    vivas = sum(not s["muerta"] for s in resumen["series"].values())
+    print(f"Filas: {resumen['filas']} | descartadas: {resumen['descartadas']} | "
+          f"días simulados: {resumen['dias']} | series: {len(resumen['series'])} "
+          f"({vivas} vivas) | tiempo: {time.perf_counter() - inicio:.3f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
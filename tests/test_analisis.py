@@ -0,0 +1,58 @@
+# ------------------------------------------------------------
+# tests/test_analisis.py
+# ------------------------------------------------------------
+# Pruebas de las estadísticas sobre las simulaciones guardadas.
+# ------------------------------------------------------------
+
+import pytest
+import guardado_json
+from analisis import nombre_banda, resumir
+
+
+@pytest.fixture
+def archivo(tmp_path, monkeypatch):
+    """Redirige el guardado a una carpeta temporal."""
+    ruta = tmp_path / "data" / "guardado.json"
+    monkeypatch.setattr(guardado_json, "ARCHIVO_DATOS", str(ruta))
+    monkeypatch.setattr(guardado_json, "FORMATO", "jsonl")
+    return ruta
+
+
+def simulacion(alturas, muertas, agua):
+    return {"alturas": alturas, "muertas": muertas,
+            "condiciones": [{"agua": a, "luz": 8, "temp": 22} for a in agua]}
+
+
+# --- 1. Nombres de las bandas ---
+def test_nombre_banda():
+    nombres = [nombre_banda(i, 2) for i in range(7)]
+    assert nombres == ["fuera (bajo)", "bajo 2", "bajo 1", "ideal", "alto 1", "alto 2", "fuera (alto)"]
+
+
+# --- 2. Estadísticas en una pasada, en todos los formatos ---
+@pytest.mark.parametrize("formato", ["jsonl", "json", "sqlite", "binario"])
+def test_resumir_guardadas(archivo, monkeypatch, formato):
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    guardado_json.guardar_simulacion(simulacion([4, 0], [False, True], [80, 200]))
+    guardado_json.guardar_simulacion(simulacion([6, 8, 10], [False, False, False], [80, 120, 145]))
+
+    resumen = resumir()
+    assert resumen["simulaciones"] == 2
+    assert resumen["plantas"] == 5 and resumen["vivas"] == 4
+    assert resumen["supervivencia_por_posicion"] == [1.0, 0.5, 1.0]
+    assert resumen["altura_media"] == pytest.approx(28 / 5)
+    assert resumen["altura_media_vivas"] == pytest.approx(7)
+
+    agua = resumen["bandas"]["agua"]
+    assert list(agua) == ["ideal", "alto 1", "alto 2", "fuera (alto)"]
+    assert agua["ideal"] == {"plantas": 2, "muertas": 0}
+    assert agua["alto 1"] == {"plantas": 1, "muertas": 0}
+    assert agua["alto 2"] == {"plantas": 1, "muertas": 0}
+    assert agua["fuera (alto)"] == {"plantas": 1, "muertas": 1}
+    assert resumen["bandas"]["luz"] == {"ideal": {"plantas": 5, "muertas": 1}}
+
+
+# --- 3. Se consume un generador sin armar la lista ---
+def test_resumir_generador_vacio():
+    resumen = resumir(iter(()))
+    assert resumen["simulaciones"] == 0 and resumen["supervivencia"] == 0.0
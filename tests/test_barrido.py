@@ -0,0 +1,92 @@
+# ------------------------------------------------------------
+# tests/test_barrido.py
+# ------------------------------------------------------------
+# Pruebas del barrido de parámetros y del Monte Carlo paralelo.
+# ------------------------------------------------------------
+
+import numpy as np
+import pytest
+from barrido import barrer
+from logica import calcular_crecimiento, MUERTE
+
+AGUA = np.linspace(0, 200, 21)
+LUZ = np.linspace(0, 16, 9)
+TEMP = np.linspace(10, 36, 14)
+
+
+# --- 1. Barrido exacto igual a la función escalar ---
+def test_barrido_exacto_coincide_con_escalar():
+    """Sin ruido, cada punto sobrevive (1.0) o no (0.0) según calcular_crecimiento."""
+    mapas = barrer(AGUA, LUZ, TEMP, trabajadores=1, tamano_bloque=100)
+    for i, a in enumerate(AGUA):
+        for j, l in enumerate(LUZ):
+            for k, t in enumerate(TEMP):
+                esperado = calcular_crecimiento(a, l, t)
+                if esperado == MUERTE:
+                    assert mapas["supervivencia"][i, j, k] == 0
+                    assert np.isnan(mapas["crecimiento_medio"][i, j, k])
+                else:
+                    assert mapas["supervivencia"][i, j, k] == 1
+                    assert mapas["crecimiento_medio"][i, j, k] == esperado
+
+
+# --- 2. El pool de procesos da lo mismo que un solo proceso ---
+def test_monte_carlo_paralelo_reproducible():
+    """Con la misma semilla, el resultado no depende de la cantidad de procesos."""
+    args = dict(muestras=5, ruido=(10, 1, 1), semilla=7, tamano_bloque=200)
+    uno = barrer(AGUA, LUZ, TEMP, trabajadores=1, **args)
+    varios = barrer(AGUA, LUZ, TEMP, trabajadores=2, **args)
+    np.testing.assert_array_equal(uno["supervivencia"], varios["supervivencia"])
+    np.testing.assert_array_equal(uno["crecimiento_medio"], varios["crecimiento_medio"])
+
+
+# --- 3. Retomar un barrido desde el archivo de progreso ---
+def test_retomar_barrido(tmp_path, monkeypatch):
+    """Los bloques ya hechos no se recalculan al retomar."""
+    import barrido
+
+    archivo = str(tmp_path / "progreso.npz")
+    completo = barrer(AGUA, LUZ, TEMP, trabajadores=1, tamano_bloque=100, archivo_progreso=archivo)
+
+    # Con todos los bloques marcados como hechos, no se evalúa ninguno
+    def no_llamar(*args):
+        raise AssertionError("no debería recalcular")
+    monkeypatch.setattr(barrido, "_evaluar_bloque", no_llamar)
+    retomado = barrer(AGUA, LUZ, TEMP, trabajadores=1, tamano_bloque=100, archivo_progreso=archivo)
+    np.testing.assert_array_equal(completo["supervivencia"], retomado["supervivencia"])
+
+
+# --- 4. Retomar un barrido Monte Carlo cortado a mitad de camino ---
+def test_retomar_barrido_interrumpido(tmp_path, monkeypatch):
+    """Lo retomado da lo mismo que un barrido sin cortes, sin repetir bloques guardados."""
+    import barrido
+
+    args = dict(muestras=3, ruido=(15, 2, 2), semilla=11, trabajadores=1, tamano_bloque=50)
+    bloques = -(-len(AGUA) * len(LUZ) * len(TEMP) // 50)
+    sin_cortes = barrer(AGUA, LUZ, TEMP, **args)
+
+    archivo = str(tmp_path / "progreso.npz")
+    original = barrido._evaluar_bloque
+    evaluados = []
+
+    def cortar_en(limite):
+        def evaluar(*a):
+            if len(evaluados) == limite:
+                raise KeyboardInterrupt
+            evaluados.append(a[1])
+            return original(*a)
+        return evaluar
+
+    # Se corta después de dos guardados de progreso (bloques 16 y 32) y antes del tercero
+    monkeypatch.setattr(barrido, "_evaluar_bloque", cortar_en(2 * barrido.GUARDAR_CADA + 5))
+    with pytest.raises(KeyboardInterrupt):
+        barrer(AGUA, LUZ, TEMP, archivo_progreso=archivo, **args)
+    with np.load(archivo) as progreso:
+        assert progreso["hecho"].sum() == 2 * barrido.GUARDAR_CADA
+
+    evaluados.clear()
+    monkeypatch.setattr(barrido, "_evaluar_bloque", cortar_en(None))
+    retomado = barrer(AGUA, LUZ, TEMP, archivo_progreso=archivo, **args)
+    assert len(evaluados) == bloques - 2 * barrido.GUARDAR_CADA
+    np.testing.assert_array_equal(sin_cortes["supervivencia"], retomado["supervivencia"])
+    np.testing.assert_array_equal(sin_cortes["crecimiento_medio"], retomado["crecimiento_medio"])
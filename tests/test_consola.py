@@ -0,0 +1,67 @@
+# ------------------------------------------------------------
+# tests/test_consola.py
+# ------------------------------------------------------------
+# Pruebas del modo de línea de comandos (sin interfaz gráfica).
+# ------------------------------------------------------------
+
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+from consola import main
+from logica import MUERTE
+
+
+# --- 1. CSV y JSON producen una fila de resultado por escenario ---
+def test_consola_csv_y_json(tmp_path, capsys):
+    """Cada escenario se simula y el resumen va a la salida de errores."""
+    escenarios_csv = tmp_path / "escenarios.csv"
+    escenarios_csv.write_text("agua,luz,temp,altura\n80,8,22,3\n300,8,22,5\n", encoding="utf-8")
+    escenarios_json = tmp_path / "guardada.json"
+    escenarios_json.write_text(json.dumps({
+        "alturas": [4, 7],
+        "condiciones": [{"agua": 60, "luz": 5, "temp": 19}, {"agua": 80, "luz": 8, "temp": 22}]
+    }), encoding="utf-8")
+    salida = tmp_path / "resultados.csv"
+
+    assert main([str(escenarios_csv), str(escenarios_json), "-o", str(salida)]) == 0
+
+    with open(salida, encoding="utf-8", newline="") as f:
+        filas = list(csv.DictReader(f))
+    assert [float(f["altura_final"]) for f in filas] == [9, 0, 7, 13]
+    assert [f["crecimiento"] for f in filas] == ["6", str(MUERTE), "3", "6"]
+    assert "muertas: 1" in capsys.readouterr().err
+
+
+# --- 2. Escenarios no válidos ---
+def test_consola_escenario_no_valido(tmp_path, capsys):
+    """Una fila mal escrita se informa y el código de salida es 1."""
+    escenarios = tmp_path / "escenarios.csv"
+    escenarios.write_text("agua,luz,temp\nmucha,8,22\n80,8,22\n", encoding="utf-8")
+    assert main([str(escenarios)]) == 1
+    salida = capsys.readouterr()
+    assert "no válido" in salida.err
+    assert len(salida.out.strip().splitlines()) == 2
+
+
+# --- 3. El modo consola no carga la interfaz gráfica ---
+def test_consola_sin_interfaz():
+    """Importar consola no debe importar tkinter ni matplotlib."""
+    codigo = "import consola, sys; print('tkinter' in sys.modules or 'matplotlib' in sys.modules)"
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                               cwd=Path(__file__).parent.parent)
+    assert resultado.stdout.strip() == "False"
+
+
+# --- 4. Altura 0 del escenario y altura por defecto ---
+def test_consola_altura_cero():
+    """Una altura 0 se respeta; solo falta la altura si no está o la celda está vacía."""
+    from consola import simular_escenario
+    from especies import ALTURA_INICIAL
+
+    condiciones = {"agua": 80, "luz": 8, "temp": 22}
+    assert simular_escenario(dict(condiciones, altura=0))["altura"] == 0
+    assert simular_escenario(dict(condiciones, altura=0.0))["altura_final"] == 6
+    assert simular_escenario(dict(condiciones, altura=""))["altura"] == ALTURA_INICIAL
+    assert simular_escenario(condiciones)["altura"] == ALTURA_INICIAL
@@ -0,0 +1,76 @@
+# ------------------------------------------------------------
+# tests/test_especies.py
+# ------------------------------------------------------------
+# Pruebas de los perfiles de especies compilados en tablas de
+# umbrales y de su uso en el cálculo de crecimiento.
+# ------------------------------------------------------------
+
+import pytest
+from especies import (compilar_factor, evaluar_tabla, registrar_especie, PERFIL_TOMATE, MUERTE,
+                      MAX_BYTES_NOMBRE, TABLAS, PERFILES)
+from logica import calcular_crecimiento, calcular_crecimiento_lote, Poblacion
+
+
+# --- 1. La tabla respeta los bordes abiertos y cerrados de cada banda ---
+def test_tabla_bordes_del_agua():
+    """70 y 90 son ideales; 20 y 140 están en tolerancia; 10 y 150 cercanos."""
+    tabla = compilar_factor(PERFIL_TOMATE["agua"])
+    esperado = {9.9: MUERTE, 10: 1, 19.9: 1, 20: 3, 69.9: 3, 70: 6,
+                90: 6, 90.1: 3, 140: 3, 140.1: 1, 150: 1, 150.1: MUERTE}
+    for valor, crecimiento in esperado.items():
+        assert evaluar_tabla(tabla, valor) == crecimiento
+
+
+# --- 2. Bandas adicionales en un perfil nuevo ---
+def test_especie_con_bandas_extra(monkeypatch):
+    """Un perfil con más bandas se evalúa igual en la versión escalar y por lotes."""
+    factor = {"ideal": [10, 20], "crecimiento": 8, "bandas": [[5, 4], [5, 2], [5, 1]]}
+    # Al terminar, "prueba" se quita de los registros globales
+    monkeypatch.setitem(PERFILES, "prueba", None)
+    monkeypatch.setitem(TABLAS, "prueba", None)
+    registrar_especie("prueba", {"agua": factor, "luz": factor, "temp": factor})
+
+    assert calcular_crecimiento(15, 15, 15, especie="prueba") == 8
+    assert calcular_crecimiento(15, 3, 15, especie="prueba") == 2
+    assert calcular_crecimiento(15, 15, 36, especie="prueba") == MUERTE
+
+    valores = [-6, -5, 0, 5, 9, 10, 20, 21, 25, 30, 35, 36]
+    lote = calcular_crecimiento_lote(valores, [15] * len(valores), [15] * len(valores), especie="prueba")
+    assert lote.tolist() == [calcular_crecimiento(v, 15, 15, especie="prueba") for v in valores]
+
+
+# --- 3. Poblaciones mixtas ---
+def test_lote_con_especies_mezcladas():
+    """Cada planta se evalúa con la tabla de su propia especie."""
+    agua, luz, temp = [80, 80, 80], [8, 8, 8], [22, 22, 22]
+    especies = ["tomate", "lechuga", "tomate"]
+    lote = calcular_crecimiento_lote(agua, luz, temp, especie=especies)
+    assert lote.tolist() == [calcular_crecimiento(a, l, t, especie=e)
+                             for a, l, t, e in zip(agua, luz, temp, especies)]
+
+
+# --- 4. Especie desconocida ---
+def test_especie_desconocida():
+    """Pedir una especie sin perfil es un error."""
+    with pytest.raises(KeyError):
+        calcular_crecimiento(80, 8, 22, especie="no_existe")
+
+
+# --- 5. Nombres que no entran en el encabezado binario ---
+def test_nombre_de_especie_largo():
+    """Un nombre de más de MAX_BYTES_NOMBRE bytes se rechaza en vez de cortarse."""
+    largo = "ñ" * (MAX_BYTES_NOMBRE // 2 + 1)
+    with pytest.raises(ValueError):
+        registrar_especie(largo, PERFIL_TOMATE)
+    assert largo not in TABLAS
+    with pytest.raises(ValueError):
+        Poblacion(2, especie=largo).a_bytes()
+
+    justo = "ñ" * (MAX_BYTES_NOMBRE // 2)
+    assert Poblacion.desde_bytes(Poblacion(2, especie=justo).a_bytes()).especie == justo
+
+
+# --- 6. Las especies de prueba no quedan registradas ---
+def test_especie_de_prueba_no_queda():
+    """Corre después de la 2: "prueba" ya no está en los registros."""
+    assert "prueba" not in PERFILES and "prueba" not in TABLAS
@@ -0,0 +1,34 @@
+# ------------------------------------------------------------
+# tests/test_exportar.py
+# ------------------------------------------------------------
+# Pruebas de la exportación a PNG y PDF sin interfaz gráfica.
+# ------------------------------------------------------------
+
+import pytest
+from exportar import exportar
+
+
+def simulaciones(cantidad, plantas=4):
+    return [{"numero": n, "alturas": [3 + n] * plantas, "muertas": [False] * (plantas - 1) + [True],
+             "condiciones": [{"agua": 80, "luz": 8, "temp": 22}] * plantas}
+            for n in range(1, cantidad + 1)]
+
+
+# --- 1. Un PNG por simulación, en varios procesos ---
+@pytest.mark.parametrize("trabajadores", [1, 2])
+def test_exportar_png(tmp_path, trabajadores):
+    carpeta = tmp_path / "png"
+    assert exportar(str(carpeta), simulaciones(5), trabajadores=trabajadores) == 5
+    archivos = sorted(p.name for p in carpeta.iterdir())
+    assert archivos == [f"simulacion_{n:05d}.png" for n in range(1, 6)]
+    assert (carpeta / archivos[0]).read_bytes().startswith(b"\x89PNG")
+
+
+# --- 2. PDF de varias páginas, también con poblaciones grandes ---
+def test_exportar_pdf(tmp_path):
+    destino = tmp_path / "simulaciones.pdf"
+    datos = simulaciones(3) + simulaciones(1, plantas=200)
+    assert exportar(str(destino), datos, trabajadores=2, dpi=40) == 4
+    contenido = destino.read_bytes()
+    assert contenido.startswith(b"%PDF")
+    assert contenido.count(b"/Type /Page") - contenido.count(b"/Type /Pages") == 4
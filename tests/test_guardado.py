@@ -0,0 +1,332 @@
+# ------------------------------------------------------------
+# tests/test_guardado.py
+# ------------------------------------------------------------
+# Pruebas del guardado de simulaciones: formato de solo agregar
+# (JSON Lines + índice), migración del guardado.json original y
+# lectura de una simulación suelta.
+# ------------------------------------------------------------
+
+import json
+import pytest
+import guardado_json
+
+
+@pytest.fixture
+def archivo(tmp_path, monkeypatch):
+    """Redirige el guardado a una carpeta temporal."""
+    ruta = tmp_path / "data" / "guardado.json"
+    monkeypatch.setattr(guardado_json, "ARCHIVO_DATOS", str(ruta))
+    monkeypatch.setattr(guardado_json, "FORMATO", "jsonl")
+    return ruta
+
+
+def simulacion(altura):
+    return {"alturas": [altura] * 4, "muertas": [False] * 4,
+            "condiciones": [{"agua": 80, "luz": 8, "temp": 22}] * 4}
+
+
+# --- 1. Guardar y cargar en el formato de solo agregar ---
+def test_guardar_y_cargar(archivo):
+    """Cada guardado recibe un número consecutivo y se puede leer solo."""
+    for altura in (3, 5, 7):
+        guardado_json.guardar_simulacion(simulacion(altura))
+
+    todas = guardado_json.cargar_simulaciones()
+    assert [s["numero"] for s in todas] == [1, 2, 3]
+    assert guardado_json.contar_simulaciones() == 3
+    assert guardado_json.cargar_simulacion(2)["alturas"] == [5] * 4
+    assert guardado_json.cargar_simulacion(4) is None
+
+
+# --- 2. Migración automática del guardado.json original ---
+def test_migracion_desde_json(archivo):
+    """Un guardado.json existente se convierte y se sigue numerando."""
+    archivo.parent.mkdir(parents=True)
+    archivo.write_text(json.dumps([simulacion(3), simulacion(4)], indent=4), encoding="utf-8")
+
+    assert guardado_json.guardar_simulacion(simulacion(9)) == 3
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [3, 4, 9]
+    assert not archivo.exists()
+
+
+# --- 3. Recuperación de un guardado interrumpido ---
+def test_indice_se_reconstruye(archivo):
+    """Una línea incompleta al final se descarta y el índice se rehace."""
+    guardado_json.guardar_simulacion(simulacion(3))
+    ruta_jsonl, _ = guardado_json._rutas_jsonl()
+    with open(ruta_jsonl, "ab") as f:
+        f.write(b'{"alturas":[1,')
+
+    assert guardado_json.guardar_simulacion(simulacion(6)) == 2
+    assert guardado_json.cargar_simulacion(2)["alturas"] == [6] * 4
+    assert len(guardado_json.cargar_simulaciones()) == 2
+
+
+# --- 4. Formato original y exportación ---
+def test_formato_json_y_exportar(archivo, monkeypatch, tmp_path):
+    """El formato "json" sigue funcionando y exportar_json produce una lista."""
+    monkeypatch.setattr(guardado_json, "FORMATO", "json")
+    guardado_json.guardar_simulacion(simulacion(3))
+    guardado_json.guardar_simulacion(simulacion(4))
+    destino = tmp_path / "exportado.json"
+    guardado_json.exportar_json(str(destino))
+    assert [s["numero"] for s in json.loads(destino.read_text(encoding="utf-8"))] == [1, 2]
+    guardado_json.reiniciar_guardado()
+    assert guardado_json.cargar_simulaciones() == []
+
+
+# --- 5. Almacenamiento SQLite con páginas y filtros ---
+@pytest.mark.parametrize("formato", ["sqlite", "jsonl", "json", "binario", "fragmentos"])
+def test_listar_y_buscar(archivo, monkeypatch, formato):
+    """Todos los formatos responden igual a páginas, números y filtros."""
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    for n in range(1, 8):
+        sim = simulacion(n)
+        if n % 3 == 0:
+            sim["muertas"] = [False, True, False, False]
+            sim["condiciones"] = [{"agua": 80, "luz": 8, "temp": 22},
+                                  {"agua": 150, "luz": 8, "temp": 22},
+                                  {"agua": 80, "luz": 8, "temp": 22},
+                                  {"agua": 80, "luz": 8, "temp": 22}]
+        guardado_json.guardar_simulacion(sim)
+
+    assert guardado_json.contar_simulaciones() == 7
+    assert [s["numero"] for s in guardado_json.listar_simulaciones(2, 3)] == [3, 4, 5]
+    assert guardado_json.cargar_simulacion(6)["muertas"] == [False, True, False, False]
+
+    muertas_con_agua = guardado_json.buscar_simulaciones([("muerta", "=", True), ("agua", ">", 140)])
+    assert [s["numero"] for s in muertas_con_agua] == [3, 6]
+    assert guardado_json.buscar_simulaciones([("muerta", "=", True), ("agua", "<", 100)]) == []
+
+
+# --- 6. Importación del historial al pasar a SQLite ---
+def test_sqlite_importa_historial(archivo, monkeypatch):
+    """Al activar SQLite por primera vez se importan las simulaciones existentes."""
+    guardado_json.guardar_simulacion(simulacion(3))
+    guardado_json.guardar_simulacion(simulacion(4))
+    monkeypatch.setattr(guardado_json, "FORMATO", "sqlite")
+    assert guardado_json.guardar_simulacion(simulacion(5)) == 3
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [3, 4, 5]
+
+
+# --- 7. Guardado en segundo plano ---
+def test_escritor_agrupa_y_reporta(archivo):
+    """Los guardados con la misma clave que esperan se agrupan en uno solo."""
+    import threading
+
+    empezo, liberar = threading.Event(), threading.Event()
+    guardados = []
+
+    def guardar_lento(sim):
+        empezo.set()
+        liberar.wait(5)
+        guardados.append(sim["alturas"][0])
+        if sim["alturas"][0] == 0:
+            raise OSError("disco lleno")
+        return len(guardados)
+
+    escritor = guardado_json.EscritorEnSegundoPlano(guardar_lento, max_pendientes=2)
+    assert escritor.encolar(simulacion(1), clave="a")
+    assert empezo.wait(5)
+    # Mientras se escribe el primero, los siguientes de "a" se agrupan
+    assert escritor.encolar(simulacion(2), clave="a")
+    assert escritor.encolar(simulacion(3), clave="a")
+    assert escritor.encolar(simulacion(0), clave="b")
+    assert not escritor.encolar(simulacion(9), clave="c")
+
+    liberar.set()
+    escritor.detener()
+    assert guardados == [1, 3, 0]
+    resultados = [escritor.resultados.get_nowait() for _ in range(3)]
+    assert [r[:2] for r in resultados[:2]] == [("a", 1), ("a", 2)]
+    assert isinstance(resultados[2][2], OSError)
+
+
+# --- 8. Escritura atómica ---
+def test_guardado_json_atomico(archivo, monkeypatch):
+    """Si la escritura falla, el guardado.json anterior queda intacto."""
+    monkeypatch.setattr(guardado_json, "FORMATO", "json")
+    guardado_json.guardar_simulacion(simulacion(3))
+    contenido = archivo.read_bytes()
+
+    def falla(*args, **kwargs):
+        raise OSError("corte de luz")
+    monkeypatch.setattr(guardado_json.os, "replace", falla)
+    with pytest.raises(OSError):
+        guardado_json.guardar_simulacion(simulacion(4))
+    assert archivo.read_bytes() == contenido
+    assert [p.name for p in archivo.parent.iterdir()] == [archivo.name]
+
+
+# --- 9. Caché validada por fecha de modificación y tamaño ---
+@pytest.mark.parametrize("formato", ["jsonl", "json"])
+def test_cache_de_cargar_simulaciones(archivo, monkeypatch, formato):
+    """Sin cambios en el archivo no se vuelve a parsear; los cambios se detectan."""
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    guardado_json.limpiar_cache()
+    guardado_json.guardar_simulacion(simulacion(3))
+    assert len(guardado_json.cargar_simulaciones()) == 1
+
+    lecturas = []
+    original = guardado_json.json.load, guardado_json.json.loads
+    monkeypatch.setattr(guardado_json.json, "load", lambda *a, **k: lecturas.append(1) or original[0](*a, **k))
+    monkeypatch.setattr(guardado_json.json, "loads", lambda *a, **k: lecturas.append(1) or original[1](*a, **k))
+
+    assert len(guardado_json.cargar_simulaciones()) == 1
+    assert lecturas == []
+
+    # Un guardado propio se ve en la siguiente lectura
+    guardado_json.guardar_simulacion(simulacion(4))
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [3, 4]
+
+    # Un cambio hecho por otro programa también
+    ruta = guardado_json._rutas_jsonl()[0] if formato == "jsonl" else str(archivo)
+    monkeypatch.undo()
+    monkeypatch.setattr(guardado_json, "ARCHIVO_DATOS", str(archivo))
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write('{"numero": 1, "alturas": [7]}\n' if formato == "jsonl" else '[{"numero": 1, "alturas": [7]}]')
+    assert [s["alturas"] for s in guardado_json.cargar_simulaciones()] == [[7]]
+
+
+# --- 10. Formato binario por columnas ---
+def test_formato_binario_columnas(archivo, monkeypatch, tmp_path):
+    """El historial existente se convierte y las columnas se leen con mmap."""
+    from guardado_binario import ArchivoBinario
+
+    guardado_json.guardar_simulacion(simulacion(3))
+    monkeypatch.setattr(guardado_json, "FORMATO", "binario")
+    sim = simulacion(5)
+    sim["especie"] = "lechuga"
+    sim["muertas"] = [False, True, False, False]
+    assert guardado_json.guardar_simulacion(sim) == 2
+
+    with ArchivoBinario(guardado_json._ruta_binaria()) as binario:
+        assert len(binario) == 2
+        columnas = binario.columnas(1)
+        assert columnas["alturas"].tolist() == [5] * 4
+        assert columnas["muertas"].tolist() == [0, 1, 0, 0]
+        assert [c.tolist() for c in binario.columna("agua")] == [[80] * 4, [80] * 4]
+        del columnas
+
+    assert guardado_json.cargar_simulacion(2)["especie"] == "lechuga"
+    destino = tmp_path / "exportado.json"
+    guardado_json.exportar_json(str(destino))
+    exportado = json.loads(destino.read_text(encoding="utf-8"))
+    assert [s["alturas"][0] for s in exportado] == [3, 5]
+
+
+# --- 11. Índice del formato binario ---
+def test_indice_binario(archivo, monkeypatch):
+    """Guardar, contar y cargar usan el índice; si falta o quedó corto, se completa."""
+    import guardado_binario
+
+    monkeypatch.setattr(guardado_json, "FORMATO", "binario")
+    for altura in (3, 5, 7):
+        guardado_json.guardar_simulacion(simulacion(altura))
+    ruta = guardado_json._ruta_binaria()
+    indice = archivo.parent / "guardado.bin.idx"
+    assert indice.stat().st_size == 3 * 8
+
+    recorridos = []
+    original = guardado_binario._recorrer
+    monkeypatch.setattr(guardado_binario, "_recorrer", lambda *a: recorridos.append(a[1]) or original(*a))
+    assert guardado_json.guardar_simulacion(simulacion(9)) == 4
+    assert guardado_json.contar_simulaciones() == 4
+    assert guardado_json.cargar_simulacion(2)["alturas"] == [5] * 4
+    assert recorridos == []
+
+    # Guardado interrumpido: registro a medias al final y el índice sin su posición
+    with open(ruta, "ab") as f:
+        f.write(guardado_binario._registro(5, simulacion(1))[:40])
+    assert guardado_json.guardar_simulacion(simulacion(6)) == 5
+    with open(indice, "r+b") as f:
+        f.truncate(3 * 8)
+    assert guardado_json.contar_simulaciones() == 5
+    assert len(recorridos) == 2 and recorridos[-1] > 0  # solo lo que faltaba
+    assert indice.stat().st_size == 5 * 8
+
+    # Índice borrado o dañado: se reconstruye entero
+    indice.write_bytes(b"\xff" * 8)
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [3, 5, 7, 9, 6]
+    indice.unlink()
+    assert guardado_json.cargar_simulacion(5)["alturas"] == [6] * 4
+    assert recorridos[-2:] == [0, 0]
+
+
+# --- 12. Lo que devuelve la caché se puede modificar ---
+@pytest.mark.parametrize("formato", ["jsonl", "json"])
+def test_cache_devuelve_copias(archivo, monkeypatch, formato):
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    guardado_json.limpiar_cache()
+    guardado_json.guardar_simulacion(simulacion(3))
+    guardado_json.cargar_simulaciones()
+    guardado_json.guardar_simulacion(simulacion(4))
+
+    for _ in range(2):
+        leidas = guardado_json.cargar_simulaciones()
+        assert [s["alturas"] for s in leidas] == [[3] * 4, [4] * 4]
+        leidas[0]["alturas"][0] = 99
+        leidas[1]["condiciones"][0]["agua"] = -1
+        leidas[1]["nueva"] = True
+        leidas.pop()
+    assert guardado_json.listar_simulaciones(1, 1)[0]["condiciones"][0]["agua"] == 80
+    assert guardado_json.cargar_simulacion(1)["alturas"][0] == 3
+    assert guardado_json.buscar_simulaciones([("altura", "=", 4)])[0]["condiciones"][0]["agua"] == 80
+
+    # Sin copiar se recibe la lista de la caché: la misma mientras el archivo no cambie
+    compartida = guardado_json.cargar_simulaciones(copiar=False)
+    assert guardado_json.cargar_simulaciones(copiar=False) is compartida
+    guardado_json.guardar_simulacion(simulacion(5))
+    assert len(compartida) == 2
+    assert len(guardado_json.cargar_simulaciones(copiar=False)) == 3
+
+
+# --- 13. Guardar en segundo plano mientras la interfaz lee ---
+def test_numeros_unicos_con_lectores(archivo):
+    """Verificar el índice desde otro hilo no duplica números ni se cruza con reiniciar."""
+    import threading
+
+    escritor = guardado_json.EscritorEnSegundoPlano(max_pendientes=1000)
+    parar = threading.Event()
+
+    def leer():
+        while not parar.is_set():
+            guardado_json.contar_simulaciones()
+            guardado_json.listar_simulaciones(0, 3)
+
+    lector = threading.Thread(target=leer)
+    lector.start()
+    try:
+        for altura in range(1000):
+            assert escritor.encolar(simulacion(altura))
+        escritor.esperar()
+        parar.set()
+        numeros = [s["numero"] for s in guardado_json.cargar_simulaciones()]
+        assert numeros == list(range(1, 1001))
+
+        escritor.encolar(simulacion(7))
+        escritor.esperar()
+        guardado_json.reiniciar_guardado()
+        assert guardado_json.contar_simulaciones() == 0
+    finally:
+        # Antes de que el fixture restaure la ruta real de los datos
+        parar.set()
+        escritor.detener()
+        lector.join()
+
+
+# --- 14. La caché respeta su tope también al agregar ---
+def test_cache_respeta_tope_al_agregar(archivo, monkeypatch):
+    guardado_json.limpiar_cache()
+    guardado_json.guardar_simulacion(simulacion(3))
+    guardado_json.cargar_simulaciones()
+    ruta_jsonl = guardado_json._rutas_jsonl()[0]
+    assert ruta_jsonl in guardado_json._cache
+
+    monkeypatch.setattr(guardado_json, "MAX_BYTES_CACHE", 3 * len(guardado_json._linea(simulacion(3))))
+    for altura in range(4):
+        guardado_json.guardar_simulacion(simulacion(altura))
+        assert guardado_json._cache_bytes <= guardado_json.MAX_BYTES_CACHE
+    assert ruta_jsonl not in guardado_json._cache
+    assert guardado_json._cache_bytes == 0
@@ -0,0 +1,170 @@
+# ------------------------------------------------------------
+# tests/test_guardado_fragmentos.py
+# ------------------------------------------------------------
+# Pruebas del guardado con varios escritores: un fragmento por
+# proceso, ids únicos, mezcla de k vías al leer y compactación
+# mientras otros procesos siguen guardando.
+# ------------------------------------------------------------
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import guardado_json
+import guardado_fragmentos
+from guardado_fragmentos import CONSOLIDADO, compactar
+
+
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    monkeypatch.setattr(guardado_json, "ARCHIVO_DATOS", str(tmp_path / "guardado.json"))
+    monkeypatch.setattr(guardado_json, "FORMATO", "fragmentos")
+    return tmp_path / "guardado.fragmentos"
+
+
+def simulacion(altura):
+    return {"alturas": [altura] * 2, "muertas": [False] * 2,
+            "condiciones": [{"agua": 80, "luz": 8, "temp": 22}] * 2}
+
+
+def _guardar_varias(archivo, cantidad):
+    """Trabajo de un proceso escritor."""
+    guardado_json.ARCHIVO_DATOS = archivo
+    guardado_json.FORMATO = "fragmentos"
+    for i in range(cantidad):
+        guardado_json.guardar_simulacion(simulacion(i))
+    return guardado_fragmentos.nombre_escritor()
+
+
+# --- 1. Guardar, numerar y compactar ---
+def test_guardar_y_compactar(carpeta):
+    for altura in (3, 5, 7):
+        guardado_json.guardar_simulacion(simulacion(altura))
+    assert guardado_json.contar_simulaciones() == 3
+    todas = guardado_json.cargar_simulaciones()
+    assert [s["numero"] for s in todas] == [1, 2, 3]
+    assert [s["alturas"][0] for s in todas] == [3, 5, 7]
+    assert len({s["id"] for s in todas}) == 3
+
+    assert compactar(str(carpeta)) == 3
+    assert sorted(os.listdir(carpeta)) == ["compactar.lock", CONSOLIDADO]
+    assert guardado_json.cargar_simulaciones() == todas
+
+    guardado_json.guardar_simulacion(simulacion(9))
+    assert guardado_json.cargar_simulacion(4)["alturas"] == [9, 9]
+    assert [s["numero"] for s in guardado_json.listar_simulaciones(1, 2)] == [2, 3]
+
+
+# --- 2. Mezcla de k vías entre escritores, sin repetidos ---
+def test_mezcla_de_fragmentos(carpeta):
+    carpeta.mkdir()
+    lineas = {
+        "a.jsonl": ['{"id":"1-a","alturas":[1]}', '{"id":"4-a","alturas":[4]}'],
+        "b.jsonl": ['{"id":"2-b","alturas":[2]}', '{"id":"5-b","alturas":[5]}',
+                    '{"id":"6-b","alt'],  # escritura a medio terminar
+        CONSOLIDADO: ['{"id":"0-c","alturas":[0]}', '{"id":"3-c","alturas":[3]}'],
+        # Sellado de una compactación cortada: ya está en el consolidado
+        "c.jsonl.1.sellado": ['{"id":"3-c","alturas":[3]}'],
+    }
+    for nombre, contenido in lineas.items():
+        (carpeta / nombre).write_text("\n".join(contenido) + ("" if nombre == "b.jsonl" else "\n"))
+
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [0, 1, 2, 3, 4, 5]
+    assert compactar(str(carpeta)) == 6
+    ids = [json.loads(l)["id"] for l in (carpeta / CONSOLIDADO).read_text().splitlines()]
+    assert ids == ["0-c", "1-a", "2-b", "3-c", "4-a", "5-b"]
+
+
+# --- 3. Varios procesos guardan mientras se compacta ---
+def test_varios_escritores_concurrentes(carpeta):
+    guardado_json.contar_simulaciones()  # crea la carpeta
+    procesos, por_proceso = 4, 60
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = [pool.submit(_guardar_varias, guardado_json.ARCHIVO_DATOS, por_proceso)
+                   for _ in range(procesos)]
+        while not all(f.done() for f in futuros):
+            compactar(str(carpeta))
+        escritores = {f.result() for f in futuros}
+
+    assert len(escritores) == procesos
+    todas = guardado_json.cargar_simulaciones()
+    assert len(todas) == guardado_json.contar_simulaciones() == procesos * por_proceso
+    ids = [s["id"] for s in todas]
+    assert ids == sorted(set(ids))
+
+    compactar(str(carpeta))
+    assert guardado_json.cargar_simulaciones() == todas
+
+
+# --- 4. El historial existente se incorpora una sola vez ---
+def test_importa_historial(carpeta, monkeypatch):
+    monkeypatch.setattr(guardado_json, "FORMATO", "jsonl")
+    guardado_json.guardar_simulacion(simulacion(3))
+    guardado_json.guardar_simulacion(simulacion(4))
+    monkeypatch.setattr(guardado_json, "FORMATO", "fragmentos")
+    guardado_json.guardar_simulacion(simulacion(5))
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == [3, 4, 5]
+
+    # Reiniciar solo borra lo propio que no se compactó
+    compactar(str(carpeta))
+    guardado_json.guardar_simulacion(simulacion(6))
+    guardado_json.reiniciar_guardado()
+    assert guardado_json.contar_simulaciones() == 3
+
+
+# --- 5. Guardar solo toca el fragmento propio; páginas sin decodificar lo anterior ---
+def test_guardar_y_paginas(carpeta, monkeypatch):
+    for altura in range(6):
+        guardado_json.guardar_simulacion(simulacion(altura))
+    # Otro escritor con el reloj adelantado: su simulación va al final
+    (carpeta / "otro.jsonl").write_text('{"id":"9999999999999999999-otro-00000001","alturas":[99]}\n')
+    abiertos = []
+    original_open = open
+    sim = simulacion(7)
+    with monkeypatch.context() as m:
+        m.setattr(guardado_fragmentos, "open", lambda ruta, *a: abiertos.append(ruta) or original_open(ruta, *a),
+                  raising=False)
+        m.setattr(guardado_fragmentos.os, "listdir", lambda carpeta: pytest.fail("guardar listó la carpeta"))
+        assert guardado_json.guardar_simulacion(sim) == sim["id"]
+    assert "numero" not in sim
+    assert abiertos == [os.path.join(str(carpeta), guardado_fragmentos.nombre_escritor() + ".jsonl")]
+
+    assert guardado_json.contar_simulaciones() == 8
+    assert guardado_json.cargar_simulacion(7)["id"] == sim["id"]
+
+    decodificadas = []
+    original = guardado_fragmentos.json.loads
+    monkeypatch.setattr(guardado_fragmentos.json, "loads", lambda l: decodificadas.append(l) or original(l))
+    assert [s["alturas"][0] for s in guardado_json.listar_simulaciones(4, 2)] == [4, 5]
+    assert guardado_json.cargar_simulacion(8)["alturas"] == [99]
+    assert len(decodificadas) == 3
+
+
+# --- 6. Muchos fragmentos: compactación al empezar y mezcla por rondas ---
+def test_muchos_fragmentos(carpeta, monkeypatch):
+    monkeypatch.setattr(guardado_fragmentos, "MAX_FRAGMENTOS", 4)
+    monkeypatch.setattr(guardado_fragmentos, "MAX_ABIERTOS", 3)
+    abiertos = []
+    original = guardado_fragmentos._abrir
+    monkeypatch.setattr(guardado_fragmentos, "_abrir", lambda rutas: abiertos.append(len(rutas)) or original(rutas))
+
+    # Sesiones cortas anteriores: un fragmento de una línea cada una
+    carpeta.mkdir()
+    for i in range(10):
+        (carpeta / f"sesion{i}.jsonl").write_text(f'{{"id":"{i:019d}-s{i}-00000001","alturas":[{i}]}}\n')
+    assert [s["alturas"][0] for s in guardado_json.listar_simulaciones()] == list(range(10))
+    assert abiertos and max(abiertos) <= 3
+
+    # Al empezar a usar la carpeta se compactó en segundo plano
+    guardado_fragmentos._hilo_compactacion.join()
+    assert sorted(os.listdir(carpeta)) == ["compactar.lock", CONSOLIDADO]
+
+    # Al empezar un fragmento propio también se revisa
+    for i in range(10, 15):
+        (carpeta / f"sesion{i}.jsonl").write_text(f'{{"id":"{i:019d}-s{i}-00000001","alturas":[{i}]}}\n')
+    guardado_json.guardar_simulacion(simulacion(99))
+    guardado_fragmentos._hilo_compactacion.join()
+    assert sorted(os.listdir(carpeta)) == ["compactar.lock", CONSOLIDADO]
+    assert [s["alturas"][0] for s in guardado_json.cargar_simulaciones()] == list(range(15)) + [99]
+    assert max(abiertos) <= 3
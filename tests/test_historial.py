@@ -0,0 +1,99 @@
+# ------------------------------------------------------------
+# tests/test_historial.py
+# ------------------------------------------------------------
+# Pruebas del historial por eventos con puntos de control.
+# ------------------------------------------------------------
+
+import random
+import pytest
+from historial import Historial, EVENTO, ENCABEZADO, ENCABEZADO_V1, MARCA_V1
+from logica import Poblacion
+
+
+def jugar(historial, pasos, semilla=0):
+    """Hace pasos al azar y devuelve una copia del estado después de cada uno."""
+    azar = random.Random(semilla)
+    estados = [historial.poblacion.a_bytes()]
+    n = len(historial.poblacion)
+    for _ in range(pasos):
+        if azar.random() < 0.5:
+            historial.paso_una(azar.randrange(n), azar.uniform(0, 160), azar.uniform(0, 14), azar.uniform(12, 34))
+        else:
+            cambios = {azar.randrange(n): (azar.uniform(20, 140), 8.0, 22.0)}
+            historial.paso(cambios)
+        estados.append(historial.poblacion.a_bytes())
+    return estados
+
+
+# --- 1. Cualquier paso se reconstruye igual que como ocurrió ---
+def test_reconstruir_cualquier_paso():
+    historial = Historial(Poblacion(6), cada=4)
+    estados = jugar(historial, 30)
+    assert len(historial) == 30
+    assert len(historial.puntos_de_control) == 30 // 4 + 1
+    assert len(historial.eventos) % EVENTO.size == 0
+    for paso in (0, 1, 4, 7, 13, 29, 30):
+        assert historial.estado(paso).a_bytes() == estados[paso]
+    with pytest.raises(IndexError):
+        historial.estado(31)
+
+
+# --- 2. ir_a cambia la población en sus arreglos y permite seguir ---
+def test_ir_a_y_seguir_desde_un_paso_anterior():
+    poblacion = Poblacion(4)
+    alturas = poblacion.alturas
+    historial = Historial(poblacion, cada=3)
+    estados = jugar(historial, 10)
+
+    historial.ir_a(5)
+    assert poblacion.alturas is alturas
+    assert poblacion.a_bytes() == estados[5]
+
+    # Avanzar desde el paso 5 descarta los pasos 6 a 10
+    historial.paso_una(0, 80, 8, 22)
+    assert len(historial) == 6 and historial.actual == 6
+    assert len(historial.puntos_de_control) == 6 // 3 + 1
+    assert historial.estado(5).a_bytes() == estados[5]
+    assert historial.estado(6).a_bytes() == poblacion.a_bytes()
+
+
+# --- 3. Serialización compacta ---
+def test_a_texto_y_desde_texto():
+    historial = Historial(Poblacion(3, "lechuga"), cada=5)
+    estados = jugar(historial, 12, semilla=3)
+    copia = Historial.desde_texto(historial.a_texto())
+    assert len(copia) == 12
+    assert copia.poblacion.especie == "lechuga"
+    assert copia.poblacion.a_bytes() == estados[-1]
+    assert copia.estado(7).a_bytes() == estados[7]
+
+    # Historiales guardados con la versión anterior del encabezado
+    datos = historial.a_bytes()
+    inicial = len(historial.puntos_de_control[0])
+    anterior = ENCABEZADO_V1.pack(MARCA_V1, 5, inicial) + datos[ENCABEZADO.size:]
+    assert Historial.desde_bytes(anterior).poblacion.a_bytes() == estados[-1]
+
+
+# --- 4. La memoria queda acotada: se descartan los pasos más viejos ---
+def test_ventana_de_pasos():
+    poblacion = Poblacion(50)
+    punto = len(poblacion.a_bytes())
+    historial = Historial(poblacion, cada=4, max_bytes=6 * punto)
+    estados = jugar(historial, 200, semilla=5)
+
+    assert len(historial) == 200 and historial.actual == 200
+    assert historial.memoria() <= 6 * punto
+    assert len(historial.puntos_de_control) < 6
+    assert historial.primero > 0 and historial.primero % 4 == 0
+    for paso in range(historial.primero, 201):
+        assert historial.estado(paso).a_bytes() == estados[paso]
+    with pytest.raises(IndexError):
+        historial.estado(historial.primero - 1)
+
+    # Volver atrás y seguir, y conservar la numeración al serializar
+    historial.ir_a(historial.primero + 1)
+    historial.paso_una(0, 80, 8, 22)
+    assert len(historial) == historial.primero + 2
+    copia = Historial.desde_texto(historial.a_texto())
+    assert (copia.primero, len(copia)) == (historial.primero, len(historial))
+    assert copia.poblacion.a_bytes() == poblacion.a_bytes()
@@ -0,0 +1,63 @@
+# ------------------------------------------------------------
+# tests/test_interfaz.py
+# ------------------------------------------------------------
+# Pruebas de la interfaz que no necesitan abrir una ventana.
+# ------------------------------------------------------------
+
+import subprocess
+import sys
+from pathlib import Path
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+# --- 1. La pantalla de inicio no carga Matplotlib ni NumPy ---
+def test_interfaz_sin_matplotlib_al_importar():
+    codigo = "import interfaz, sys; print('matplotlib' in sys.modules or 'numpy' in sys.modules)"
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True,
+                               cwd=Path(__file__).parent.parent)
+    assert resultado.stdout.strip() == "False"
+
+
+# --- 2. La figura del simulador se reutiliza en cada simulación nueva ---
+def test_figura_reutilizada():
+    from interfaz import SimuladorPlantas
+
+    class Vista:
+        _preparar_figura = SimuladorPlantas._preparar_figura
+
+    vista = Vista()
+    vista.fig = figura = Figure()
+    FigureCanvasAgg(figura)
+    for _ in range(50):
+        vista._preparar_figura()
+        vista.ax.bar(range(100), range(100))
+    assert vista.fig is figura
+    assert figura.axes == [vista.ax]
+    assert len(vista.ax.patches) == 100
+
+
+# --- 3. El navegador de guardados no crea una columna por planta ---
+def test_detalle_con_muchas_plantas():
+    from interfaz import NavegadorGuardados, BARRAS_HISTOGRAMA
+
+    navegador = NavegadorGuardados.__new__(NavegadorGuardados)
+    n = 10000
+    grande = {"numero": 1, "alturas": [float(i % 50) for i in range(n)], "muertas": [i % 4 == 0 for i in range(n)],
+              "condiciones": [{"agua": 80, "luz": 8, "temp": 22}] * n}
+    (titulo, lineas), = navegador.columnas_detalle(grande)
+    assert titulo == "Resumen" and lineas[0] == "Plantas: 10000 (7500 vivas)"
+    assert "Agua media: 80.0 ml" in lineas
+
+    figura = Figure()
+    FigureCanvasAgg(figura)
+    ax = figura.add_subplot()
+    navegador.graficar(ax, grande)
+    assert len(ax.patches) == BARRAS_HISTOGRAMA
+
+    chica = {"numero": 2, "alturas": [3, 5], "muertas": [False, True], "condiciones": [{"agua": 80}, {}]}
+    assert navegador.columnas_detalle(chica) == [
+        ("Planta 1", ["Altura: 3.0 cm", "Agua: 80 ml", "Luz: N/A h", "Temp: N/A °C"]),
+        ("Planta 2", ["Altura: 💀 Muerta", "Agua: N/A ml", "Luz: N/A h", "Temp: N/A °C"]),
+    ]
@@ -8,7 +8,7 @@
 # ------------------------------------------------------------
 
 import pytest
-from logica import calcular_crecimiento, MUERTE, VALORES_IDEALES
+from logica import calcular_crecimiento, MUERTE, VALORES_IDEALES, TOLERANCIAS
 
 # --- 1. Crecimiento ideal ---
 def test_crecimiento_ideal():
@@ -58,4 +58,78 @@ def test_muerte_por_temperatura_extrema():
     luz = (ideal["luz"][0] + ideal["luz"][1]) / 2
     temp = ideal["temp"][1] + 20
     crecimiento = calcular_crecimiento(agua, luz, temp)
-    assert crecimiento == MUERTE
\ No newline at end of file
+    assert crecimiento == MUERTE
+
+# --- 6. Versión vectorizada idéntica a la escalar en los bordes ---
+def test_crecimiento_lote_coincide_en_bordes():
+    """El cálculo por lotes debe coincidir con el escalar, incluso en los límites de cada banda."""
+    from logica import calcular_crecimiento_lote
+    import numpy as np
+
+    bordes = {}
+    for factor, (minimo, maximo) in VALORES_IDEALES.items():
+        tol_ext, tol_cer = TOLERANCIAS[factor]
+        puntos = [minimo, maximo, minimo - tol_ext, maximo + tol_ext,
+                  minimo - tol_ext - tol_cer, maximo + tol_ext + tol_cer]
+        bordes[factor] = sorted({p + d for p in puntos for d in (-0.5, -1e-9, 0, 1e-9, 0.5)})
+
+    agua, luz, temp = np.meshgrid(bordes["agua"], bordes["luz"], bordes["temp"], indexing="ij")
+    agua, luz, temp = agua.ravel(), luz.ravel(), temp.ravel()
+
+    lote = calcular_crecimiento_lote(agua, luz, temp)
+    esperado = [calcular_crecimiento(a, l, t) for a, l, t in zip(agua, luz, temp)]
+    assert lote.tolist() == esperado
+
+
+# --- 7. Motor de varios días sin interfaz ---
+def test_simular_dias_coincide_con_paso_planta():
+    """El motor vectorizado aplica las mismas reglas que paso_planta, día por día."""
+    from logica import simular_dias, paso_planta
+
+    cronograma = [
+        ([80, 150, 60, 80], [8, 8, 5, 0], [22, 22, 19, 22]),
+        ([80, 80, 40, 80], [8, 8, 5, 8], [22, 22, 19, 22]),
+        (80, 8, 22),
+    ]
+    alturas, muertas = [3, 3, 3, 3], [False] * 4
+    pasos = simular_dias(alturas, muertas, iter(cronograma))
+
+    for dia, estado_alturas, estado_muertas, _ in pasos:
+        agua, luz, temp = cronograma[dia - 1]
+        for i in range(4):
+            valores = [c if isinstance(c, (int, float)) else c[i] for c in (agua, luz, temp)]
+            alturas[i], muertas[i], _ = paso_planta(alturas[i], muertas[i], *valores)
+        assert estado_alturas.tolist() == alturas
+        assert estado_muertas.tolist() == muertas
+    assert dia == len(cronograma)
+
+
+# --- 8. Población con arreglos compactos ---
+def test_poblacion_paso_y_serializacion():
+    """La población avanza como paso_planta y se serializa sin perder datos."""
+    from logica import Poblacion, paso_planta
+
+    poblacion = Poblacion(5)
+    poblacion.paso(agua=[80, 150, 60, 300, 80], luz=8, temp=[22, 22, 19, 22, 29.5])
+    esperado = [paso_planta(3, False, a, 8, t)[:2]
+                for a, t in zip([80, 150, 60, 300, 80], [22, 22, 19, 22, 29.5])]
+    assert [(a, bool(m)) for a, m in zip(poblacion.alturas, poblacion.muertas)] == esperado
+
+    copia = Poblacion.desde_bytes(poblacion.a_bytes())
+    assert copia.a_simulacion() == poblacion.a_simulacion()
+    assert Poblacion.desde_simulacion(poblacion.a_simulacion()).a_simulacion() == poblacion.a_simulacion()
+
+    poblacion.reiniciar()
+    assert list(poblacion.alturas) == [3] * 5 and not any(poblacion.muertas)
+
+
+# --- 9. Memoria de una población grande ---
+def test_poblacion_grande_es_compacta():
+    """Un millón de plantas ocupa menos de 32 MB."""
+    from logica import Poblacion
+
+    poblacion = Poblacion(1_000_000)
+    tamano = sum(memoryview(a).nbytes for a in
+                 (poblacion.alturas, poblacion.muertas, poblacion.agua, poblacion.luz, poblacion.temp))
+    assert tamano < 32 * 1024 * 1024
+    assert poblacion.paso().shape == (1_000_000,)
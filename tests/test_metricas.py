@@ -0,0 +1,123 @@
+# ------------------------------------------------------------
+# tests/test_metricas.py
+# ------------------------------------------------------------
+# Pruebas de la instrumentación opcional (metricas.py).
+# ------------------------------------------------------------
+
+import json
+import os
+import pstats
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import guardado_json
+import metricas
+from ejecutar import _separar_opciones
+
+
+@pytest.fixture
+def activas(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", True)
+    metricas.reiniciar()
+    yield
+    metricas.reiniciar()
+
+
+# --- 1. Apagadas, las funciones quedan sin envolver ---
+def test_apagadas_sin_costo(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", False)
+
+    def funcion():
+        return 1
+
+    assert metricas.medir("funcion")(funcion) is funcion
+
+
+# --- 2. Llamadas, histograma y bytes de la función más interna ---
+def test_medir_y_contar_bytes(activas):
+    @metricas.medir("interna")
+    def interna():
+        metricas.contar_bytes(leidos=10)
+
+    @metricas.medir("externa")
+    def externa():
+        metricas.contar_bytes(escritos=5)
+        interna()
+        interna()
+
+    externa()
+    resumen = metricas.resumen()
+    assert resumen["externa"]["llamadas"] == 1
+    assert resumen["interna"]["llamadas"] == 2
+    assert sum(resumen["interna"]["histograma"]) == 2
+    assert (resumen["externa"]["bytes_leidos"], resumen["externa"]["bytes_escritos"]) == (0, 5)
+    assert (resumen["interna"]["bytes_leidos"], resumen["interna"]["bytes_escritos"]) == (20, 0)
+    assert resumen["interna"]["maximo"] >= resumen["interna"]["media"] > 0
+
+
+# --- 3. Bytes leídos y escritos por el guardado ---
+@pytest.mark.parametrize("formato", ["jsonl", "json", "sqlite", "binario"])
+def test_bytes_de_guardado(tmp_path, monkeypatch, activas, formato):
+    monkeypatch.setattr(guardado_json, "ARCHIVO_DATOS", str(tmp_path / "guardado.json"))
+    monkeypatch.setattr(guardado_json, "FORMATO", formato)
+    guardar = metricas.medir("guardar")(guardado_json.guardar_simulacion)
+    cargar = metricas.medir("cargar")(guardado_json.cargar_simulaciones)
+
+    guardadas = [{"alturas": [3, 4], "muertas": [False, True],
+                  "condiciones": [{"agua": 80, "luz": 8, "temp": 22}] * 2} for _ in range(3)]
+    for simulacion in guardadas:
+        guardar(simulacion)
+    guardado_json.limpiar_cache()
+    assert len(cargar()) == 3
+
+    resumen = metricas.resumen()
+    assert resumen["guardar"]["llamadas"] == 3
+    assert resumen["guardar"]["bytes_escritos"] > 0
+    assert resumen["cargar"]["bytes_leidos"] > 0
+    if formato == "jsonl":
+        ruta_jsonl, ruta_indice = guardado_json._rutas_jsonl()
+        assert resumen["guardar"]["bytes_escritos"] == os.path.getsize(ruta_jsonl) + os.path.getsize(ruta_indice)
+        assert resumen["cargar"]["bytes_leidos"] == os.path.getsize(ruta_jsonl)
+    if formato == "sqlite":
+        assert resumen["guardar"]["bytes_escritos"] == sum(len(guardado_json._linea(s)) for s in guardadas)
+
+
+# --- 4. Volcados a JSON y a pstats ---
+def test_volcados(tmp_path, activas):
+    metricas.medir("f")(lambda: None)()
+    ruta = tmp_path / "metricas.json"
+    metricas.volcar_json(ruta)
+    datos = json.loads(ruta.read_text(encoding="utf-8"))
+    assert datos["funciones"]["f"]["llamadas"] == 1
+    assert datos["limites_histograma"][-1] is None
+
+    perfil = tmp_path / "perfil.pstats"
+    assert metricas.perfilar(lambda: sum(range(1000)), str(perfil)) == 499500
+    assert pstats.Stats(str(perfil)).total_calls > 0
+
+
+# --- 5. Activación por línea de comandos y por variable de entorno ---
+def test_opciones_de_ejecutar(monkeypatch):
+    monkeypatch.setattr(metricas, "ACTIVAS", False)
+    resto, perfil = _separar_opciones(["--metricas", "escenarios.csv", "--perfil=salida.pstats"])
+    assert resto == ["escenarios.csv"]
+    assert perfil == "salida.pstats"
+    assert metricas.ACTIVAS
+
+
+def test_variable_de_entorno(tmp_path):
+    salida = tmp_path / "metricas.json"
+    codigo = (
+        "import guardado_json; "
+        f"guardado_json.ARCHIVO_DATOS = {str(tmp_path / 'guardado.json')!r}; "
+        "guardado_json.guardar_simulacion({'alturas': [1]}); "
+        "guardado_json.cargar_simulaciones()"
+    )
+    entorno = dict(os.environ, SIMULADOR_METRICAS=str(salida), SIMULADOR_FORMATO="jsonl")
+    subprocess.run([sys.executable, "-c", codigo], check=True, env=entorno,
+                   cwd=Path(__file__).parent.parent, capture_output=True)
+    funciones = json.loads(salida.read_text(encoding="utf-8"))["funciones"]
+    assert funciones["guardar_simulacion"]["llamadas"] == 1
+    assert funciones["cargar_simulaciones"]["llamadas"] == 1
@@ -0,0 +1,65 @@
+# ------------------------------------------------------------
+# tests/test_optimizador.py
+# ------------------------------------------------------------
+# Pruebas de la recomendación de condiciones más económicas.
+# ------------------------------------------------------------
+
+import itertools
+import pytest
+from logica import calcular_crecimiento, MUERTE
+from optimizador import opciones_del_dia, recomendar, recomendar_por_especie, LIMITES_POR_DEFECTO
+
+
+# --- 1. Valores más baratos de cada nivel, justo en el borde de la banda ---
+def test_opciones_en_bordes_de_banda():
+    opciones = opciones_del_dia(LIMITES_POR_DEFECTO)
+    assert opciones[6][:2] == (70, 6)
+    assert opciones[3][:2] == (20, 4)
+    assert opciones[1][:2] == (10, 2)
+    for nivel, (agua, luz, temp) in opciones.items():
+        assert calcular_crecimiento(agua, luz, temp) >= nivel
+
+
+# --- 2. Igual al mejor plan por fuerza bruta ---
+@pytest.mark.parametrize("especie", ["tomate", "albahaca"])
+@pytest.mark.parametrize("objetivo", [3, 8, 15, 20, 40])
+def test_igual_a_fuerza_bruta(especie, objetivo):
+    dias = 4
+    opciones = opciones_del_dia(LIMITES_POR_DEFECTO, especie)
+    mejor = None
+    for niveles in itertools.product(opciones, repeat=dias):
+        if 3 + sum(niveles) >= objetivo:
+            costo = (sum(opciones[n][0] for n in niveles), sum(opciones[n][1] for n in niveles))
+            mejor = costo if mejor is None else min(mejor, costo)
+
+    plan = recomendar(objetivo, dias, especie=especie)
+    if mejor is None:
+        assert plan is None
+    else:
+        assert (plan["agua_total"], plan["luz_total"]) == mejor
+        assert plan["altura_final"] >= objetivo
+        assert all(d["crecimiento"] != MUERTE for d in plan["dias"])
+
+
+# --- 3. Restricciones por día ---
+def test_restricciones_por_dia():
+    # Sin restricciones alcanzan dos días ideales; con poca agua el
+    # segundo día hacen falta tres días
+    assert recomendar(15, 2) is not None
+    restricciones = [None, {"agua": (None, 50)}, {"luz": (8, None)}]
+    plan = recomendar(15, 3, restricciones=restricciones)
+    assert plan["dias"][1]["agua"] <= 50
+    assert plan["dias"][2]["luz"] >= 8
+    assert plan["altura_final"] >= 15
+
+    with pytest.raises(ValueError):
+        recomendar(15, 3, restricciones=[None])
+
+
+# --- 4. Horizontes largos y varias especies ---
+def test_horizonte_largo_y_especies():
+    plan = recomendar(1000, 365)
+    assert plan["altura_final"] >= 1000 and len(plan["dias"]) == 365
+    planes = recomendar_por_especie(20, 4)
+    assert set(planes) >= {"tomate", "lechuga", "albahaca"}
+    assert planes["lechuga"] is None
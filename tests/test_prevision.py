@@ -0,0 +1,24 @@
+# ------------------------------------------------------------
+# tests/test_prevision.py
+# ------------------------------------------------------------
+# Pruebas de la previsión que se muestra mientras se escribe.
+# ------------------------------------------------------------
+
+from logica import MUERTE
+from prevision import describir, prever
+
+
+# --- 1. Textos de cada resultado ---
+def test_describir():
+    assert describir(6) == "🌱 +6 cm"
+    assert describir(MUERTE) == "💀 Muere"
+
+
+# --- 2. Previsión desde lo escrito, incluso fuera de valores redondos ---
+def test_prever_textos():
+    assert prever(("80", "8", "22")) == "🌱 +6 cm"
+    assert prever(("90.5", "8", "22")) == "🌱 +3 cm"
+    assert prever(("200", "8", "22")) == "💀 Muere"
+    assert prever(("40", "5", "20"), especie="lechuga") == "🌱 +2 cm"
+    assert prever(("", "8", "22")) == "—"
+    assert prever(("8a", "8", "22")) == "—"
@@ -0,0 +1,35 @@
+# ------------------------------------------------------------
+# tests/test_rendimiento.py
+# ------------------------------------------------------------
+# Pruebas de las mediciones de rendimiento (con tamaños chicos).
+# ------------------------------------------------------------
+
+import pytest
+import guardado_json
+from rendimiento import comparar, medir_guardado, medir_binario, medir_grafico
+
+
+# --- 1. Comparación con la referencia ---
+def test_comparar_detecta_regresiones():
+    referencia = {"a": 0.010, "b": 0.010, "ruido": 1e-7}
+    resultados = {"a": 0.014, "b": 0.020, "ruido": 1e-6, "nueva": 5.0}
+    assert comparar(resultados, referencia, umbral=1.5) == [("b", 0.020, 0.010)]
+
+
+# --- 2. Las mediciones de guardado no tocan el historial real ---
+@pytest.mark.parametrize("formato", ["jsonl", "json", "sqlite", "binario", "fragmentos"])
+def test_medir_guardado(formato):
+    archivo, formato_actual = guardado_json.ARCHIVO_DATOS, guardado_json.FORMATO
+    resultados = medir_guardado(formato, tamanos=[10])
+    assert set(resultados) == {"cargar_todas_10", "cargar_una_10", "contar_10", "guardar_10"}
+    assert all(t > 0 for t in resultados.values())
+    assert (guardado_json.ARCHIVO_DATOS, guardado_json.FORMATO) == (archivo, formato_actual)
+
+    if formato == "binario":
+        assert set(medir_binario(10)) == {"binario_cargar_una_10", "binario_contar_10", "binario_guardar_10"}
+
+
+# --- 3. El gráfico se mide con Agg, sin ventana ---
+def test_medir_grafico():
+    resultados = medir_grafico()
+    assert set(resultados) == {"grafico_4_plantas", "grafico_1000_plantas"}
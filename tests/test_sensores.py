@@ -0,0 +1,102 @@
+# ------------------------------------------------------------
+# tests/test_sensores.py
+# ------------------------------------------------------------
+# Pruebas de la simulación a partir de registros de sensores:
+# agregación por día, equivalencia con paso_planta y lectura
+# por bloques de cualquier tamaño.
+# ------------------------------------------------------------
+
+import csv
+import io
+import random
+
+import pytest
+from logica import paso_planta
+from sensores import procesar, main
+
+
+def escribir(ruta, filas, encabezado="fecha,agua,luz,temp,invernadero"):
+    ruta.write_text(encabezado + "\n" + "".join(f"{','.join(map(str, f))}\n" for f in filas),
+                    encoding="utf-8")
+    return str(ruta)
+
+
+def resultados(ruta, **opciones):
+    salida = io.StringIO()
+    resumen = procesar(ruta, salida, **opciones)
+    return list(csv.DictReader(io.StringIO(salida.getvalue()))), resumen
+
+
+# --- 1. Lecturas por hora agrupadas en días ---
+def test_agrega_por_dia(tmp_path):
+    filas = [(f"2024-05-01 {h:02d}:00", 4, 0.5, 20 + h % 2, "A") for h in range(24)]
+    filas += [("2024-05-02", 80, 8, 22, "A")]
+    dias, resumen = resultados(escribir(tmp_path / "horas.csv", filas))
+
+    assert [d["fecha"] for d in dias] == ["2024-05-01", "2024-05-02"]
+    assert (float(dias[0]["agua"]), float(dias[0]["luz"]), float(dias[0]["temp"])) == (96, 12, 20.5)
+    assert resumen["filas"] == 25 and resumen["dias"] == 2
+
+
+# --- 2. Mismo resultado que paso_planta, con cualquier tamaño de bloque ---
+def test_equivale_a_paso_planta(tmp_path):
+    azar = random.Random(3)
+    filas = []
+    for dia in range(1, 29):
+        for hora in range(0, 24, 6):
+            for serie in ("A", "B", "C"):
+                filas.append((f"2024-02-{dia:02d} {hora:02d}:00", azar.uniform(10, 40),
+                              azar.uniform(1, 4), azar.uniform(14, 30), serie))
+    ruta = escribir(tmp_path / "registro.csv", filas)
+
+    esperado = []
+    for serie in ("A", "B", "C"):
+        altura, muerta = 3, False
+        for dia in range(1, 29):
+            lecturas = [f for f in filas if f[4] == serie and f[0].startswith(f"2024-02-{dia:02d}")]
+            agua = sum(f[1] for f in lecturas)
+            luz = sum(f[2] for f in lecturas)
+            temp = sum(f[3] for f in lecturas) / len(lecturas)
+            altura, muerta, _ = paso_planta(altura, muerta, agua, luz, temp)
+            esperado.append((serie, f"2024-02-{dia:02d}", float(altura), muerta))
+
+    primera = None
+    for filas_por_bloque in (7, 100, 65536):
+        dias, _ = resultados(ruta, filas_por_bloque=filas_por_bloque)
+        obtenido = sorted((d["invernadero"], d["fecha"], float(d["altura"]), d["muerta"] == "True")
+                          for d in dias)
+        assert obtenido == sorted(esperado)
+        primera = primera or obtenido
+        assert obtenido == primera
+    assert any(m for *_, m in esperado) and not all(m for *_, m in esperado)
+
+
+# --- 3. Lecturas faltantes, filas inválidas, fuera de orden y columnas faltantes ---
+def test_filas_descartadas(tmp_path):
+    filas = [("2024-05-01", 40, 4, 22, "A"), ("2024-05-01", "NA", 4, 22, "A"),
+             ("no-es-fecha", 80, 8, 22, "A"), ("2024-05-02", 80, 8, "nan", "A"),
+             ("2024-05-03", "", 4, 22, "A"), ("2024-05-03", 40, 4, 22, "A"),
+             ("2024-05-03", 40, 4),  # le faltan columnas
+             ("2024-05-04", 80, 8, 22, "A"),
+             ("2024-05-01", 80, 8, 22, "A")]  # día ya simulado
+    dias, resumen = resultados(escribir(tmp_path / "malo.csv", filas), filas_por_bloque=2)
+    assert [d["fecha"] for d in dias] == ["2024-05-01", "2024-05-03", "2024-05-04"]
+    # El agua que falta se completa con el promedio del día: el total no baja
+    assert [(float(d["agua"]), float(d["luz"])) for d in dias] == [(80, 8)] * 3
+    # Fecha inválida, día sin temperatura, fila incompleta y día ya simulado
+    assert resumen["descartadas"] == 4
+    assert resumen["series"]["A"] == {"altura": 21.0, "muerta": False}
+
+    with pytest.raises(ValueError):
+        resultados(escribir(tmp_path / "sin_luz.csv", [], encabezado="fecha,agua,temp"))
+
+
+# --- 4. Registro diario sin columna de invernadero, desde la línea de comandos ---
+def test_main_registro_diario(tmp_path, capsys):
+    ruta = escribir(tmp_path / "diario.csv", [("2024-05-01", 80, 8, 22), ("2024-05-02", 80, 8, 22)],
+                    encabezado="fecha,agua,luz,temp")
+    destino = tmp_path / "resultados.csv"
+    assert main([ruta, "--salida", str(destino), "--altura", "5"]) == 0
+    filas = list(csv.DictReader(destino.open(encoding="utf-8")))
+    assert [(f["invernadero"], f["altura"]) for f in filas] == [("diario", "11.0"), ("diario", "17.0")]
+    assert "días simulados: 2" in capsys.readouterr().err
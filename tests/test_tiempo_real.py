@@ -0,0 +1,82 @@
+# ------------------------------------------------------------
+# tests/test_tiempo_real.py
+# ------------------------------------------------------------
+# Pruebas del planificador del modo continuo, con un reloj falso.
+# ------------------------------------------------------------
+
+import pytest
+from tiempo_real import Planificador
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def cuadro(planificador):
+    """Simula un cuadro completo y devuelve los pasos hechos."""
+    hechos = 0
+    for _ in range(planificador.pasos_pendientes()):
+        if not planificador.queda_presupuesto():
+            planificador.descartar_restantes()
+            break
+        hechos += 1
+    return hechos
+
+
+# --- 1. Ritmo estable: un paso por período ---
+def test_ritmo_estable():
+    reloj = RelojFalso()
+    planificador = Planificador(10, reloj=reloj)
+    planificador.iniciar()
+    hechos = 0
+    while reloj.ahora < 10:
+        hechos += cuadro(planificador)
+        reloj.ahora += planificador.espera_ms() / 1000
+    assert 99 <= hechos <= 101 and planificador.descartados == 0
+    assert planificador.cuadros <= 102
+    assert planificador.espera_ms() >= 1
+
+
+# --- 2. Más pasos que cuadros: se agrupan ---
+def test_pasos_agrupados_por_cuadro():
+    reloj = RelojFalso()
+    planificador = Planificador(240, cuadros_por_segundo=60, reloj=reloj)
+    planificador.iniciar()
+    reloj.ahora = 1 / 60
+    assert cuadro(planificador) == 5
+    assert planificador.espera_ms() >= 16
+
+
+# --- 3. Atraso grande: se descartan pasos y se resincroniza ---
+def test_atraso_descarta_pasos():
+    reloj = RelojFalso()
+    planificador = Planificador(60, max_pasos_por_cuadro=8, reloj=reloj)
+    planificador.iniciar()
+    reloj.ahora = 2.0
+    assert cuadro(planificador) == 8
+    assert planificador.descartados == 121 - 8
+    reloj.ahora += 1 / 60
+    assert cuadro(planificador) == 1
+
+
+# --- 4. Presupuesto del cuadro agotado ---
+def test_presupuesto_agotado():
+    reloj = RelojFalso()
+    planificador = Planificador(120, reloj=reloj)
+    planificador.iniciar()
+    reloj.ahora = 0.05
+    pendientes = planificador.pasos_pendientes()
+    assert planificador.queda_presupuesto()
+    reloj.ahora += 0.02   # el primer paso tardó más que el presupuesto
+    assert not planificador.queda_presupuesto()
+    planificador.descartar_restantes()
+    assert planificador.descartados == pendientes - 1
+
+
+def test_ritmo_invalido():
+    with pytest.raises(ValueError):
+        Planificador(0)
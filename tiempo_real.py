@@ -0,0 +1,108 @@
+# ---------------------------------------------------------------------
+# tiempo_real.py
+# ---------------------------------------------------------------------
+# Planificador del modo continuo del simulador (reproducir / pausar).
+#
+# Separa el ritmo de la simulación (pasos por segundo) del ritmo de
+# dibujo (cuadros por segundo): en cada cuadro la interfaz pregunta
+# cuántos pasos tocan, los simula juntos y dibuja una sola vez. Si el
+# dibujo se atrasa, los pasos se agrupan en el cuadro siguiente; si el
+# atraso es grande, o el trabajo de un cuadro no entra en su tiempo, los
+# pasos sobrantes se descartan en vez de acumularse.
+#
+# No depende de tkinter: la interfaz lo usa desde root.after.
+# ---------------------------------------------------------------------
+
+import math
+import time
+
+# Cuadros por segundo máximos al dibujar
+CUADROS_POR_SEGUNDO = 60
+
+# Máximo de pasos que se simulan juntos en un cuadro
+MAX_PASOS_POR_CUADRO = 8
+
+# Fracción del tiempo de un cuadro que puede usar la simulación; el
+# resto queda para dibujar y para los eventos de Tk
+FRACCION_PRESUPUESTO = 0.5
+
+
+class Planificador:
+    """
+    Uso desde la interfaz:
+
+        planificador.iniciar()
+        ...en cada cuadro:
+        for _ in range(planificador.pasos_pendientes()):
+            if not planificador.queda_presupuesto():
+                planificador.descartar_restantes()
+                break
+            simular un paso
+        dibujar
+        root.after(planificador.espera_ms(), siguiente_cuadro)
+    """
+
+    def __init__(self, pasos_por_segundo=10, cuadros_por_segundo=CUADROS_POR_SEGUNDO,
+                 max_pasos_por_cuadro=MAX_PASOS_POR_CUADRO, reloj=time.perf_counter):
+        self.reloj = reloj
+        self.cuadros_por_segundo = cuadros_por_segundo
+        self.max_pasos_por_cuadro = max_pasos_por_cuadro
+        self.fijar_ritmo(pasos_por_segundo)
+        self.siguiente = self.inicio_cuadro = self.reloj()
+        self.pendientes = 0
+        self.pasos = self.descartados = self.cuadros = 0
+
+    def fijar_ritmo(self, pasos_por_segundo):
+        if pasos_por_segundo <= 0:
+            raise ValueError("Los pasos por segundo deben ser positivos")
+        self.periodo = 1 / pasos_por_segundo
+
+    def iniciar(self):
+        """Empieza a contar desde ahora (al reproducir o al salir de pausa)."""
+        self.siguiente = self.inicio_cuadro = self.reloj()
+        self.pendientes = 0
+
+    def pasos_pendientes(self):
+        """
+        Marca el comienzo de un cuadro y devuelve cuántos pasos simular en
+        él. Los pasos vencidos se agrupan hasta max_pasos_por_cuadro; los
+        que excedan ese máximo se descartan.
+        """
+        ahora = self.inicio_cuadro = self.reloj()
+        self.cuadros += 1
+        if ahora < self.siguiente:
+            self.pendientes = 0
+            return 0
+        vencidos = int((ahora - self.siguiente) / self.periodo) + 1
+        if vencidos > self.max_pasos_por_cuadro:
+            # Demasiado atraso: se descarta y se vuelve a sincronizar
+            self.descartados += vencidos - self.max_pasos_por_cuadro
+            vencidos = self.max_pasos_por_cuadro
+            self.siguiente = ahora + self.periodo
+        else:
+            self.siguiente += vencidos * self.periodo
+        self.pendientes = vencidos
+        return vencidos
+
+    def queda_presupuesto(self):
+        """
+        Indica si todavía hay tiempo en este cuadro para simular otro
+        paso. Cada paso pedido con pasos_pendientes cuenta una vez.
+        """
+        presupuesto = FRACCION_PRESUPUESTO / self.cuadros_por_segundo
+        if self.reloj() - self.inicio_cuadro > presupuesto:
+            return False
+        self.pendientes -= 1
+        self.pasos += 1
+        return True
+
+    def descartar_restantes(self):
+        """Descarta los pasos de este cuadro que no entraron en el presupuesto."""
+        self.descartados += self.pendientes
+        self.pendientes = 0
+
+    def espera_ms(self):
+        """Milisegundos hasta el próximo cuadro (para root.after)."""
+        ahora = self.reloj()
+        proximo = max(self.siguiente, self.inicio_cuadro + 1 / self.cuadros_por_segundo)
+        return max(1, math.ceil((proximo - ahora) * 1000))